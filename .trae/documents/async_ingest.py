@@ -0,0 +1,354 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from batch_ingest import collect_sources, ingest_lines, iter_source_lines, source_names
+from exam_stream import ExamGroupWriter
+from exam_validator import build_report, print_validation_report, validate_exam
+from parse_engine import sections_to_exams
+
+# 异步分阶段导入：提取 → 解析 → 校验 → 写出 四个阶段同时运行，阶段之间用有界队列（asyncio.Queue）相连，
+# 读下一个文件、解析上一个文件、写出再上一个文件可以重叠进行，整批耗时趋近最慢的那个阶段：
+#   提取  线程池中读取 .txt / 流式解析 .docx，得到行列表（以 I/O 为主）
+#   解析  进程池中规范化 + 分词 + 解析 + 题号检查，并按大题组卷（batch_ingest.ingest_lines）
+#   校验  进程池中逐份试卷 exam_validator.validate_exam
+#   写出  线程中按输入顺序用 exam_stream.ExamGroupWriter 流式写出，输出与 batch_ingest 的试卷组相同
+# 背压：队列满时上游的 put 会等待；另外用信号量限制同时在途的文件数（包括解析完、等前面的文件先写出的），
+# 所以内存上限约为 在途文件数 × 单个文件解析后的大小，与目录里有多少文件无关。
+# 队列深度和各阶段的忙碌 worker 数可以用 --monitor 定期打印，结束时汇总平均/最大深度和各阶段利用率：
+#   一直是满的队列，瓶颈在它下游的阶段；一直是空的队列，瓶颈在它上游的阶段。
+# -j 1 时解析和校验放在一个线程里，不启动进程池（省掉题目在进程间的序列化），仍能和读写重叠。
+#   python async_ingest.py 题库/ -o exam_group.json -j 4 --queue-size 8 --monitor 1
+#   python async_ingest.py 题库/*.txt --validate --extract-threads 4
+
+DEFAULT_QUEUE_SIZE = 4
+DEFAULT_EXTRACT_THREADS = 2
+# 队列深度的采样间隔（秒）
+SAMPLE_INTERVAL = 0.05
+QUEUES = ('提取→解析', '解析→校验', '校验→写出')
+
+
+def read_lines(path):
+    """线程池中的任务：读出一个源文件的全部行"""
+    return list(iter_source_lines(path))
+
+
+def parse_file(path, lines, source=None):
+    """进程池中的任务：解析一个文件的行并组卷
+    试卷 id 由 source（相对输入目录的路径，默认文件名）+ 大题标题决定（与 batch_ingest 相同）"""
+    result = ingest_lines(path, lines)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    result['exams'] = sections_to_exams(stem, result['sections'], source=source or os.path.basename(path))
+    # 题目已经在试卷里了，不必把 sections 再序列化一遍传回主进程
+    result['questionCount'] = sum(len(s['questions']) for s in result['sections'])
+    result['parseErrors'] = sum(len(s['errors']) for s in result['sections'])
+    del result['sections']
+    return result
+
+
+def validate_exams(exams):
+    """进程池中的任务：校验一个文件产出的各份试卷"""
+    return [validate_exam(exam) for exam in exams]
+
+
+class QueueStats:
+    """队列深度的采样统计"""
+
+    def __init__(self, queue):
+        self.queue = queue
+        self.samples = 0
+        self.total = 0
+        self.max = 0
+
+    def sample(self):
+        depth = self.queue.qsize()
+        self.samples += 1
+        self.total += depth
+        self.max = max(self.max, depth)
+
+    def to_dict(self):
+        return {"size": self.queue.maxsize, "depth": self.queue.qsize(), "max": self.max,
+                "mean": round(self.total / self.samples, 2) if self.samples else 0}
+
+
+class StagedIngest:
+    """提取 → 解析 → 校验 → 写出 的异步流水线
+
+        pipeline = StagedIngest(sources, 'exam_group.json', workers=4)
+        summary = asyncio.run(pipeline.run())
+        pipeline.depths()   # 运行中随时可查：{'提取→解析': 3, ...}
+    """
+
+    def __init__(self, sources, output, workers=None, extract_threads=DEFAULT_EXTRACT_THREADS,
+                 queue_size=DEFAULT_QUEUE_SIZE, max_inflight=None, validate=False, compact=False, names=None):
+        self.sources = list(sources)
+        self.names = names or {}
+        self.output = output
+        self.workers = workers or os.cpu_count() or 1
+        self.extract_threads = extract_threads
+        self.queue_size = queue_size
+        # 默认恰好能让每个队列装满、每个 worker 手上各有一个文件
+        self.max_inflight = max_inflight or extract_threads + 2 * self.workers + 3 * queue_size + 1
+        self.validate = validate
+        self.compact = compact
+        self.concurrency = {'提取': extract_threads, '解析': self.workers,
+                            '校验': self.workers if validate else 0, '写出': 1}
+        self.busy = dict.fromkeys(self.concurrency, 0)
+        self.busy_time = dict.fromkeys(self.concurrency, 0.0)
+        self.done = dict.fromkeys(self.concurrency, 0)
+        self.results = []
+        self.validation = []
+        self.report = None
+        self._exam_count = 0
+        self.queues = {}
+        self.queue_stats = {}
+        self.elapsed = 0.0
+
+    # ---- 运行状态 ----
+
+    def depths(self):
+        """各队列当前的深度"""
+        return {name: queue.qsize() for name, queue in self.queues.items()}
+
+    def status_line(self):
+        depths = '  '.join(f'{name} {queue.qsize()}/{queue.maxsize}' for name, queue in self.queues.items())
+        busy = '  '.join(f'{name} {self.busy[name]}/{n}' for name, n in self.concurrency.items() if n)
+        written = self.done['写出']
+        return f'[{written}/{len(self.sources)}] 队列 {depths} | 忙碌 {busy}'
+
+    async def _timed(self, stage, call, *args):
+        """把一次调用计入某个阶段的忙碌数和忙碌时间"""
+        self.busy[stage] += 1
+        start = time.perf_counter()
+        try:
+            return await call(*args)
+        finally:
+            self.busy_time[stage] += time.perf_counter() - start
+            self.busy[stage] -= 1
+            self.done[stage] += 1
+
+    # ---- 各阶段 ----
+
+    async def _dispatch(self, inbox):
+        # 按输入顺序领取在途名额：前面的文件一定先拿到名额，等待按序写出时不会互相卡死
+        for i, path in enumerate(self.sources):
+            await self._inflight.acquire()
+            await inbox.put((i, path))
+
+    async def _extract(self, inbox, outbox):
+        while (item := await inbox.get()) is not None:
+            i, path = item
+            try:
+                lines = await self._timed('提取', self._loop.run_in_executor, self._threads, read_lines, path)
+            except Exception as e:  # 单个文件失败不影响整批
+                lines = e
+            await outbox.put((i, path, lines))
+
+    async def _parse(self, inbox, outbox):
+        while (item := await inbox.get()) is not None:
+            i, path, lines = item
+            if isinstance(lines, Exception):
+                result = {'path': path, 'exams': [], 'questionCount': 0, 'parseErrors': 0,
+                          'error': f'{type(lines).__name__}: {lines}', 'elapsed': 0.0}
+            else:
+                result = await self._timed('解析', self._loop.run_in_executor, self._cpu, parse_file, path, lines,
+                                           self.names.get(path))
+            del lines
+            await outbox.put((i, result))
+
+    async def _validate(self, inbox, outbox):
+        while (item := await inbox.get()) is not None:
+            i, result = item
+            if self.validate and result['exams']:
+                result['validation'] = await self._timed('校验', self._loop.run_in_executor, self._cpu,
+                                                         validate_exams, result['exams'])
+            await outbox.put((i, result))
+
+    async def _write(self, inbox, writer):
+        # 乱序到达的结果先放在 pending 里，按输入顺序写出；pending 的大小受在途名额限制
+        pending = {}
+        next_index = 0
+        while (item := await inbox.get()) is not None:
+            i, result = item
+            pending[i] = result
+            while next_index in pending:
+                result = pending.pop(next_index)
+                exams = result.pop('exams')
+                # 与 batch_ingest.build_exam_group 一样按整批的顺序错开时间戳
+                for exam in exams:
+                    exam['timestamp'] += self._exam_count
+                self._exam_count += len(exams)
+                await self._timed('写出', self._loop.run_in_executor, self._threads, self._write_exams, writer, exams)
+                self.validation.extend(result.pop('validation', ()))
+                result['examCount'] = len(exams)
+                self.results.append(result)
+                self._inflight.release()
+                next_index += 1
+
+    @staticmethod
+    def _write_exams(writer, exams):
+        for exam in exams:
+            writer.write_exam(exam, exam['questions'])
+
+    async def _stage(self, worker, count, inbox, outbox, *args):
+        """启动 count 个 worker；全部结束后向下游发送结束标记（下游每个 worker 一个 None）"""
+        await asyncio.gather(*(worker(inbox, outbox, *args) for _ in range(count)))
+        for _ in range(self._consumers[outbox]):
+            await outbox.put(None)
+
+    async def _sample(self):
+        while True:
+            for stats in self.queue_stats.values():
+                stats.sample()
+            await asyncio.sleep(SAMPLE_INTERVAL)
+
+    async def _monitor(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            print(self.status_line(), file=sys.stderr)
+
+    async def run(self, monitor=None):
+        """运行流水线，返回汇总（见 summary()）
+
+        试卷组先写到临时文件，全部完成（校验时还要没有错误）后才替换输出文件，校验报告在 self.report 中。
+        """
+        self._loop = asyncio.get_running_loop()
+        self._inflight = asyncio.Semaphore(self.max_inflight)
+        sources = asyncio.Queue(self.extract_threads)
+        to_parse = asyncio.Queue(self.queue_size)
+        to_validate = asyncio.Queue(self.queue_size)
+        to_write = asyncio.Queue(self.queue_size)
+        self.queues = dict(zip(QUEUES, (to_parse, to_validate, to_write)))
+        self.queue_stats = {name: QueueStats(queue) for name, queue in self.queues.items()}
+        validate_workers = self.concurrency['校验'] or 1
+        self._consumers = {sources: self.extract_threads, to_parse: self.workers,
+                           to_validate: validate_workers, to_write: 1}
+
+        tmp = f'{self.output}.tmp'
+        start = time.perf_counter()
+        background = [asyncio.create_task(self._sample())]
+        if monitor:
+            background.append(asyncio.create_task(self._monitor(monitor)))
+        self._threads = ThreadPoolExecutor(max_workers=self.extract_threads + 1)
+        if self.workers == 1:
+            self._cpu = ThreadPoolExecutor(max_workers=1)
+        else:
+            self._cpu = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            with ExamGroupWriter(tmp, self.compact) as writer:
+                async def dispatch():
+                    await self._dispatch(sources)
+                    for _ in range(self.extract_threads):
+                        await sources.put(None)
+
+                await asyncio.gather(
+                    dispatch(),
+                    self._stage(self._extract, self.extract_threads, sources, to_parse),
+                    self._stage(self._parse, self.workers, to_parse, to_validate),
+                    # 不校验时校验阶段只负责转发
+                    self._stage(self._validate, validate_workers, to_validate, to_write),
+                    self._write(to_write, writer),
+                )
+            if self.validate:
+                self.report = build_report(self.validation, start)
+            if self.report is None or self.report['ok']:
+                os.replace(tmp, self.output)
+        finally:
+            for task in background:
+                task.cancel()
+            self._threads.shutdown()
+            self._cpu.shutdown()
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        self.elapsed = time.perf_counter() - start
+        return self.summary()
+
+    # ---- 汇总 ----
+
+    def summary(self):
+        stages = {}
+        for name, n in self.concurrency.items():
+            if not n:
+                continue
+            stages[name] = {"workers": n, "items": self.done[name], "busy": round(self.busy_time[name], 4),
+                            "utilization": round(self.busy_time[name] / (self.elapsed * n), 3) if self.elapsed else None}
+        return {
+            "files": len(self.sources),
+            "failed": sum(1 for r in self.results if r['error']),
+            "exams": sum(r['examCount'] for r in self.results),
+            "questions": sum(r['questionCount'] for r in self.results),
+            "parseErrors": sum(r['parseErrors'] for r in self.results),
+            "elapsed": round(self.elapsed, 4),
+            "maxInflight": self.max_inflight,
+            "stages": stages,
+            "queues": {name: stats.to_dict() for name, stats in self.queue_stats.items()},
+        }
+
+def print_summary(summary, results):
+    print(f"\n=== 异步导入报告 ===")
+    for result in results:
+        name = os.path.basename(result['path'])
+        if result['error']:
+            print(f"✗ {name}：{result['error']}")
+        elif result['parseErrors']:
+            print(f"! {name}：{result['questionCount']} 道题，{result['parseErrors']} 道无法解析")
+    print(f"共 {summary['files']} 个文件（失败 {summary['failed']}），{summary['exams']} 份试卷，"
+          f"{summary['questions']} 道题，总耗时 {summary['elapsed']:.3f}s")
+    print(f"\n  阶段    并发    条目      忙碌时间    利用率")
+    for name, stage in summary['stages'].items():
+        print(f"  {name}  {stage['workers']:>6}{stage['items']:>8}{stage['busy']:>12.3f}s"
+              f"{stage['utilization'] or 0:>9.0%}")
+    print(f"\n  队列          容量   平均深度   最大深度（在途上限 {summary['maxInflight']} 个文件）")
+    for name, queue in summary['queues'].items():
+        print(f"  {name}  {queue['size']:>6}{queue['mean']:>10.2f}{queue['max']:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='异步分阶段导入 .docx/.txt 题库（提取、解析、校验、写出重叠进行）')
+    parser.add_argument('sources', nargs='+', help='目录、通配符或文件路径')
+    parser.add_argument('-o', '--output', default='exam_group.json', help='输出的试卷组文件')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='解析/校验的进程数，默认等于 CPU 核数')
+    parser.add_argument('--extract-threads', type=int, default=DEFAULT_EXTRACT_THREADS, help='读取文件的线程数')
+    parser.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE, help='阶段之间每个队列的容量（文件数）')
+    parser.add_argument('--max-inflight', type=int, default=None, help='同时在途的文件数上限，默认按队列容量和并发数计算')
+    parser.add_argument('--validate', action='store_true',
+                        help='校验试卷组，报告写到 <输出文件>.validation.json，有错误时不写出')
+    parser.add_argument('--compact', action='store_true', help='输出紧凑 JSON，去掉缩进和排版空白')
+    parser.add_argument('--monitor', type=float, default=None, metavar='秒', help='定期打印队列深度和忙碌的 worker 数')
+    parser.add_argument('--stats', default=None, help='把阶段和队列统计写成 JSON')
+    args = parser.parse_args()
+
+    sources = collect_sources(args.sources)
+    if not sources:
+        print("错误：没有找到 .docx/.txt 文件")
+        exit(1)
+    try:
+        names = source_names(args.sources, sources)
+    except ValueError as e:
+        print(f"错误：{e}")
+        exit(1)
+
+    pipeline = StagedIngest(sources, args.output, args.workers, args.extract_threads, args.queue_size,
+                            args.max_inflight, args.validate, args.compact, names)
+    summary = asyncio.run(pipeline.run(args.monitor))
+    print_summary(summary, pipeline.results)
+    if args.stats:
+        with open(args.stats, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    if pipeline.report is not None:
+        print_validation_report(pipeline.report, file=sys.stdout)
+        with open(f'{args.output}.validation.json', 'w', encoding='utf-8') as f:
+            json.dump(pipeline.report, f, ensure_ascii=False, indent=2)
+        if not pipeline.report['ok']:
+            print(f"校验未通过，没有写出 {args.output}")
+            exit(1)
+    print(f"输出文件：{args.output}，包含试卷数量：{summary['exams']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,319 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from exam_merge import format_stats, read_exam_group, upsert_exams
+from exam_output import COMPRESSORS, write_exam_group
+from exam_shards import write_shards
+from exam_validator import print_validation_report, validate_exam_group
+from extract_word import iter_docx_lines
+from ingest_cache import IngestCache
+from pipeline_metrics import add_metrics_arguments, finish_metrics, metrics_from_args
+from parse_engine import parse_tokens, sections_to_exams
+from question_dedup import dedup_report, merge_duplicates, print_dedup_report
+from question_gaps import SequenceAnalyzer, analyze_tokens, print_gap_report
+from question_index import build_index, index_path
+from question_tokenizer import tokenize_lines
+from text_normalize import OffsetMap, normalize_lines
+
+# 批量导入：把一个目录（或通配符）下的 .docx/.txt 题库分发到进程池中并行提取和解析，
+# 再像 create_final_exam_group.py 那样合并成一个试卷组。
+
+SOURCE_EXTS = ('.docx', '.txt')
+
+
+def collect_sources(patterns, exts=SOURCE_EXTS):
+    """把目录/通配符/文件路径展开成排序后的源文件列表（排序保证输出顺序稳定）"""
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for name in os.listdir(pattern):
+                paths.add(os.path.join(pattern, name))
+        else:
+            paths.update(glob.glob(pattern, recursive=True))
+    # 跳过 Word 打开文档时产生的 ~$ 临时文件
+    return sorted(p for p in paths
+                  if p.lower().endswith(exts) and not os.path.basename(p).startswith('~$'))
+
+
+def _pattern_root(pattern):
+    """输入参数对应的根目录：目录本身；通配符取第一个带通配符的部分之前的目录；单个文件取所在目录"""
+    if os.path.isdir(pattern):
+        return pattern
+    if not glob.has_magic(pattern):
+        return os.path.dirname(pattern)
+    parts = []
+    for part in os.path.normpath(pattern).split(os.sep):
+        if glob.has_magic(part):
+            break
+        parts.append(part)
+    return os.sep.join(parts) if parts != [''] else os.sep
+
+
+def source_names(patterns, paths):
+    """源文件相对输入根目录的路径（用 / 分隔），用作试卷 id 的来源
+    平铺目录里就是文件名；不同子目录下的同名题库得到不同的名字。两个文件得到同一个名字时抛 ValueError。"""
+    roots = sorted({os.path.abspath(_pattern_root(p) or '.') for p in patterns}, key=len, reverse=True)
+    names = {}
+    for path in paths:
+        full = os.path.abspath(path)
+        root = next((r for r in roots if os.path.commonpath([r, full]) == r), os.path.dirname(full))
+        names[path] = os.path.relpath(full, root).replace(os.sep, '/')
+    seen = {}
+    for path, name in names.items():
+        if name in seen:
+            raise ValueError(f"{seen[name]} 和 {path} 相对输入目录的路径相同（{name}），试卷 id 会重复")
+        seen[name] = path
+    return names
+
+
+def iter_source_lines(path):
+    """逐行读取一个源文件，docx 直接从 XML 流中产出段落，不生成中间的 temp.txt"""
+    if path.lower().endswith('.docx'):
+        yield from iter_docx_lines(path)
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from f
+
+
+def iter_normalized_lines(path, offsets):
+    """逐行读取并规范化（text_normalize），偏移换算记入 offsets"""
+    return normalize_lines(iter_source_lines(path), offsets)
+
+
+def ingest_file(path):
+    """进程池中的任务：流式提取 + 规范化 + 解析一个文件，返回解析结果和耗时"""
+    return ingest_lines(path, iter_source_lines(path))
+
+
+def ingest_lines(path, lines):
+    """规范化 + 解析一个文件的行（可以是边读边产出的迭代器），返回解析结果和耗时"""
+    start = time.perf_counter()
+    offsets = OffsetMap()
+    analyzer = SequenceAnalyzer(offset_map=offsets)
+    try:
+        # 题号检查串在解析器前面，与解析共用同一遍分词
+        sections = parse_tokens(analyzer.watch(tokenize_lines(normalize_lines(lines, offsets))))
+        # 解析错误里的偏移换算回原文
+        for section in sections:
+            section['errors'] = [(num, line, offsets.to_original(offset), reason)
+                                 for num, line, offset, reason in section['errors']]
+    except Exception as e:  # 单个文件失败不影响整批
+        return {'path': path, 'sections': [], 'error': f'{type(e).__name__}: {e}',
+                'elapsed': time.perf_counter() - start}
+    return {'path': path, 'sections': sections, 'error': None, 'gaps': analyzer.report(),
+            'elapsed': time.perf_counter() - start}
+
+
+def build_exam_group(results, names=None):
+    """每个文件的每个大题生成一份试卷，按文件顺序合并成试卷组
+    试卷 id 由源文件名（names 给出时用相对输入目录的路径，见 source_names）+ 大题标题决定"""
+    names = names or {}
+    exam_group = []
+    for result in results:
+        path = result['path']
+        stem = os.path.splitext(os.path.basename(path))[0]
+        exam_group.extend(sections_to_exams(stem, result['sections'], offset=len(exam_group),
+                                            source=names.get(path, os.path.basename(path))))
+    return exam_group
+
+
+def run_batch(sources, workers=None, cache=None):
+    """并行处理所有源文件，结果按输入顺序返回
+
+    传入 cache 时，内容没变的文件直接取缓存结果，只有变化的文件进入进程池。
+    """
+    workers = workers or os.cpu_count() or 1
+    results = [None] * len(sources)
+    pending = []
+    digests = {}
+    for i, path in enumerate(sources):
+        if cache is not None:
+            sections, digests[path] = cache.lookup(path)
+            if sections is not None:
+                results[i] = {'path': path, 'sections': sections, 'error': None,
+                              'elapsed': 0.0, 'cached': True}
+                continue
+        pending.append(i)
+
+    todo = [sources[i] for i in pending]
+    if workers == 1 or len(todo) <= 1:
+        fresh = [ingest_file(p) for p in todo]
+    else:
+        # chunksize 让大量小文件时减少进程间通信次数
+        chunksize = max(1, len(todo) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            fresh = list(executor.map(ingest_file, todo, chunksize=chunksize))
+
+    for i, result in zip(pending, fresh):
+        results[i] = result
+        if cache is not None and not result['error']:
+            cache.store(result['path'], digests[result['path']], result['sections'])
+    return results
+
+
+def check_gaps(results, report_path):
+    """汇总各文件的题号检查结果并写出报告，全部通过时返回 True
+
+    缓存命中的文件没有经过分词，这里单独补做一遍规范化和题号检查（不解析）。
+    """
+    reports = {}
+    for result in results:
+        if result['error']:
+            continue
+        gaps = result.get('gaps')
+        if gaps is None:
+            offsets = OffsetMap()
+            gaps = analyze_tokens(tokenize_lines(iter_normalized_lines(result['path'], offsets)),
+                                  offset_map=offsets)
+        reports[result['path']] = gaps
+    ok = all(r['ok'] for r in reports.values())
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump({"ok": ok, "files": reports}, f, ensure_ascii=False, indent=2)
+    for path, gaps in reports.items():
+        if not gaps['ok']:
+            print(f"\n✗ {os.path.basename(path)}：题号有 {gaps['issueCount']} 处问题")
+            print_gap_report(gaps)
+    print(f"题号检查：{'全部通过' if ok else '未通过'}，报告：{report_path}")
+    return ok
+
+
+def print_report(results, elapsed):
+    print(f"\n=== 批量导入报告 ===")
+    total = 0
+    for result in results:
+        name = os.path.basename(result['path'])
+        if result['error']:
+            print(f"✗ {name}：{result['error']}")
+            continue
+        counts = ', '.join(f"{s['title']} {len(s['questions'])}道" for s in result['sections'])
+        failed = sum(len(s['errors']) for s in result['sections'])
+        total += sum(len(s['questions']) for s in result['sections'])
+        if result.get('cached'):
+            print(f"✓ {name}：缓存命中，{counts}")
+            continue
+        print(f"✓ {name}：提取+解析 {result['elapsed'] * 1000:.1f}ms，"
+              f"{counts}" + (f"，{failed} 道无法解析" if failed else ''))
+    print(f"\n共处理 {len(results)} 个文件，{total} 道题，总耗时 {elapsed:.3f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='批量导入 .docx/.txt 题库并合并为试卷组')
+    parser.add_argument('sources', nargs='+', help='目录、通配符或文件路径')
+    parser.add_argument('-o', '--output', default='exam_group.json', help='输出的试卷组文件')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='进程数，默认等于 CPU 核数')
+    parser.add_argument('--cache', default=None, help='增量缓存数据库，默认为 <输出文件>.cache.sqlite')
+    parser.add_argument('--no-cache', action='store_true', help='不使用缓存，全部重新解析')
+    parser.add_argument('--compact', action='store_true', help='输出紧凑 JSON，去掉缩进和排版空白')
+    parser.add_argument('--compress', choices=COMPRESSORS, nargs='*', default=[], help='额外生成的预压缩文件')
+    parser.add_argument('--dedup', action='store_true', help='检测近似重复题，报告写到 <输出文件>.dedup.json')
+    parser.add_argument('--dedup-merge', action='store_true', help='检测并删除近似重复题（每簇保留第一道，答案与它不同的题不删）')
+    parser.add_argument('--shard-dir', default=None, help='同时按试卷分片输出到该目录（含 manifest.json）')
+    parser.add_argument('--upsert', action='store_true',
+                        help='输出文件已存在时把本次结果并入其中（按试卷 id 更新，保留用户答案和提交状态）')
+    parser.add_argument('--check-gaps', action='store_true',
+                        help='检查题号缺失/重复/倒序，报告写到 <输出文件>.gaps.json，有问题时不写出')
+    parser.add_argument('--validate', action='store_true', help='写出前校验试卷组，报告写到 <输出文件>.validation.json，有错误时不写出')
+    parser.add_argument('--index', action='store_true', help='同时更新全文索引，索引目录为 <输出文件>.index')
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    sources = collect_sources(args.sources)
+    if not sources:
+        print("错误：没有找到 .docx/.txt 文件")
+        exit(1)
+    try:
+        names = source_names(args.sources, sources)
+    except ValueError as e:
+        print(f"错误：{e}")
+        exit(1)
+
+    cache = None if args.no_cache else IngestCache(args.cache or f'{args.output}.cache.sqlite')
+    metrics = metrics_from_args(args)
+
+    # 中途因题号检查/校验不通过而退出时也要关闭缓存，已解析的结果才会提交
+    try:
+        start = time.perf_counter()
+        with metrics.stage('导入', len(sources)):
+            # 正则计数只统计主进程；多进程导入时 worker 里的匹配不在其中
+            results = run_batch(sources, args.workers, cache)
+            for result in results:
+                if result['error']:
+                    metrics.count('failedFiles')
+                    continue
+                metrics.count('questions', sum(len(s['questions']) for s in result['sections']))
+                metrics.count('parseErrors', sum(len(s['errors']) for s in result['sections']))
+            cached = sum(1 for r in results if r.get('cached'))
+            metrics.cache('导入缓存', cached, len(results) - cached)
+        if args.check_gaps:
+            with metrics.stage('题号检查', len(results)):
+                ok = check_gaps(results, f'{args.output}.gaps.json')
+            if not ok:
+                finish_metrics(metrics, args)
+                exit(1)
+        with metrics.stage('组卷', len(results)):
+            exam_group = build_exam_group(results, names)
+        if args.upsert and os.path.exists(args.output):
+            with metrics.stage('合并', len(exam_group)):
+                try:
+                    exam_group, stats = upsert_exams(read_exam_group(args.output), exam_group)
+                except ValueError as e:
+                    print(f"错误：{e}")
+                    exit(1)
+            print(f"并入 {args.output}：{format_stats(stats)}")
+        question_count = sum(len(e['questions']) for e in exam_group)
+        if args.dedup or args.dedup_merge:
+            with metrics.stage('去重', question_count):
+                report = dedup_report(exam_group, workers=args.workers)
+                print_dedup_report(report)
+                if args.dedup_merge:
+                    removed = merge_duplicates(exam_group, report)
+                    metrics.count('duplicatesRemoved', removed)
+                    print(f"删除 {removed} 道重复题")
+                with open(f'{args.output}.dedup.json', 'w', encoding='utf-8') as f:
+                    json.dump(report, f, ensure_ascii=False, indent=2)
+
+        if args.validate:
+            with metrics.stage('校验', question_count):
+                report = validate_exam_group(exam_group, args.workers)
+                print_validation_report(report, file=sys.stdout)
+                with open(f'{args.output}.validation.json', 'w', encoding='utf-8') as f:
+                    json.dump(report, f, ensure_ascii=False, indent=2)
+            if not report['ok']:
+                finish_metrics(metrics, args)
+                exit(1)
+
+        with metrics.stage('写出', question_count):
+            sizes = write_exam_group(exam_group, args.output, args.compact, args.compress)
+
+        print_report(results, time.perf_counter() - start)
+        print(f"输出文件：{args.output}，包含试卷数量：{len(exam_group)}")
+        for path, size in sizes.items():
+            print(f"  {path}：{size / 1024:.1f}KB")
+        if args.shard_dir:
+            with metrics.stage('分片', len(exam_group)):
+                manifest, written = write_shards(exam_group, args.shard_dir, args.compact)
+            print(f"分片目录：{args.shard_dir}，{manifest['examCount']} 份试卷，本次写入 {written} 个分片")
+        if args.index:
+            with metrics.stage('索引', len(exam_group)):
+                index, rebuilt = build_index(exam_group, index_path(args.output), args.workers)
+            print(f"索引目录：{index.path}，重新切分 {rebuilt} 份试卷")
+
+        if cache is not None:
+            removed = cache.prune(sources)
+            stats = cache.stats()
+            print(f"缓存：命中 {stats['hits']}，未命中 {stats['misses']}，命中率 {stats['hit_rate']:.0%}"
+                  + (f"，清理 {removed} 条过期记录" if removed else ''))
+    finally:
+        if cache is not None:
+            cache.close()
+
+    metrics.report()
+    finish_metrics(metrics, args)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+import argparse
+import gzip
+import json
+import os
+import random
+import tempfile
+import time
+
+from bench_index import make_exam_group
+from exam_archive import QuestionArchive, read_archive, write_archive
+from exam_output import dumps_exam_group
+from question_model import QuestionEncoder, load_exam_group
+
+# 列式归档基准：同一个试卷组分别存成带缩进的 JSON、紧凑 JSON 和 .qarc，
+# 比较文件大小（含 gzip 后）、整体加载耗时，以及只做统计/抽题时的耗时。
+
+
+def best_time(func, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def json_load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def json_type_counts(path):
+    counts = {}
+    for exam in json_load(path):
+        for q in exam['questions']:
+            counts[q['type']] = counts.get(q['type'], 0) + 1
+    return counts
+
+
+def archive_type_counts(path):
+    with QuestionArchive(path) as archive:
+        return archive.type_counts()
+
+
+def archive_sample(path, k):
+    with QuestionArchive(path) as archive:
+        picked = archive.sample(k, archive.select(q_type='single'), random.Random(0))
+        return [archive.question(i) for i in picked]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='列式归档与 json.load 的大小、加载耗时对比')
+    parser.add_argument('-n', type=int, default=100000, help='题目数量')
+    parser.add_argument('--per-exam', type=int, default=100, help='每份试卷的题数')
+    parser.add_argument('--repeat', type=int, default=3, help='每项重复次数，取最好成绩')
+    args = parser.parse_args()
+
+    exam_group = make_exam_group(args.n, args.per_exam)
+    # 判断题、多选题、用户答案各掺一些，让答案掩码和共享选项都用上
+    rng = random.Random(1)
+    for exam in exam_group:
+        for q in exam['questions']:
+            if rng.random() < 0.3:
+                q.type = 'multiple'
+                q.correct_answer = ','.join(l for l in 'ABCD' if rng.random() < 0.6) or 'A'
+            if rng.random() < 0.2:
+                q.user_answer = rng.choice('ABCD')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {'JSON(indent=2)': os.path.join(tmp, 'group.json'),
+                 'JSON(紧凑)': os.path.join(tmp, 'group.min.json'),
+                 '.qarc': os.path.join(tmp, 'group.qarc')}
+        for name, compact in (('JSON(indent=2)', False), ('JSON(紧凑)', True)):
+            with open(paths[name], 'w', encoding='utf-8') as f:
+                f.write(dumps_exam_group(exam_group, compact))
+        _, write_time = best_time(lambda: write_archive(exam_group, paths['.qarc']), 1)
+
+        print(f"{args.n} 道题，{len(exam_group)} 份试卷；写出 .qarc {write_time:.2f}s\n")
+        print(f"{'格式':<16}{'大小':>10}{'gzip':>10}")
+        for name, path in paths.items():
+            with open(path, 'rb') as f:
+                data = f.read()
+            print(f"{name:<16}{len(data) / 1024 / 1024:>8.1f}MB{len(gzip.compress(data, 6)) / 1024 / 1024:>8.1f}MB")
+
+        indent = paths['JSON(indent=2)']
+        archive = paths['.qarc']
+        rows = [
+            ('整体加载', lambda: load_exam_group(json_load(indent)), lambda: read_archive(archive)),
+            ('题型计数', lambda: json_type_counts(indent), lambda: archive_type_counts(archive)),
+            ('抽 100 道单选', lambda: random.Random(0).sample(
+                [q for e in json_load(indent) for q in e['questions'] if q['type'] == 'single'], 100),
+             lambda: archive_sample(archive, 100)),
+        ]
+        print(f"\n{'操作':<14}{'json.load':>12}{'.qarc':>12}{'倍数':>8}")
+        for name, from_json, from_archive in rows:
+            _, t1 = best_time(from_json, args.repeat)
+            _, t2 = best_time(from_archive, args.repeat)
+            print(f"{name:<14}{t1 * 1000:>10.1f}ms{t2 * 1000:>10.1f}ms{t1 / t2:>7.1f}x")
+
+        same = (json.dumps(read_archive(archive), ensure_ascii=False, cls=QuestionEncoder)
+                == json.dumps(exam_group, ensure_ascii=False, cls=QuestionEncoder))
+        print(f"\n往返一致：{'✓' if same else '✗'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+import argparse
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import async_ingest
+from async_ingest import StagedIngest
+from batch_ingest import build_exam_group, run_batch
+from exam_output import write_exam_group
+from exam_validator import validate_exam_group
+from pipeline_metrics import peak_rss
+from synthetic_corpus import write_docx_bank, write_txt_bank
+
+# 异步分阶段导入基准：一个目录的合成题库（每 4 个文件有一个 .docx），对比
+#   顺序   batch_ingest 的做法：逐个文件 提取+解析 → 全部组卷 → 校验 → 一次写出
+#   分阶段 async_ingest.StagedIngest，-j 1 和 -j N 各跑一次
+# 每种方式在新启动的子进程里运行，记录耗时和进程峰值 RSS（顺序方式要把整批试卷组留在内存里）。
+# --io-delay 给每次读文件加一段等待，模拟网络盘/慢盘：顺序方式把它全部累加到总耗时上，
+# 分阶段方式在读文件的同时解析和写出，等待被藏在最慢的阶段后面。
+
+READ_LINES = async_ingest.read_lines
+
+
+def delayed_read_lines(path, delay):
+    time.sleep(delay)
+    return READ_LINES(path)
+
+
+def run_sequential(sources, output, delay):
+    start = time.perf_counter()
+    if delay:
+        # 与分阶段方式相同的 I/O 等待：每个文件读之前等一下
+        for _ in sources:
+            time.sleep(delay)
+    results = run_batch(sources, 1)
+    exam_group = build_exam_group(results)
+    validate_exam_group(exam_group, 1)
+    write_exam_group(exam_group, output)
+    return time.perf_counter() - start, peak_rss(), None
+
+
+def run_staged(sources, output, delay, workers, queue_size):
+    if delay:
+        async_ingest.read_lines = lambda path: delayed_read_lines(path, delay)
+    pipeline = StagedIngest(sources, output, workers, queue_size=queue_size, validate=True)
+    summary = asyncio.run(pipeline.run())
+    return summary['elapsed'], peak_rss(), summary
+
+
+def in_child(func, *args):
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+        return executor.submit(func, *args).result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='异步分阶段导入基准')
+    parser.add_argument('--files', type=int, default=24, help='题库文件数')
+    parser.add_argument('-n', type=int, default=3000, help='每个文件的题数')
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1, help='分阶段方式的进程数')
+    parser.add_argument('--queue-size', type=int, default=async_ingest.DEFAULT_QUEUE_SIZE, help='队列容量')
+    parser.add_argument('--io-delay', type=float, default=0.0, metavar='秒', help='每次读文件额外等待的时间')
+    args = parser.parse_args()
+
+    work = tempfile.mkdtemp(prefix='bench_async_')
+    try:
+        sources = []
+        for i in range(args.files):
+            ext = 'docx' if i % 4 == 3 else 'txt'
+            path = os.path.join(work, f'bank{i:04d}.{ext}')
+            (write_docx_bank if ext == 'docx' else write_txt_bank)(path, args.n, i)
+            sources.append(path)
+        size = sum(os.path.getsize(p) for p in sources)
+        print(f"{args.files} 个题库，每个 {args.n} 道题，共 {size / 1024 / 1024:.1f}MB，CPU 核数 {os.cpu_count()}，"
+              f"每次读文件等待 {args.io_delay * 1000:.0f}ms\n")
+
+        output = os.path.join(work, 'out.json')
+        elapsed, rss, _ = in_child(run_sequential, sources, output, args.io_delay)
+        print(f"顺序（batch_ingest -j 1）：{elapsed:7.2f}s  峰值RSS {rss / 1024 / 1024:6.0f}MB")
+        for workers in sorted({1, args.workers}):
+            elapsed, rss, summary = in_child(run_staged, sources, output, args.io_delay, workers, args.queue_size)
+            busiest = max(summary['stages'].items(), key=lambda kv: kv[1]['busy'] / kv[1]['workers'])
+            print(f"分阶段 -j {workers}：        {elapsed:7.2f}s  峰值RSS {rss / 1024 / 1024:6.0f}MB  "
+                  f"最忙的阶段 {busiest[0]} 利用率 {busiest[1]['utilization']:.0%}")
+            print('    ' + '  '.join(f"{name} 忙碌 {stage['busy']:.2f}s/{stage['workers']}"
+                                     for name, stage in summary['stages'].items()))
+            print('    ' + '  '.join(f"{name} 平均 {queue['mean']:.1f} 最大 {queue['max']}/{queue['size']}"
+                                     for name, queue in summary['queues'].items()))
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
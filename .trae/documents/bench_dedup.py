@@ -0,0 +1,92 @@
+import argparse
+import os
+import random
+import time
+
+from question_dedup import THRESHOLD, find_duplicates, jaccard, question_key_text, shingles
+from question_model import Question, option_set
+
+# 近似重复检测基准：生成带已知重复关系的合成选择题，统计耗时和召回率
+
+
+def make_words(rng, count=3000):
+    """随机生成由常用汉字组成的 2~4 字词，词汇量接近真实题库"""
+    return [''.join(chr(0x4e00 + rng.randrange(2500)) for _ in range(rng.randint(2, 4))) for _ in range(count)]
+
+
+def make_question(rng, words):
+    stem = '，'.join(rng.choice(words) for _ in range(rng.randint(6, 12))) + '的是（ ）'
+    options = [''.join(rng.choice(words) for _ in range(2)) for _ in range(4)]
+    return stem, options
+
+
+def variant(rng, stem, options):
+    """近似重复：打乱选项顺序，并随机改动题干中的一两个字"""
+    chars = list(stem)
+    for _ in range(rng.randint(0, 2)):
+        chars[rng.randrange(len(chars))] = rng.choice('的了是在和')
+    options = options[:]
+    rng.shuffle(options)
+    return ''.join(chars), options
+
+
+def make_corpus(n, dup_rate, seed=0):
+    """返回 (题目列表, 每道题所属的原题编号)"""
+    rng = random.Random(seed)
+    words = make_words(rng)
+    originals = []
+    items = []
+    origin = []
+    for _ in range(n):
+        if originals and rng.random() < dup_rate:
+            k = rng.randrange(len(originals))
+            stem, options = variant(rng, *originals[k])
+        else:
+            k = len(originals)
+            stem, options = make_question(rng, words)
+            originals.append((stem, options))
+        opts = option_set((label, f'  {text}') for label, text in zip('ABCD', options))
+        items.append(Question(len(items), 'single', f'\n          <p>{stem}</p>\n        ', opts, 'A'))
+        origin.append(k)
+    return items, origin
+
+
+def main():
+    parser = argparse.ArgumentParser(description='MinHash/LSH 近似重复检测基准')
+    parser.add_argument('-n', type=int, default=100000, help='题目数量')
+    parser.add_argument('--dup-rate', type=float, default=0.2, help='近似重复题的比例')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='进程数，默认等于 CPU 核数')
+    args = parser.parse_args()
+
+    items, origin = make_corpus(args.n, args.dup_rate)
+    start = time.perf_counter()
+    clusters, stats = find_duplicates(items, workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    # 召回率：与原题的精确 Jaccard 相似度达到阈值的题中，实际与原题落在同一簇的比例
+    cluster_of = {}
+    for c, cluster in enumerate(clusters):
+        for index, _ in cluster:
+            cluster_of[index] = c
+    first = {}
+    expected = found = wrong = 0
+    for i, k in enumerate(origin):
+        if k not in first:
+            first[k] = i
+            continue
+        if jaccard(shingles(question_key_text(items[i])), shingles(question_key_text(items[first[k]]))) < THRESHOLD:
+            continue
+        expected += 1
+        if i in cluster_of and cluster_of.get(first[k]) == cluster_of[i]:
+            found += 1
+    for cluster in clusters:
+        if len({origin[index] for index, _ in cluster}) > 1:
+            wrong += 1
+
+    print(f"题目 {stats['questions']} 道，候选对 {stats['candidates']}，重复簇 {stats['clusters']} 个")
+    print(f"耗时 {elapsed:.2f}s（{stats['questions'] / elapsed:,.0f} 题/秒，{args.workers or os.cpu_count()} 个进程）")
+    print(f"召回率 {found / expected if expected else 1:.2%}（{found}/{expected}），混入不同原题的簇 {wrong} 个")
+
+
+if __name__ == '__main__':
+    main()
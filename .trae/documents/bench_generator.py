@@ -0,0 +1,94 @@
+import argparse
+import random
+import time
+from collections import Counter
+
+from bench_index import make_exam_group
+from exam_generator import StratifiedCorpus, generate_exams, parse_spec, question_stratum, select_exams
+
+# 随机组卷基准：合成题库（题型、难度随机写在 meta 里，试卷标题分属几个题库），
+# 比较每份试卷都重新筛选整个题库再 random.sample 的做法和 exam_generator 的分层数组 + 游标。
+
+TYPE_METAS = (('判断题', '1.0'), ('单选题', '1.0'), ('单选题', '1.0'), ('多选题', '2.0'), ('简答题', '5.0'))
+DIFFICULTIES = ('易', '中', '难')
+SPECS = ['判断题=10', '单选题:易=10', '单选题:中=15', '单选题:难=5', '多选题:中=8', '多选题:难=4', '简答题=3', '单选题::题库0=5']
+
+
+def make_corpus(n, per_exam, banks, rng):
+    exam_group = make_exam_group(n, per_exam)
+    for i, exam in enumerate(exam_group):
+        exam['title'] = f"题库{i % banks}-{exam['title']}"
+        questions = []
+        for j, q in enumerate(exam['questions']):
+            name, score = rng.choice(TYPE_METAS)
+            meta = f"{j + 1}. {name}（{score}分）难度：{rng.choice(DIFFICULTIES)}"
+            questions.append(q.replace(meta=meta))
+        exam['questions'] = questions
+    return exam_group
+
+
+def naive_generate(exam_group, specs, count, rng):
+    """每份试卷都把整个题库按规格筛一遍再抽样"""
+    exams = []
+    for _ in range(count):
+        picked = []
+        chosen = set()
+        for (q_type, difficulty, bank), k in specs:
+            pool = [q for exam in exam_group for q in exam['questions']
+                    if id(q) not in chosen
+                    and (bank == '*' or exam['title'].startswith(bank))
+                    and question_stratum(q)[0] == q_type
+                    and difficulty in ('*', question_stratum(q)[1])]
+            items = rng.sample(pool, min(k, len(pool)))
+            chosen.update(id(q) for q in items)
+            picked.extend(items)
+        exams.append(picked)
+    return exams
+
+
+def main():
+    parser = argparse.ArgumentParser(description='分层随机组卷基准')
+    parser.add_argument('-n', type=int, default=100000, help='题库题目数量')
+    parser.add_argument('--per-exam', type=int, default=100, help='题库中每份试卷的题数')
+    parser.add_argument('--banks', type=int, default=5, help='来源题库数量')
+    parser.add_argument('--exams', type=int, default=5000, help='生成的试卷份数')
+    parser.add_argument('--naive', type=int, default=5, help='逐份筛选方式生成的份数（很慢，按份数折算）')
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    exam_group = make_corpus(args.n, args.per_exam, args.banks, rng)
+    specs = [parse_spec(s) for s in SPECS]
+    per_exam = sum(k for _, k in specs)
+    print(f"题库：{args.n} 道题，每份试卷 {per_exam} 道题\n")
+
+    start = time.perf_counter()
+    corpus = StratifiedCorpus(exam_group)
+    t_strata = time.perf_counter() - start
+    print(f"分层：{len(corpus.strata)} 层，{t_strata:.3f}s（只做一次）")
+
+    start = time.perf_counter()
+    select_exams(corpus, specs, args.exams, seed=1)
+    t_sel = time.perf_counter() - start
+    print(f"分层数组选题：{args.exams} 份 {t_sel:.3f}s（{t_sel / args.exams * 1000:.3f}ms/份）")
+
+    start = time.perf_counter()
+    exams, stats = generate_exams(corpus, specs, args.exams, seed=1)
+    t_gen = time.perf_counter() - start
+    print(f"选题并生成试卷：{args.exams} 份 {t_gen:.3f}s（{t_gen / args.exams * 1000:.3f}ms/份）")
+
+    start = time.perf_counter()
+    naive_generate(exam_group, specs, args.naive, rng)
+    t_naive = (time.perf_counter() - start) / args.naive
+    print(f"逐份筛选抽样：{t_naive * 1000:.1f}ms/份，{args.exams} 份约 {t_naive * args.exams:.0f}s\n")
+
+    dup = sum(1 for e in exams if len({id(q) for q in e['questions']}) != len(e['questions']))
+    print(f"试卷内重复：{dup} 份；缺题：{stats['shortfall'] or '无'}")
+    usage = Counter(id(q) for e in exams for q in e['questions'])
+    print(f"用到 {stats['distinct']} 道不同的题，单题出现次数 {min(usage.values())} - {stats['maxUse']}")
+    firsts = [set(id(q) for q in e['questions']) for e in exams[:200]]
+    overlap = max(len(a & b) for i, a in enumerate(firsts) for b in firsts[i + 1:])
+    print(f"前 200 份试卷两两之间最多重叠 {overlap} 道题")
+
+
+if __name__ == '__main__':
+    main()
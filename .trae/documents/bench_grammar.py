@@ -0,0 +1,168 @@
+import argparse
+import time
+
+from bench_tokenizer import make_synthetic_text
+from question_grammar import JUDGE_SECTION_RE, JUDGE_ITEM_VARIANTS, OPTION_MARK_VARIANTS, OPTION_CHAIN_LEGACY
+from question_tokenizer import tokenize, section_tokens, iter_judge_items, split_options
+
+# 题目文法的正则变体基准
+# 对 question_grammar 中每个变体，在真实输入和恶意输入上计时并核对结果，
+# 最后给出 “全部输入都正确” 的变体里最快的一个，用数据而不是猜测来选模式。
+
+
+def judge_section(text):
+    return JUDGE_SECTION_RE.search(text).group(1)
+
+
+def expected_judge(text):
+    """以分词器的结果作为判断题的正确答案：[(题号, 答案), ...]"""
+    return [(str(num), answer) for num, _, answer, _ in iter_judge_items(section_tokens(tokenize(text), '判断'))]
+
+
+def adversarial_judge(n, width):
+    """恶意输入：n 道没有答案行的长题干，非贪婪 DOTALL 模式会从每个题号一直扫到文本末尾"""
+    lines = ['第一题：判断对错']
+    for num in range(1, n + 1):
+        lines.append(f'({num}) ' + '数据库' * (width // 3))
+    lines.append('第二题：选择题')
+    return '\n'.join(lines)
+
+
+def best_time(func, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def bench_judge(repeat, sizes, width):
+    with open('temp.txt', 'r', encoding='utf-8') as f:
+        real = f.read()
+    inputs = [('temp.txt', real, expected_judge(real))]
+    synthetic = make_synthetic_text(5000)
+    inputs.append(('合成5000题', synthetic, expected_judge(synthetic)))
+    for n in sizes:
+        inputs.append((f'恶意{n}题x{width}字', adversarial_judge(n, width), []))
+
+    print(f"\n=== 判断题条目模式 ===")
+    correct = {}
+    for name, pattern in JUDGE_ITEM_VARIANTS.items():
+        total = 0.0
+        ok = True
+        cells = []
+        for label, text, expected in inputs:
+            section = judge_section(text)
+            matches, elapsed = best_time(lambda: pattern.findall(section), repeat)
+            good = [(num, answer) for num, _, answer in matches] == expected
+            ok = ok and good
+            total += elapsed
+            cells.append(f"{label} {elapsed * 1000:8.2f}ms{'' if good else '✗'}")
+        correct[name] = (ok, total)
+        print(f"{name:<18}" + '  '.join(cells))
+    report_choice(correct)
+
+
+def adversarial_part(width):
+    """恶意输入：缺少 D 选项且选项很长，链式搜索会把后面的搜索都扫到末尾"""
+    filler = '完整性约束' * (width // 5)
+    return f'（1）题干\nA. {filler}\nB. {filler}\nC. {filler}\n' + f'{filler}\n' * 20 + 'A\n'
+
+
+def chain_split(part):
+    options = []
+    for pattern in OPTION_CHAIN_LEGACY:
+        m = pattern.search(part)
+        if not m:
+            return None
+        options.append(m.group(1).strip())
+    return options
+
+
+def scan_split(part):
+    """按行扫描：每行一次 finditer 找出全部选项标记"""
+    options = []
+    for line in part.split('\n'):
+        _, found = split_options(line, first=None)
+        options.extend(text for _, text, _ in found)
+    return options
+
+
+def bench_options(repeat, count, width):
+    real = '（1）题干\nA. 一组硬件    B. 一组软件\nC. 既有硬件，也有软件    D. 以上都不是\nC\n'
+    inputs = [
+        (f'正常{count}题', [real] * count, 4),
+        (f'缺选项{count}题', [adversarial_part(width)] * count, 3),
+    ]
+    print(f"\n=== 选项拆分 ===")
+    correct = {}
+    for name, func in (('chain_dotall', chain_split), ('line_scan', scan_split)):
+        total = 0.0
+        ok = True
+        cells = []
+        for label, parts, expected in inputs:
+            results, elapsed = best_time(lambda: [func(p) for p in parts], repeat)
+            good = all(r is not None and len(r) == expected for r in results)
+            ok = ok and good
+            total += elapsed
+            cells.append(f"{label} {elapsed * 1000:8.2f}ms{'' if good else '✗'}")
+        correct[name] = (ok, total)
+        print(f"{name:<18}" + '  '.join(cells))
+    report_choice(correct)
+
+
+def find_marks(pattern, lines):
+    """找出每行中位于行首或空白之后的选项标记位置"""
+    return [[m.start() for m in pattern.finditer(line) if m.start() == 0 or line[m.start() - 1].isspace()]
+            for line in lines]
+
+
+def bench_option_marks(repeat, count, width):
+    filler = '完整性约束' * (width // 5)
+    inputs = [
+        (f'正常{count}行', ['A.  一组硬件    B. 一组软件   C. 达到3NF.   D. 以上都不是'] * count),
+        (f'长行{count}行', [f'A. {filler} B. {filler} C. {filler} D. {filler}'] * count),
+    ]
+    print(f"\n=== 选项标记 ===")
+    correct = {}
+    for name, pattern in OPTION_MARK_VARIANTS.items():
+        total = 0.0
+        ok = True
+        cells = []
+        for label, lines in inputs:
+            found, elapsed = best_time(lambda: find_marks(pattern, lines), repeat)
+            # 每行恰好 4 个选项，“3NF.” 中的 F 不能算
+            good = all(len(f) == 4 for f in found)
+            ok = ok and good
+            total += elapsed
+            cells.append(f"{label} {elapsed * 1000:8.2f}ms{'' if good else '✗'}")
+        correct[name] = (ok, total)
+        print(f"{name:<18}" + '  '.join(cells))
+    report_choice(correct)
+
+
+def report_choice(correct):
+    candidates = [(total, name) for name, (ok, total) in correct.items() if ok]
+    if candidates:
+        total, name = min(candidates)
+        print(f"→ 推荐：{name}（所有输入结果正确，总耗时 {total * 1000:.2f}ms）")
+    else:
+        print("→ 没有在所有输入上都正确的变体")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='题目文法正则变体基准')
+    parser.add_argument('--repeat', type=int, default=3, help='每项重复次数，取最好成绩')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 100, 200], help='恶意输入的题目数量')
+    parser.add_argument('--width', type=int, default=1500, help='恶意输入每行的字符数')
+    args = parser.parse_args()
+
+    bench_judge(args.repeat, args.sizes, args.width)
+    bench_option_marks(args.repeat, 2000, args.width)
+    bench_options(args.repeat, 500, args.width)
+
+
+if __name__ == '__main__':
+    main()
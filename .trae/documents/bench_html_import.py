@@ -0,0 +1,158 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from html_import import build_exam_group, import_pages, parse_page
+
+# 页面导入基准：生成两种平台页面（常规 / Angular），含单选、多选、判断、简答题和页面外壳，
+# 测 html_import 的 页/s、MB/s，检查解析结果与生成时的答案一致，并看单个大页面解析时的内存峰值。
+
+SHELL_HEAD = ('<!DOCTYPE html><html><head><meta charset="utf-8"><title>{title}</title>'
+              '<style>.el-radio{{display:inline-block}} .desc{{color:#999}}</style>'
+              '<script>window.__INITIAL_STATE__ = {{"user": "<div class=\\"content-box\\">"}};</script>'
+              '</head><body><div id="app"><div class="header"><ul class="nav">{nav}</ul></div>'
+              '<div class="main">')
+SHELL_TAIL = '</div><div class="footer"><p>&copy; 2024 在线学习平台</p></div></div></body></html>'
+LETTERS = 'ABCD'
+TYPES = ('single', 'single', 'multiple', 'judge', 'text')
+
+
+def _words(rng, n):
+    return ''.join(rng.choice('数据库关系模式事务并发控制索引查询优化规范化函数依赖主键外键视图') for _ in range(n))
+
+
+def make_question(rng, num):
+    q_type = rng.choice(TYPES)
+    q = {'type': q_type, 'num': num, 'content': f'{_words(rng, rng.randint(15, 60))}（ ）'}
+    if q_type == 'single':
+        q['options'] = [_words(rng, rng.randint(4, 20)) for _ in LETTERS]
+        q['answer'] = rng.choice(LETTERS)
+    elif q_type == 'multiple':
+        q['options'] = [_words(rng, rng.randint(4, 20)) for _ in LETTERS]
+        q['answer'] = ''.join(sorted(rng.sample(LETTERS, rng.randint(2, 4))))
+    elif q_type == 'judge':
+        q['options'] = ['对', '错']
+        q['answer'] = rng.choice('AB')
+    else:
+        q['answer'] = _words(rng, rng.randint(20, 80))
+    q['explanation'] = _words(rng, rng.randint(10, 40))
+    return q
+
+
+def standard_item(q):
+    names = {'single': '单选题', 'multiple': '多选题', 'judge': '判断题', 'text': '简答题'}
+    group = 'el-checkbox-group' if q['type'] == 'multiple' else 'SingleChoice-radio el-radio-group'
+    parts = [f'<div class="studentTestDetail-list"><div class="plugins-testType-{q["type"]}">',
+             f'<div class="desc"><span>{q["num"]}. {names[q["type"]]}</span><span>（1.0分）</span>'
+             f'<span>难度：中</span></div>',
+             f'<div class="content-box"><p>{q["content"]}&nbsp;<img src="//img.example.com/{q["num"]}.png"></p></div>']
+    if q['type'] == 'text':
+        parts.append('<div class="reference"><div class="reference-name">参考答案：</div>'
+                     f'<div class="reference-cont"><p>{q["answer"]}</p></div></div>')
+    else:
+        parts.append(f'<div class="{group}">')
+        for letter, text in zip(LETTERS, q['options']):
+            parts.append(f'<label class="el-radio"><span class="el-radio__input"><span class="el-radio__inner">'
+                         f'</span><input type="radio" class="el-radio__original" value="{letter}"></span>'
+                         f'<span class="el-radio__label"><span class="choice">{letter}.<div><p>{text}</p></div>'
+                         f'</span></span></label>')
+        parts.append(f'</div><div class="answer-correct-type">正确答案：<i>{q["answer"]}</i></div>')
+    parts.append(f'<div class="analysisDesc"><span>试题解析</span><p>{q["explanation"]}</p></div></div></div>')
+    return ''.join(parts)
+
+
+def angular_item(q):
+    parts = [f'<app-object-quiz-item><div class="question-head">{q["num"]}</div>'
+             f'<div class="question-body"><p>{q["content"]}</p></div>']
+    if q['type'] != 'text':
+        group, kind = ('nz-checkbox-wrapper', 'ant-checkbox') if q['type'] == 'multiple' \
+            else ('nz-radio-group', 'ant-radio')
+        parts.append(f'<{group}>')
+        for letter, text in zip(LETTERS, q['options']):
+            parts.append(f'<label class="{kind}-wrapper"><span class="{kind}"><input class="{kind}-input">'
+                         f'<span class="{kind}-inner"></span></span><span>{letter}. {text}</span></label>')
+        parts.append(f'</{group}>')
+    answer = '，'.join(q['answer']) if q['type'] == 'multiple' else q['answer']
+    parts.append(f'<div class="correct-answer">正确答案: {answer}</div>'
+                 f'<div class="knowledge-points"><span class="item-title">{q["explanation"]}</span></div>'
+                 '</app-object-quiz-item>')
+    return ''.join(parts)
+
+
+def make_page(rng, count, style, title):
+    questions = [make_question(rng, i + 1) for i in range(count)]
+    item = standard_item if style == 'standard' else angular_item
+    nav = ''.join(f'<li><a href="/course/{i}">课程{i}</a></li>' for i in range(30))
+    body = ''.join(item(q) for q in questions)
+    return SHELL_HEAD.format(title=title, nav=nav) + body + SHELL_TAIL, questions
+
+
+def expected_answer(q):
+    if q['type'] == 'judge':
+        return '正确(True)' if q['answer'] == 'A' else '错误(False)'
+    if q['type'] == 'multiple':
+        return ','.join(q['answer'])
+    return q['answer']
+
+
+def check(results, expected):
+    """对比解析出的题型和答案，返回不一致的题数"""
+    wrong = 0
+    for result, questions in zip(results, expected):
+        if len(result['questions']) != len(questions):
+            wrong += abs(len(result['questions']) - len(questions))
+        for got, want in zip(result['questions'], questions):
+            want_type = 'single' if want['type'] == 'judge' else want['type']
+            if got.type != want_type or got.correct_answer != expected_answer(want) or not got.explanation:
+                wrong += 1
+    return wrong
+
+
+def main():
+    parser = argparse.ArgumentParser(description='答题页面导入基准')
+    parser.add_argument('--pages', type=int, default=400, help='页面数量（两种页面各一半）')
+    parser.add_argument('--per-page', type=int, default=50, help='每个页面的题数')
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1, help='并行时的进程数')
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths, expected = [], []
+        for i in range(args.pages):
+            style = 'standard' if i % 2 == 0 else 'angular'
+            page, questions = make_page(rng, args.per_page, style, f'第{i + 1}次作业')
+            path = os.path.join(tmp, f'page{i:05d}.html')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(page)
+            paths.append(path)
+            expected.append(questions)
+        size = sum(os.path.getsize(p) for p in paths)
+        print(f"{args.pages} 个页面，每页 {args.per_page} 道题，共 {size / 1024 / 1024:.1f}MB，"
+              f"CPU 核数 {os.cpu_count()}\n")
+
+        for workers in sorted({1, args.workers}):
+            start = time.perf_counter()
+            results = import_pages(paths, workers)
+            elapsed = time.perf_counter() - start
+            exam_group = build_exam_group(results)
+            print(f"{workers} 个进程：{elapsed:.3f}s，{args.pages / elapsed:.0f} 页/s，"
+                  f"{size / 1024 / 1024 / elapsed:.1f}MB/s，{len(exam_group)} 份试卷，"
+                  f"不一致 {check(results, expected)} 道")
+
+        big, _ = make_page(rng, 5000, 'standard', '大页面')
+        path = os.path.join(tmp, 'big.html')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(big)
+        tracemalloc.start()
+        _, questions, _ = parse_page(path)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"\n单个大页面：{os.path.getsize(path) / 1024 / 1024:.1f}MB，{len(questions)} 道题，"
+              f"解析时内存峰值 {peak / 1024 / 1024:.1f}MB（含解析出的题目）")
+
+
+if __name__ == '__main__':
+    main()
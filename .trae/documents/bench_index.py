@@ -0,0 +1,80 @@
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from bench_dedup import make_corpus
+from question_index import QuestionIndex, build_index, directory_size, index_text
+
+# 全文索引基准：在合成题库上统计建索引、增量更新和各类查询的耗时
+
+
+def make_exam_group(n, per_exam):
+    items, _ = make_corpus(n, 0.1)
+    return [{"id": str(1700000000000 + i), "title": f"合成试卷{i + 1}", "timestamp": 1700000000000 + i,
+             "questions": items[start:start + per_exam]}
+            for i, start in enumerate(range(0, n, per_exam))]
+
+
+def sample_queries(exam_group, rng, count):
+    """从题干中截取词语构造查询：单词、中文短语、OR、排除"""
+    texts = [index_text(q['content']) for exam in exam_group for q in exam['questions']]
+    words = []
+    while len(words) < count * 4:
+        text = rng.choice(texts).split(',')[0].strip()
+        if len(text) >= 4:
+            words.append(text[:rng.randint(2, 4)])
+    queries = {
+        '单词': words[:count],
+        '长短语': [rng.choice(texts).split(',')[1][:6] for _ in range(count)],
+        'OR': [f'{a} OR {b}' for a, b in zip(words[count:2 * count], words[2 * count:3 * count])],
+        '排除': [f'{a} -{b}' for a, b in zip(words[3 * count:4 * count], words[:count])],
+    }
+    return queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description='题目全文索引基准')
+    parser.add_argument('-n', type=int, default=100000, help='题目数量')
+    parser.add_argument('--per-exam', type=int, default=100, help='每份试卷的题数')
+    parser.add_argument('--queries', type=int, default=50, help='每类查询的数量')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    exam_group = make_exam_group(args.n, args.per_exam)
+    work = tempfile.mkdtemp(prefix='bench_index_')
+    try:
+        path = os.path.join(work, 'exam_group.index')
+        start = time.perf_counter()
+        index, _ = build_index(exam_group, path)
+        print(f"建索引：{len(exam_group)} 份试卷 {args.n} 道题，{time.perf_counter() - start:.2f}s，"
+              f"索引目录 {directory_size(path) / 1e6:.1f}MB")
+
+        # 改动一份试卷后增量更新
+        exam_group[len(exam_group) // 2]['questions'][0]['explanation'] = '新增的解析'
+        start = time.perf_counter()
+        _, rebuilt = build_index(exam_group, path)
+        print(f"增量更新：重新切分 {rebuilt} 份试卷，{time.perf_counter() - start:.2f}s（含核对全部试卷的哈希）")
+
+        start = time.perf_counter()
+        index = QuestionIndex(path).load_all()
+        print(f"加载索引：{time.perf_counter() - start:.2f}s，{index.stats()['terms']} 个词元")
+
+        print(f"\n{'查询':<8}{'平均':>10}{'最慢':>10}{'平均结果数':>10}")
+        for name, queries in sample_queries(exam_group, rng, args.queries).items():
+            times = []
+            found = 0
+            for query in queries:
+                start = time.perf_counter()
+                found += len(index.search(query, limit=20))
+                times.append(time.perf_counter() - start)
+            print(f"{name:<8}{sum(times) / len(times) * 1000:8.2f}ms{max(times) * 1000:8.2f}ms"
+                  f"{found / len(queries):10.1f}")
+    finally:
+        shutil.rmtree(work)
+
+
+if __name__ == '__main__':
+    main()
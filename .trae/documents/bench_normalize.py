@@ -0,0 +1,59 @@
+import argparse
+import time
+
+from bench_tokenizer import make_synthetic_text
+from parse_engine import parse_tokens
+from question_tokenizer import tokenize_lines
+from text_normalize import FOLD_TABLE, OffsetMap, normalize_lines, normalize_text
+
+# 文本规范化基准：temp.txt 重复多遍（OCR 痕迹密集，几乎每行都要改）和合成判断题文本（改动稀疏），
+# 分别测 translate 折叠、整段规范化、逐行规范化 + 偏移表的吞吐，与分词 + 解析的耗时对比，
+# 并检查规范化前后解析出的题数和答案一致。
+
+
+def best_of(func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def answers(sections):
+    return [(s['title'], [q.correct_answer for q in s['questions']]) for s in sections]
+
+
+def run(name, text):
+    lines = text.splitlines(keepends=True)
+    print(f"{name}：{len(text) / 1e6:.2f}M 字符，{len(lines)} 行")
+    rows = [
+        ('translate 折叠', lambda: text.translate(FOLD_TABLE)),
+        ('整段规范化', lambda: normalize_text(text)),
+        ('逐行 + 偏移表', lambda: list(normalize_lines(lines, OffsetMap()))),
+        ('分词 + 解析', lambda: parse_tokens(tokenize_lines(lines))),
+    ]
+    for label, func in rows:
+        elapsed = best_of(func)
+        print(f"  {label:<10}{elapsed * 1000:9.1f}ms  {len(text) / elapsed / 1e6:6.1f}M 字符/s")
+    offsets = OffsetMap()
+    normalized = list(normalize_lines(lines, offsets))
+    same = answers(parse_tokens(tokenize_lines(lines))) == answers(parse_tokens(tokenize_lines(normalized)))
+    print(f"  改动 {len(offsets)} 处，规范化前后解析结果{'一致' if same else '不一致'}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='文本规范化基准')
+    parser.add_argument('--input', default='temp.txt', help='真实题库文本')
+    parser.add_argument('--repeat', type=int, default=200, help='真实文本重复次数')
+    parser.add_argument('-n', type=int, default=50000, help='合成判断题数量')
+    args = parser.parse_args()
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        run(f"{args.input} × {args.repeat}", f.read() * args.repeat)
+    run(f"合成判断题 {args.n} 道", make_synthetic_text(args.n))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+
+from bench_tokenizer import make_synthetic_text
+from parse_engine import parse_text, questions_of, format_meta
+from question_model import QuestionEncoder
+
+# 题目内存表示基准
+# 同样的 N 道题，分别用原来的嵌套字典和 question_model 的 Question 持有，
+# 用 tracemalloc 统计常驻内存，并比较序列化耗时和输出是否一致。
+
+
+def legacy_dict(question):
+    """按原来各解析脚本的写法，为每道题构造一棵独立的字典树"""
+    return {
+        "id": question.id,
+        "type": question.type,
+        "content": question.content,
+        "options": [{"label": opt.label, "html": opt.html} for opt in question.options],
+        "correctAnswer": question.correct_answer,
+        "userAnswer": "",
+        "explanation": "",
+        # 原来每题都用 f-string 重新格式化一份 meta
+        "meta": format_meta(question.id + 1, '判断题')
+    }
+
+
+def make_questions(n):
+    """用合成判断题文本解析出 n 道题（Question 形式）"""
+    sections = parse_text(make_synthetic_text(n))
+    questions = questions_of(sections, 'judge')
+    return questions[:n]
+
+
+def measure(build):
+    """返回 (构造结果, 常驻字节数)"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Question 模型与嵌套字典的内存对比')
+    parser.add_argument('-n', type=int, default=100000, help='题目数量')
+    args = parser.parse_args()
+
+    print(f"生成并解析 {args.n} 道合成判断题...")
+    questions = make_questions(args.n)
+    n = len(questions)
+
+    # 题干文本两种表示共用，只统计题目结构本身的开销；meta 两边都重新格式化
+    dicts, dict_bytes = measure(lambda: [legacy_dict(q) for q in questions])
+    models, model_bytes = measure(lambda: [q.replace(meta=sys.intern(format_meta(q.id + 1, '判断题')))
+                                           for q in questions])
+
+    start = time.perf_counter()
+    dict_json = json.dumps(dicts, ensure_ascii=False)
+    dict_dump = time.perf_counter() - start
+    start = time.perf_counter()
+    model_json = json.dumps(models, ensure_ascii=False, cls=QuestionEncoder)
+    model_dump = time.perf_counter() - start
+
+    print(f"\n=== {n} 道题 ===")
+    print(f"{'表示':<10}{'内存':>12}{'每题':>10}{'序列化':>12}")
+    print(f"{'dict':<10}{dict_bytes / 1e6:10.2f}MB{dict_bytes / n:8.0f}B{dict_dump * 1000:10.1f}ms")
+    print(f"{'Question':<10}{model_bytes / 1e6:10.2f}MB{model_bytes / n:8.0f}B{model_dump * 1000:10.1f}ms")
+    print(f"内存节省：{1 - model_bytes / dict_bytes:.1%}")
+    print(f"序列化结果一致：{'是' if dict_json == model_json else '否'}")
+
+
+if __name__ == '__main__':
+    main()
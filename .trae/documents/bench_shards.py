@@ -0,0 +1,84 @@
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from bench_tokenizer import make_synthetic_text
+from exam_output import write_exam_group
+from exam_shards import ShardedExamGroup, write_shards
+from parse_engine import make_exam, parse_text, questions_of
+from question_model import load_exam_group
+
+# 分片输出基准：同一个多试卷语料分别写成单个试卷组文件和分片目录，
+# 比较 “列出全部试卷” 和 “打开第一份要做的试卷” 各需要多久。
+
+
+def make_corpus(exams, per_exam):
+    """生成 exams 份试卷，每份 per_exam 道判断题"""
+    questions = questions_of(parse_text(make_synthetic_text(per_exam)), 'judge')
+    return [make_exam(f'合成试卷{i + 1}', [q.replace() for q in questions], offset=i, is_submitted=False)
+            for i in range(exams)]
+
+
+def best_time(func, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def monolithic_first(path, k):
+    with open(path, 'r', encoding='utf-8') as f:
+        exam_group = json.load(f)
+    return load_exam_group([exam_group[k]])[0]
+
+
+def monolithic_list(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [exam['title'] for exam in json.load(f)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='分片输出的首份试卷加载耗时基准')
+    parser.add_argument('--exams', type=int, default=500, help='试卷数量')
+    parser.add_argument('--per-exam', type=int, default=100, help='每份试卷的题数')
+    parser.add_argument('--repeat', type=int, default=5, help='每项重复次数，取最好成绩')
+    parser.add_argument('--compact', action='store_true', help='使用紧凑 JSON')
+    args = parser.parse_args()
+
+    print(f"生成 {args.exams} 份试卷 x {args.per_exam} 道题...")
+    corpus = make_corpus(args.exams, args.per_exam)
+    work = tempfile.mkdtemp(prefix='bench_shards_')
+    try:
+        group_path = os.path.join(work, 'exam_group.json')
+        shard_dir = os.path.join(work, 'shards')
+        sizes = write_exam_group(corpus, group_path, args.compact)
+        manifest, _ = write_shards(corpus, shard_dir, args.compact)
+        manifest_bytes = os.path.getsize(os.path.join(shard_dir, 'manifest.json'))
+        k = args.exams // 2
+
+        _, mono_list = best_time(lambda: monolithic_list(group_path), args.repeat)
+        mono_exam, mono_first = best_time(lambda: monolithic_first(group_path, k), args.repeat)
+        _, shard_list = best_time(lambda: [e['title'] for e in ShardedExamGroup(shard_dir).entries], args.repeat)
+        shard_exam, shard_first = best_time(lambda: ShardedExamGroup(shard_dir)[k], args.repeat)
+
+        print(f"\n=== {args.exams} 份试卷，共 {manifest['questionCount']} 道题 ===")
+        print(f"单文件：{sizes[group_path] / 1024:.1f}KB；manifest：{manifest_bytes / 1024:.1f}KB，"
+              f"单个分片约 {manifest['exams'][k]['bytes'] / 1024:.1f}KB")
+        print(f"{'':<10}{'列出试卷':>12}{'打开一份试卷':>14}")
+        print(f"{'单文件':<10}{mono_list * 1000:10.2f}ms{mono_first * 1000:12.2f}ms")
+        print(f"{'分片':<10}{shard_list * 1000:10.2f}ms{shard_first * 1000:12.2f}ms")
+        print(f"首份试卷加速：{mono_first / shard_first:.1f}x")
+        same = mono_exam['questions'] == shard_exam['questions'] and mono_exam['id'] == shard_exam['id']
+        print(f"加载结果一致：{'是' if same else '否'}")
+    finally:
+        shutil.rmtree(work)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from bench_index import make_exam_group
+from exam_output import write_exam_group
+from exam_stream import iter_exams, transform
+from exam_validator import validate_exam_group, validate_stream
+
+# 流式读取基准：同一个大试卷组文件，比较 json.load 整体读入和 exam_stream 逐题读取的
+# 耗时与 Python 堆峰值（tracemalloc），以及整体/流式两种方式的校验和复制。
+
+
+def measure(func):
+    """返回 (耗时, 峰值内存)；耗时不开 tracemalloc 单独测一次"""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def load_all(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        exam_group = json.load(f)
+    return sum(len(exam['questions']) for exam in exam_group)
+
+
+def stream_all(path):
+    return sum(1 for _, questions in iter_exams(path) for _ in questions)
+
+
+def validate_all(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return validate_exam_group(json.load(f), workers=1)
+
+
+def copy_all(path, output):
+    with open(path, 'r', encoding='utf-8') as f:
+        exam_group = json.load(f)
+    write_exam_group(exam_group, output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='流式读取试卷组的内存与耗时基准')
+    parser.add_argument('-n', type=int, default=100000, help='题目数量')
+    parser.add_argument('--per-exam', type=int, default=100, help='每份试卷的题数')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'group.json')
+        output = os.path.join(tmp, 'out.json')
+        write_exam_group(make_exam_group(args.n, args.per_exam), path)
+        size = os.path.getsize(path)
+        print(f"试卷组文件：{args.n} 道题，{size / 1024 / 1024:.1f}MB\n")
+
+        rows = [
+            ('读取', lambda: load_all(path), lambda: stream_all(path)),
+            ('校验', lambda: validate_all(path), lambda: validate_stream(path)),
+            ('复制', lambda: copy_all(path, output), lambda: transform(path, output, lambda h, q: q)),
+        ]
+        print(f"{'操作':<6}{'json.load':>12}{'峰值':>10}{'流式':>12}{'峰值':>10}")
+        for name, whole, stream in rows:
+            t1, m1 = measure(whole)
+            t2, m2 = measure(stream)
+            print(f"{name:<6}{t1:>11.2f}s{m1 / 1024 / 1024:>8.1f}MB{t2:>11.2f}s{m2 / 1024 / 1024:>8.1f}MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+
+from batch_ingest import iter_source_lines
+from bench_html_import import check as check_pages
+from exam_merge import read_exam_group, upsert_exams
+from exam_output import dumps_exam_group, write_exam_group
+from exam_validator import validate_exam_group
+from html_import import build_exam_group as build_page_exam_group, import_pages
+from parse_engine import parse_tokens, sections_to_exams
+from pipeline_metrics import PipelineMetrics
+from question_model import load_exam_group
+from question_tokenizer import tokenize_lines
+from synthetic_corpus import FORMATS, check_sections, write_docx_bank, write_html_pages, write_json_group, \
+    write_txt_bank
+from text_normalize import OffsetMap, normalize_lines
+
+# 性能基准套件：用 synthetic_corpus.py 按固定种子生成各种规模的 .txt/.docx/.html/试卷组 JSON，
+# 逐阶段（提取、解析、校验、合并、写出）用 pipeline_metrics 计时，和保存的基线比较。
+# 某个阶段比基线慢出预算（默认 1.3 倍）或者解析结果和生成时记录的答案不一致时，退出码为 1。
+#   提取  .txt 逐行读取 / .docx 流式解析 document.xml（.html 和 JSON 没有单独的提取阶段）
+#   解析  规范化 + 分词 + 解析 + 组卷 / html_import 解析页面 / 读取试卷组 JSON
+#   校验  exam_validator；合并  把本次结果并入一份内容相同的试卷组；写出  写试卷组 JSON
+# 每次测量都在新启动的子进程里单进程运行（-j 1）：同一个进程里前面留下的堆状态会让后面的测量慢出三到五成，
+# 而且这种偏慢在进程内是持续的，只在一个进程里重复几次取最快也躲不开；峰值 RSS 也只有这样才是这个用例自己的。
+# 共享 CPU 的机器上单次测量能差五成以上，每个阶段取 5 次（--repeat）中最快的一次，波动可以压到一成多；
+# 生成题库的时间不计入。
+#   python bench_suite.py                                  默认 1千、1万 题，与 bench_baseline.json 比较
+#   python bench_suite.py --save-baseline                  把本次结果存为基线（其余规模/格式的旧基线保留）
+#   python bench_suite.py --sizes 100000 1000000 --formats txt docx --repeat 1
+#   python bench_suite.py --budget 1.2 --stage-budget 解析=1.1 写出=1.5
+# 基线和机器相关：换机器或 Python 版本后先 --save-baseline 一次。
+
+BASELINE_VERSION = 1
+DEFAULT_BASELINE = 'bench_baseline.json'
+DEFAULT_SIZES = (1000, 10000)
+DEFAULT_BUDGET = 1.3
+# 基线低于这个时间（秒）的阶段受 GC 和缓存状态影响，波动可达 1.5 倍以上，只报告不判定
+MIN_BASELINE_SECONDS = 0.02
+STAGES = ('提取', '解析', '校验', '合并', '写出')
+
+
+def machine_info():
+    return {"python": platform.python_version(), "platform": platform.platform(), "cpuCount": os.cpu_count()}
+
+
+def size_name(n):
+    return f'{n // 1000000}M' if n >= 1000000 and n % 1000000 == 0 else \
+        f'{n // 1000}k' if n >= 1000 and n % 1000 == 0 else str(n)
+
+
+def prepare(fmt, n, work, seed, per_page):
+    """生成一种格式的题库，返回 {'paths', 'expected', 'bytes'}"""
+    stem = os.path.join(work, f'bank_{n}')
+    if fmt == 'txt':
+        paths, expected = [f'{stem}.txt'], write_txt_bank(f'{stem}.txt', n, seed)
+    elif fmt == 'docx':
+        paths, expected = [f'{stem}.docx'], write_docx_bank(f'{stem}.docx', n, seed)
+    elif fmt == 'html':
+        paths, expected = write_html_pages(f'{stem}_html', n, seed, per_page)
+    else:
+        write_json_group(f'{stem}.json', n)
+        paths, expected = [f'{stem}.json'], None
+    return {'paths': paths, 'expected': expected, 'bytes': sum(os.path.getsize(p) for p in paths)}
+
+
+def run_stages(fmt, case, work):
+    """在子进程中跑一遍各阶段，返回 ({阶段: 测量结果}, 与生成时不一致的题数)"""
+    metrics = PipelineMetrics()
+    wrong = 0
+    if fmt in ('txt', 'docx'):
+        path = case['paths'][0]
+        with metrics.stage('提取') as s:
+            lines = list(iter_source_lines(path))
+            s.items = len(lines)
+        with metrics.stage('解析') as s:
+            sections = parse_tokens(tokenize_lines(normalize_lines(lines, OffsetMap())))
+            exam_group = sections_to_exams(fmt, sections, source=os.path.basename(path))
+            s.items = sum(len(x['questions']) for x in sections)
+        del lines
+        wrong = check_sections(sections, case['expected'])
+    elif fmt == 'html':
+        with metrics.stage('解析', len(case['paths'])):
+            results = import_pages(case['paths'], 1)
+            exam_group = build_page_exam_group(results)
+        wrong = check_pages(results, case['expected'])
+    else:
+        with metrics.stage('解析') as s:
+            exam_group = read_exam_group(case['paths'][0])
+            s.items = sum(len(e['questions']) for e in exam_group)
+    question_count = sum(len(e['questions']) for e in exam_group)
+
+    with metrics.stage('校验', question_count):
+        report = validate_exam_group(exam_group, 1)
+        metrics.count('validationErrors', report['errorCount'])
+    # 合并对象是一份内容相同的旧试卷组（重新导入同一批题库的常见情况），准备它的时间不计入
+    existing = load_exam_group(json.loads(dumps_exam_group(exam_group)))
+    with metrics.stage('合并', len(exam_group)):
+        exam_group, _ = upsert_exams(existing, exam_group)
+    with metrics.stage('写出', question_count):
+        write_exam_group(exam_group, os.path.join(work, 'out.json'))
+    metrics.close()
+    stages = {record.name: {k: v for k, v in record.to_dict().items()
+                            if k in ('wall', 'cpu', 'items', 'itemsPerSec', 'peakRss')}
+              for record in metrics.stages}
+    return stages, wrong
+
+
+def measure(fmt, n, work, seed, per_page, repeat):
+    """生成题库后重复测量，每次都在新启动的子进程里跑，每个阶段取最快的一次"""
+    case_dir = os.path.join(work, f'{fmt}_{n}')
+    os.makedirs(case_dir)
+    start = time.perf_counter()
+    case = prepare(fmt, n, case_dir, seed, per_page)
+    generated = time.perf_counter() - start
+    best = {}
+    wrong = 0
+    for _ in range(repeat):
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+            stages, wrong = executor.submit(run_stages, fmt, case, case_dir).result()
+        for name, stage in stages.items():
+            if name not in best or stage['wall'] < best[name]['wall']:
+                best[name] = stage
+    shutil.rmtree(case_dir, ignore_errors=True)
+    return {"questions": n, "bytes": case['bytes'], "generated": round(generated, 3), "wrong": wrong,
+            "stages": {name: best[name] for name in STAGES if name in best}}
+
+
+def compare(results, baseline, budget, stage_budgets):
+    """逐阶段与基线比较，返回 [(用例, 阶段, 本次, 基线, 比值, 预算, 状态)]
+
+    状态：ok 在预算内、slow 超出预算、noisy 基线太短不判定、new 没有基线
+    """
+    rows = []
+    base_results = baseline.get('results', {}) if baseline else {}
+    for key, result in results.items():
+        base_stages = base_results.get(key, {}).get('stages', {})
+        for name, stage in result['stages'].items():
+            limit = stage_budgets.get(name, budget)
+            base = base_stages.get(name)
+            if base is None:
+                rows.append((key, name, stage['wall'], None, None, limit, 'new'))
+                continue
+            ratio = stage['wall'] / base['wall'] if base['wall'] else None
+            if base['wall'] < MIN_BASELINE_SECONDS:
+                status = 'noisy'
+            else:
+                status = 'slow' if ratio > limit else 'ok'
+            rows.append((key, name, stage['wall'], base['wall'], ratio, limit, status))
+    return rows
+
+
+STATUS_MARKS = {'ok': '✓', 'slow': '✗ 超出预算', 'noisy': '-（基线太短）', 'new': '新增'}
+
+
+def print_rows(results, rows):
+    print(f"\n{'用例':<12}{'阶段':<6}{'本次':>10}{'基线':>10}{'比值':>7}{'预算':>6}{'条/s':>12}  结果")
+    for key, name, wall, base, ratio, limit, status in rows:
+        stage = results[key]['stages'][name]
+        rate = f"{stage['itemsPerSec']:.0f}" if stage['itemsPerSec'] else '-'
+        print(f"{key:<12}{name:<6}{wall * 1000:8.1f}ms"
+              + (f"{base * 1000:8.1f}ms{ratio:7.2f}" if base is not None else f"{'-':>10}{'-':>7}")
+              + f"{limit:6.2f}{rate:>12}  {STATUS_MARKS[status]}")
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(path, baseline, results, budget, stage_budgets):
+    """本次结果覆盖同名用例，其余用例的旧基线保留"""
+    data = baseline or {"results": {}}
+    data.update({
+        "version": BASELINE_VERSION,
+        "saved": datetime.now().isoformat(timespec='seconds'),
+        "machine": machine_info(),
+        "budget": budget,
+        "budgets": stage_budgets,
+    })
+    data['results'].update(results)
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def parse_stage_budgets(items):
+    budgets = {}
+    for item in items:
+        name, sep, value = item.partition('=')
+        if not sep or name not in STAGES:
+            raise ValueError(f'阶段预算格式应为 阶段=倍数，阶段为 {"/".join(STAGES)}：{item}')
+        budgets[name] = float(value)
+    return budgets
+
+
+def main():
+    parser = argparse.ArgumentParser(description='合成题库上的分阶段性能基准，超出预算时失败')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help='题目数量，如 1000 10000 100000 1000000')
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=list(FORMATS), help='题库格式')
+    parser.add_argument('--repeat', type=int, default=5, help='每个用例重复次数，取最快的一次')
+    parser.add_argument('--seed', type=int, default=0, help='合成题库的随机种子')
+    parser.add_argument('--per-page', type=int, default=100, help='每个答题页面的题数')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='基线文件')
+    parser.add_argument('--save-baseline', action='store_true', help='把本次结果写入基线文件，不做比较')
+    parser.add_argument('--budget', type=float, default=None,
+                        help=f'允许的耗时倍数（相对基线），默认取基线文件中的设置或 {DEFAULT_BUDGET}')
+    parser.add_argument('--stage-budget', nargs='*', default=[], metavar='阶段=倍数', help='单个阶段的预算')
+    parser.add_argument('-o', '--output', default=None, help='本次结果另存为 JSON')
+    parser.add_argument('--work-dir', default=None, help='存放合成题库的临时目录，默认系统临时目录')
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.baseline)
+    budget = args.budget or (baseline or {}).get('budget') or DEFAULT_BUDGET
+    stage_budgets = dict((baseline or {}).get('budgets', {}))
+    try:
+        stage_budgets.update(parse_stage_budgets(args.stage_budget))
+    except ValueError as e:
+        parser.error(str(e))
+    if baseline and baseline.get('machine') != machine_info():
+        print(f"注意：基线保存于不同的环境 {baseline.get('machine')}，比较结果仅供参考", file=sys.stderr)
+
+    work = tempfile.mkdtemp(prefix='bench_suite_', dir=args.work_dir)
+    results = {}
+    try:
+        for n in args.sizes:
+            for fmt in args.formats:
+                key = f'{fmt}/{size_name(n)}'
+                results[key] = result = measure(fmt, n, work, args.seed, args.per_page, args.repeat)
+                total = sum(s['wall'] for s in result['stages'].values())
+                print(f"{key:<12}{result['bytes'] / 1024 / 1024:8.1f}MB  生成 {result['generated']:.2f}s  "
+                      f"各阶段合计 {total:.3f}s" + (f"  ✗ 不一致 {result['wrong']} 道" if result['wrong'] else ''))
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"machine": machine_info(), "results": results}, f, ensure_ascii=False, indent=2)
+    wrong = sum(r['wrong'] for r in results.values())
+    if args.save_baseline:
+        save_baseline(args.baseline, baseline, results, budget, stage_budgets)
+        print_rows(results, compare(results, None, budget, stage_budgets))
+        print(f"\n基线已保存：{args.baseline}")
+        sys.exit(1 if wrong else 0)
+
+    rows = compare(results, baseline, budget, stage_budgets)
+    print_rows(results, rows)
+    slow = [row for row in rows if row[-1] == 'slow']
+    if baseline is None:
+        print(f"\n没有基线文件 {args.baseline}，先用 --save-baseline 保存一次")
+    print(f"\n超出预算 {len(slow)} 个阶段，解析不一致 {wrong} 道：{'未通过' if slow or wrong else '通过'}")
+    sys.exit(1 if slow or wrong else 0)
+
+
+if __name__ == '__main__':
+    main()
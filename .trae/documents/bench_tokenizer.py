@@ -0,0 +1,106 @@
+import argparse
+import random
+import re
+import time
+
+from question_tokenizer import tokenize, section_tokens, iter_judge_items
+
+# 分词器与原有判断题解析方式的对比基准
+# 用合成的判断题文本（默认 5 万题）比较：
+#   manual_parse_judge.py 的逐题号 find 扫描（O(n²)）
+#   fix_all_judge_questions.py 的 finditer + 每段 re.search
+#   question_tokenizer 的单遍分词
+
+
+def make_synthetic_text(n, seed=0):
+    """生成 n 道判断题的合成文本，混合半角/全角括号、题号后有无空格、多行题干"""
+    rng = random.Random(seed)
+    words = ['数据库', '关系模式', '候选码', '事务', '并发控制', '完整性约束', 'SQL语句', '外模式', '函数依赖', '第三范式']
+    lines = ['学号：          姓名：          班级：', '第一题：判断对错']
+    for num in range(1, n + 1):
+        body = '，'.join(rng.choice(words) for _ in range(rng.randint(3, 8))) + '。'
+        if num % 2:
+            lines.append(f'({num}) {body}')
+        else:
+            lines.append(f'（{num}）{body}')
+        if num % 17 == 0:
+            lines.append('如：')
+            lines.append("INSERT INTO SC(Sno, Cno, Grade) VALUES ('201215128', 1);")
+        lines.append(rng.choice('√×'))
+    lines.append('第二题：选择题')
+    return '\n'.join(lines)
+
+
+def legacy_manual(text, limit):
+    """manual_parse_judge.py 的原始算法（每个题号从头 find，再向后 find 下一题号）"""
+    judge_text = re.search(r'第一题：判断对错(.*?)第二题：选择题', text, re.DOTALL).group(1)
+    count = 0
+    for expected_num in range(1, limit + 1):
+        for pattern in (f'({expected_num})', f'（{expected_num}）'):
+            pos = judge_text.find(pattern)
+            if pos == -1:
+                continue
+            next_pos = len(judge_text)
+            for next_num in range(expected_num + 1, limit + 1):
+                for next_pat in (f'({next_num})', f'（{next_num}）'):
+                    np = judge_text.find(next_pat, pos + 1)
+                    if np != -1 and np < next_pos:
+                        next_pos = np
+                        break
+                if next_pos != len(judge_text):
+                    break
+            if re.search(r'[\)）]\s*(.+?)\n([√×])', judge_text[pos:next_pos], re.DOTALL):
+                count += 1
+            break
+    return count
+
+
+def legacy_fix_all(text):
+    """fix_all_judge_questions.py 的原始算法（先找全部题号，再对每段切片 re.search）"""
+    judge_text = re.search(r'第一题：判断对错(.*?)第二题：选择题', text, re.DOTALL).group(1)
+    markers = list(re.finditer(r'[\(（](\d+)[\)）]', judge_text))
+    count = 0
+    for i, marker in enumerate(markers):
+        end_pos = markers[i + 1].start() if i < len(markers) - 1 else len(judge_text)
+        if re.search(r'[\)）]\s*(.*?)\n([√×])', judge_text[marker.start():end_pos], re.DOTALL):
+            count += 1
+    return count
+
+
+def tokenizer_parse(text):
+    """基于单遍分词器解析判断题"""
+    return sum(1 for _ in iter_judge_items(section_tokens(tokenize(text), '判断')))
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='分词器基准测试')
+    parser.add_argument('-n', type=int, default=50000, help='合成题目数量')
+    parser.add_argument('--legacy-max', type=int, default=5000,
+                        help='逐题号 find 算法是 O(n²)，只在前 N 题上运行')
+    args = parser.parse_args()
+
+    text = make_synthetic_text(args.n)
+    print(f"合成文本：{args.n} 道判断题，{len(text)} 字符")
+
+    count, elapsed = timed(tokenizer_parse, text)
+    print(f"单遍分词器：          {count:>7} 题  {elapsed:8.3f}s  {count / elapsed:12.0f} 题/秒")
+
+    count, elapsed = timed(legacy_fix_all, text)
+    print(f"finditer + 切片搜索：  {count:>7} 题  {elapsed:8.3f}s  {count / elapsed:12.0f} 题/秒")
+
+    limit = min(args.n, args.legacy_max)
+    small = make_synthetic_text(limit)
+    count, elapsed = timed(legacy_manual, small, limit)
+    print(f"逐题号 find（前{limit}题）：{count:>7} 题  {elapsed:8.3f}s  {count / elapsed:12.0f} 题/秒")
+    small_count, small_elapsed = timed(tokenizer_parse, small)
+    print(f"同规模单遍分词器：    {small_count:>7} 题  {small_elapsed:8.3f}s  加速 {elapsed / small_elapsed:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,14 @@
 import json
 import os
 
+from exam_merge import format_stats, read_exam_group, upsert_exams
+from parse_engine import stable_exam_id
+from question_model import QuestionEncoder, load_exam_group
+
 # 读取判断题和单选题文件
 true_false_path = r'c:\Users\DAI\IdeaProjects\vue_project_2\.trae\数据库原理判断题.json'
 single_choice_path = r'c:\Users\DAI\IdeaProjects\vue_project_2\.trae\数据库原理单选题.json'
+output_path = r'c:\Users\DAI\IdeaProjects\vue_project_2\.trae\数据库原理试卷组.json'
 
 # 读取文件内容
 with open(true_false_path, 'r', encoding='utf-8') as f:
@@ -16,13 +21,19 @@ with open(single_choice_path, 'r', encoding='utf-8') as f:
 true_false_exam['isSubmitted'] = True
 single_choice_exam['isSubmitted'] = True
 
+# 试卷 id 由 文件名 + 标题 决定；输出文件已存在时按 id 更新其中的试卷（保留用户答案和提交状态），
+# 重复运行不会再追加出第二份同样的试卷
+for exam, path in ((true_false_exam, true_false_path), (single_choice_exam, single_choice_path)):
+    exam['id'] = stable_exam_id(os.path.basename(path), exam['title'])
+
 # 创建试卷组
-exam_group = [true_false_exam, single_choice_exam]
+existing = read_exam_group(output_path) if os.path.exists(output_path) else []
+exam_group, stats = upsert_exams(existing, load_exam_group([true_false_exam, single_choice_exam]))
+print(f"合并到已有试卷组：{format_stats(stats)}")
 
 # 写入到新文件
-output_path = r'c:\Users\DAI\IdeaProjects\vue_project_2\.trae\数据库原理试卷组.json'
 with open(output_path, 'w', encoding='utf-8') as f:
-    json.dump(exam_group, f, ensure_ascii=False, indent=2)
+    json.dump(exam_group, f, ensure_ascii=False, indent=2, cls=QuestionEncoder)
 
 print(f"试卷组已创建：{output_path}")
 print(f"包含 {len(exam_group)} 份试卷")
@@ -1,6 +1,10 @@
 import json
 import os
 
+from exam_merge import format_stats, read_exam_group, upsert_exams
+from parse_engine import stable_exam_id
+from question_model import QuestionEncoder, load_exam_group
+
 # 文件路径
 judge_file = r'c:\Users\DAI\IdeaProjects\vue_project_2\.trae\数据库原理判断题_fixed.json'
 single_file = r'c:\Users\DAI\IdeaProjects\vue_project_2\.trae\数据库原理单选题.json'
@@ -29,12 +33,19 @@ if 'isSubmitted' not in judge_exam:
 if 'isSubmitted' not in single_exam:
     single_exam['isSubmitted'] = True
 
+# 试卷 id 由 文件名 + 标题 决定；输出文件已存在时按 id 更新其中的试卷（保留用户答案和提交状态），
+# 重复运行不会再追加出第二份同样的试卷
+for exam, path in ((judge_exam, judge_file), (single_exam, single_file)):
+    exam['id'] = stable_exam_id(os.path.basename(path), exam['title'])
+
 # 创建试卷组
-exam_group = [judge_exam, single_exam]
+existing = read_exam_group(output_file) if os.path.exists(output_file) else []
+exam_group, stats = upsert_exams(existing, load_exam_group([judge_exam, single_exam]))
+print(f"合并到已有试卷组：{format_stats(stats)}")
 
 # 写入到新文件
 with open(output_file, 'w', encoding='utf-8') as f:
-    json.dump(exam_group, f, ensure_ascii=False, indent=2)
+    json.dump(exam_group, f, ensure_ascii=False, indent=2, cls=QuestionEncoder)
 
 print(f"\n=== 试卷组创建成功 ===")
 print(f"输出文件：{output_file}")
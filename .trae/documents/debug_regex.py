@@ -1,27 +1,21 @@
-import re
+from question_grammar import JUDGE_SECTION_RE, JUDGE_ITEM_VARIANTS
 
 # 读取文件内容
 with open(r'c:\Users\DAI\IdeaProjects\vue_project_2\.trae\documents\temp.txt', 'r', encoding='utf-8') as f:
     text = f.read()
 
 # 提取判断题部分
-judge_section = re.search(r'第一题：判断对错(.*?)第二题：选择题', text, re.DOTALL)
+judge_section = JUDGE_SECTION_RE.search(text)
 if judge_section:
     judge_text = judge_section.group(1)
     print(f"判断题部分长度：{len(judge_text)}字符")
     print(f"判断题部分内容前500字符：\n{judge_text[:500]}...")
     print(f"\n判断题部分内容后500字符：\n{judge_text[-500:]}...")
     
-    # 尝试不同的正则表达式
-    patterns = [
-        r'[\(（](\d+)[\)）]\s+(.*?)\n([√×])',
-        r'[\(（](\d+)[\)）]\s+(.+?)\n([√×])',
-        r'[\(（](\d+)[\)）]\s+(.{0,200}?)\n([√×])'
-    ]
-    
-    for i, pattern in enumerate(patterns):
-        matches = re.findall(pattern, judge_text, re.DOTALL)
-        print(f"\n正则表达式 {i+1} 匹配到 {len(matches)} 个判断题")
+    # 尝试不同的正则表达式（全部在 question_grammar 中预编译，计时对比见 bench_grammar.py）
+    for i, (name, pattern) in enumerate(JUDGE_ITEM_VARIANTS.items()):
+        matches = pattern.findall(judge_text)
+        print(f"\n正则表达式 {i+1}（{name}）匹配到 {len(matches)} 个判断题")
         if len(matches) > 0:
             for j, match in enumerate(matches[:5]):  # 只显示前5个
                 print(f"  {j+1}: 第{match[0]}题, 内容：{match[1][:20]}..., 答案：{match[2]}")
@@ -0,0 +1,429 @@
+import argparse
+import json
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+from array import array
+from collections import Counter
+
+from question_model import Question, QuestionEncoder, load_exam_group, option_set
+
+# 列式二进制题库归档（.qarc）
+# 做统计时每次都要 json.load 整个带缩进的试卷组；这里把题目按列存放：
+#   题型        每题 1 字节的类型码
+#   文本        题干 / 选项 / 解析 / meta 全部放进一个 UTF-8 字符串区，列里只存字符串编号，
+#               相同的字符串（判断题选项、A/B/C/D、meta）只存一份
+#   答案        correctAnswer / userAnswer 存成选项下标的位掩码（A,C -> 0b101）；
+#               掩码表示不了的（简答题、答案不是选项 label 等）存字符串编号；答案为 null 时记在 q_extra 中
+#   选项        每题在选项列中的起止位置
+# 文件可以直接 mmap：打开时只读头部和列目录，题型计数、按题型/答案个数筛选、随机抽题
+# 都只碰需要的列，取某道题时才解码它用到的字符串。
+# 与 question_model 的往返是无损的：write_archive -> read 得到的试卷组
+# 用 QuestionEncoder 输出的 JSON 与原试卷组完全相同。
+#   python exam_archive.py export 试卷组.json -o 试卷组.qarc
+#   python exam_archive.py import 试卷组.qarc -o 试卷组.json
+#   python exam_archive.py stats 试卷组.qarc
+
+MAGIC = b'QARC'
+ARCHIVE_VERSION = 1
+HEADER = struct.Struct('<4sHHIIII')     # magic, version, 列数, 试卷数, 题目数, 选项数, 字符串数
+COLUMN = struct.Struct('<8s2xcxQQ')     # 列名, 类型码, 偏移, 元素个数
+NONE = 0xFFFFFFFF                       # 字符串编号列中的 “没有”
+ALIGN = 8
+
+TYPE_CODES = {'single': 0, 'multiple': 1, 'text': 2}
+TYPE_NAMES = {code: name for name, code in TYPE_CODES.items()}
+OTHER_TYPE = 255                        # 其他题型，名称放在 q_extra 中
+MAX_MASK_OPTIONS = 32
+
+
+class ArchiveError(ValueError):
+    pass
+
+
+class _StringTable:
+    def __init__(self):
+        self.index = {}
+        self.offsets = array('Q', [0])
+        self.parts = []
+        self.size = 0
+
+    def add(self, text):
+        if text is None:
+            return NONE
+        i = self.index.get(text)
+        if i is None:
+            data = text.encode('utf-8')
+            i = self.index[text] = len(self.offsets) - 1
+            self.parts.append(data)
+            self.size += len(data)
+            self.offsets.append(self.size)
+        return i
+
+
+def answer_mask(answer, labels):
+    """把答案转成选项下标的位掩码；按掩码还原不出原字符串时返回 None"""
+    if not answer or not labels or len(labels) > MAX_MASK_OPTIONS:
+        return None
+    positions = {label: i for i, label in enumerate(labels)}
+    mask = 0
+    for part in answer.split(','):
+        i = positions.get(part)
+        if i is None:
+            return None
+        mask |= 1 << i
+    return mask if mask_answer(mask, labels) == answer else None
+
+
+def mask_answer(mask, labels):
+    return ','.join(label for i, label in enumerate(labels) if mask >> i & 1)
+
+
+def _columns(exam_group):
+    strings = _StringTable()
+    add = strings.add
+    cols = {
+        'e_header': array('I'), 'e_qstart': array('I', [0]),
+        'q_type': array('B'), 'q_id': array('q'), 'q_stem': array('I'), 'q_expl': array('I'),
+        'q_meta': array('I'), 'q_ans': array('I'), 'q_anstxt': array('I'), 'q_usr': array('I'),
+        'q_usrtxt': array('I'), 'q_extra': array('I'), 'q_ostart': array('I', [0]),
+        'o_label': array('I'), 'o_html': array('I'),
+    }
+    q_type, q_id, q_stem, q_expl, q_meta = (cols[k] for k in ('q_type', 'q_id', 'q_stem', 'q_expl', 'q_meta'))
+    q_ans, q_anstxt, q_usr, q_usrtxt, q_extra = (cols[k] for k in ('q_ans', 'q_anstxt', 'q_usr', 'q_usrtxt', 'q_extra'))
+    o_label, o_html = cols['o_label'], cols['o_html']
+
+    for exam in exam_group:
+        # 试卷头（除 questions 外的字段）整体存成 JSON，questions 的位置用 null 占住，保证字段顺序不变
+        header = {key: (None if key == 'questions' else value) for key, value in exam.items()}
+        cols['e_header'].append(add(json.dumps(header, ensure_ascii=False, separators=(',', ':'))))
+        for q in exam['questions']:
+            extra = {}
+            code = TYPE_CODES.get(q['type'], OTHER_TYPE)
+            if code == OTHER_TYPE:
+                extra['type'] = q['type']
+            qid = q['id']
+            if type(qid) is int:
+                q_id.append(qid)
+            else:
+                q_id.append(0)
+                extra['id'] = qid
+            q_type.append(code)
+            q_stem.append(add(q['content']))
+            q_expl.append(add(q['explanation']))
+            q_meta.append(add(q.get('meta')))
+
+            labels = []
+            for opt in q['options']:
+                labels.append(opt['label'])
+                o_label.append(add(opt['label']))
+                o_html.append(add(opt['html']))
+            cols['q_ostart'].append(len(o_label))
+
+            for field, mask_col, text_col in (('correctAnswer', q_ans, q_anstxt), ('userAnswer', q_usr, q_usrtxt)):
+                answer = q[field]
+                if answer is None:
+                    # 掩码 0 会读成 ''，None 放进 q_extra
+                    extra[field] = None
+                    mask_col.append(0)
+                    text_col.append(NONE)
+                    continue
+                mask = answer_mask(answer, labels)
+                if mask is not None:
+                    mask_col.append(mask)
+                    text_col.append(NONE)
+                else:
+                    mask_col.append(0)
+                    text_col.append(add(answer))
+            q_extra.append(add(json.dumps(extra, ensure_ascii=False)) if extra else NONE)
+        cols['e_qstart'].append(len(q_type))
+
+    cols['s_offset'] = strings.offsets
+    blob = array('B')
+    blob.frombytes(b''.join(strings.parts))
+    cols['s_blob'] = blob
+    return cols, len(strings.offsets) - 1
+
+
+def write_archive(exam_group, path):
+    """写出归档文件，返回文件字节数"""
+    cols, n_strings = _columns(exam_group)
+    n_exams = len(cols['e_header'])
+    n_questions = len(cols['q_type'])
+    n_options = len(cols['o_label'])
+    if sys.byteorder != 'little':
+        for col in cols.values():
+            col.byteswap()
+
+    offset = HEADER.size + COLUMN.size * len(cols)
+    directory = []
+    for name, col in cols.items():
+        assert len(name) <= 8, name
+        offset += -offset % ALIGN
+        directory.append((name, col, offset))
+        offset += len(col) * col.itemsize
+
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, ARCHIVE_VERSION, len(cols), n_exams, n_questions, n_options, n_strings))
+        for name, col, col_offset in directory:
+            f.write(COLUMN.pack(name.encode('ascii'), col.typecode.encode('ascii'), col_offset, len(col)))
+        for name, col, col_offset in directory:
+            f.write(b'\0' * (col_offset - f.tell()))
+            col.tofile(f)
+        size = f.tell()
+    os.replace(tmp, path)
+    return size
+
+
+class QuestionArchive:
+    """mmap 打开的归档；列按需切片，字符串按需解码
+
+        with QuestionArchive('题库.qarc') as archive:
+            archive.type_counts()
+            ids = archive.select(q_type='multiple', min_answers=3)
+            questions = [archive.question(i) for i in archive.sample(20)]
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mm)
+        magic, version, n_cols, self.exam_count, self.question_count, self.option_count, self.string_count = \
+            HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ArchiveError(f'不是题库归档文件：{path}')
+        if version != ARCHIVE_VERSION:
+            raise ArchiveError(f'不支持的归档版本：{version}')
+        self._cols = {}
+        for i in range(n_cols):
+            name, typecode, offset, count = COLUMN.unpack_from(self._mm, HEADER.size + i * COLUMN.size)
+            typecode = typecode.decode('ascii')
+            size = array(typecode).itemsize
+            col = self._view[offset:offset + count * size]
+            if sys.byteorder != 'little':
+                col = array(typecode, col.tobytes())
+                col.byteswap()
+            else:
+                col = col.cast(typecode)
+            self._cols[name.rstrip(b'\0').decode('ascii')] = col
+        # 列直接作为属性：archive.q_type、archive.q_ans ...
+        self.__dict__.update(self._cols)
+        self._blob = self._cols['s_blob']
+        self._offsets = self._cols['s_offset']
+        self._strings = {}
+
+    def close(self):
+        if self._mm is None:
+            return
+        self._strings.clear()
+        self._blob = self._offsets = None
+        for col in self._cols.values():
+            if isinstance(col, memoryview):
+                col.release()
+        for name in self._cols:
+            del self.__dict__[name]
+        self._cols.clear()
+        self._view.release()
+        self._mm.close()
+        self._file.close()
+        self._mm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.question_count
+
+    def string(self, i):
+        if i == NONE:
+            return None
+        text = self._strings.get(i)
+        if text is None:
+            text = str(self._blob[self._offsets[i]:self._offsets[i + 1]], 'utf-8')
+            self._strings[i] = text
+        return text
+
+    # ---- 不解码字符串的统计和筛选 ----
+
+    def type_counts(self):
+        data = self.q_type.tobytes()
+        counts = {name: data.count(code) for name, code in TYPE_CODES.items()}
+        other = len(data) - sum(counts.values())
+        if other:
+            counts['other'] = other
+        return {name: count for name, count in counts.items() if count}
+
+    def answer_count(self, i):
+        """正确答案包含的选项个数（掩码中 1 的个数，掩码表示不了的答案为 0）"""
+        return bin(self.q_ans[i]).count('1')
+
+    def select(self, q_type=None, exams=None, min_answers=None):
+        """按题型、所在试卷下标、正确答案个数筛选，返回题目下标列表"""
+        code = TYPE_CODES.get(q_type, OTHER_TYPE) if q_type is not None else None
+        if exams is None:
+            ranges = [(0, self.question_count)]
+        else:
+            qstart = self.e_qstart
+            ranges = [(qstart[e], qstart[e + 1]) for e in exams]
+        types = self.q_type
+        answers = self.q_ans
+        result = []
+        for start, end in ranges:
+            for i in range(start, end):
+                if code is not None and types[i] != code:
+                    continue
+                if min_answers is not None and bin(answers[i]).count('1') < min_answers:
+                    continue
+                result.append(i)
+        return result
+
+    def sample(self, k, population=None, rng=None):
+        rng = rng or random
+        population = range(self.question_count) if population is None else population
+        return rng.sample(population, min(k, len(population)))
+
+    # ---- 按需解码 ----
+
+    def _header(self, e):
+        return json.loads(self.string(self.e_header[e]))
+
+    def exam_header(self, e):
+        """试卷中除 questions 外的字段"""
+        header = self._header(e)
+        header.pop('questions', None)
+        return header
+
+    def exam_of(self, i):
+        """题目所在的试卷下标（二分查找）"""
+        qstart = self.e_qstart
+        lo, hi = 0, self.exam_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if qstart[mid + 1] <= i:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _answer(self, masks, texts, i, labels):
+        text = texts[i]
+        if text != NONE:
+            return self.string(text)
+        return mask_answer(masks[i], labels)
+
+    def question(self, i):
+        string = self.string
+        o_start, o_end = self.q_ostart[i], self.q_ostart[i + 1]
+        pairs = [(string(self.o_label[j]), string(self.o_html[j])) for j in range(o_start, o_end)]
+        labels = [label for label, _ in pairs]
+        code = self.q_type[i]
+        qid = self.q_id[i]
+        q_type = TYPE_NAMES.get(code)
+        answer = self._answer(self.q_ans, self.q_anstxt, i, labels)
+        user = self._answer(self.q_usr, self.q_usrtxt, i, labels)
+        extra = self.q_extra[i]
+        if extra != NONE:
+            extra = json.loads(string(extra))
+            q_type = extra.get('type', q_type)
+            qid = extra.get('id', qid)
+            answer = extra.get('correctAnswer', answer)
+            user = extra.get('userAnswer', user)
+        return Question(qid, q_type, string(self.q_stem[i]), option_set(pairs), answer, user,
+                        string(self.q_expl[i]), string(self.q_meta[i]))
+
+    def exam(self, e):
+        exam = self._header(e)
+        exam['questions'] = [self.question(i) for i in range(self.e_qstart[e], self.e_qstart[e + 1])]
+        return exam
+
+    def to_exam_group(self):
+        """整体解码：字符串一次全部解码、各列一次转成列表，比逐题调用 question() 快得多"""
+        blob = self._blob
+        offsets = self._offsets.tolist()
+        strings = [str(blob[offsets[i]:offsets[i + 1]], 'utf-8') for i in range(self.string_count)]
+
+        def column(name):
+            return [None if i == NONE else strings[i] for i in getattr(self, name).tolist()]
+
+        types, ids = self.q_type.tolist(), self.q_id.tolist()
+        stems, expls, metas, extras = column('q_stem'), column('q_expl'), column('q_meta'), column('q_extra')
+        ans, ans_txt = self.q_ans.tolist(), self.q_anstxt.tolist()
+        usr, usr_txt = self.q_usr.tolist(), self.q_usrtxt.tolist()
+        ostart = self.q_ostart.tolist()
+        labels_all, htmls_all = column('o_label'), column('o_html')
+
+        questions = []
+        for i in range(self.question_count):
+            labels = labels_all[ostart[i]:ostart[i + 1]]
+            options = option_set(zip(labels, htmls_all[ostart[i]:ostart[i + 1]]))
+            answer = strings[ans_txt[i]] if ans_txt[i] != NONE else mask_answer(ans[i], labels)
+            user = strings[usr_txt[i]] if usr_txt[i] != NONE else mask_answer(usr[i], labels)
+            qid, q_type = ids[i], TYPE_NAMES.get(types[i])
+            if extras[i] is not None:
+                extra = json.loads(extras[i])
+                q_type = extra.get('type', q_type)
+                qid = extra.get('id', qid)
+                answer = extra.get('correctAnswer', answer)
+                user = extra.get('userAnswer', user)
+            questions.append(Question(qid, q_type, stems[i], options, answer, user, expls[i], metas[i]))
+
+        exam_group = []
+        qstart = self.e_qstart.tolist()
+        for e, header in enumerate(self.e_header.tolist()):
+            exam = json.loads(strings[header])
+            exam['questions'] = questions[qstart[e]:qstart[e + 1]]
+            exam_group.append(exam)
+        return exam_group
+
+
+def read_archive(path):
+    """把整个归档读回试卷组（题目为 Question）"""
+    with QuestionArchive(path) as archive:
+        return archive.to_exam_group()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='列式二进制题库归档')
+    sub = parser.add_subparsers(dest='command', required=True)
+    export = sub.add_parser('export', help='试卷组 JSON -> 归档')
+    export.add_argument('input', help='试卷组 JSON 文件')
+    export.add_argument('-o', '--output', default=None, help='归档文件，默认为 <输入>.qarc')
+    imp = sub.add_parser('import', help='归档 -> 试卷组 JSON')
+    imp.add_argument('input', help='归档文件')
+    imp.add_argument('-o', '--output', required=True, help='试卷组 JSON 文件')
+    stats = sub.add_parser('stats', help='题型、答案个数统计（不解码题目）')
+    stats.add_argument('input', help='归档文件')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.command == 'export':
+        with open(args.input, 'r', encoding='utf-8') as f:
+            exam_group = load_exam_group(json.load(f))
+        output = args.output or os.path.splitext(args.input)[0] + '.qarc'
+        size = write_archive(exam_group, output)
+        print(f"归档：{output}，{size / 1024:.1f}KB（原文件 {os.path.getsize(args.input) / 1024:.1f}KB）")
+    elif args.command == 'import':
+        exam_group = read_archive(args.input)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(exam_group, f, ensure_ascii=False, indent=2, cls=QuestionEncoder)
+        print(f"输出文件：{args.output}，包含试卷数量：{len(exam_group)}")
+    else:
+        with QuestionArchive(args.input) as archive:
+            answers = Counter(archive.answer_count(i) for i in range(len(archive)))
+            print(f"试卷 {archive.exam_count} 份，题目 {archive.question_count} 道，"
+                  f"选项 {archive.option_count} 个，字符串 {archive.string_count} 个")
+            print(f"题型：{archive.type_counts()}")
+            print(f"正确答案个数：{dict(sorted(answers.items()))}")
+    print(f"耗时 {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
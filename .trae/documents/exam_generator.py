@@ -0,0 +1,237 @@
+import argparse
+import json
+import random
+import re
+import time
+from collections import Counter, defaultdict
+
+from exam_output import write_exam_group
+from parse_engine import make_exam, stable_exam_id
+from question_model import JUDGE_OPTION_SET, Question, load_exam_group
+
+# 随机组卷：按 题型 / 难度 / 来源题库 分层抽题
+# 题目的 meta 里已经写了题型、分值和难度，例如
+#   “1、判断题（1分）  分值：1分  难度：适中”、“1. 单选题（1.0分）难度：中”
+# 先把整个题库按 (题型, 难度, 来源试卷) 分层，每层一个题目下标数组（只做一次）；
+# 组卷规格中的每一项（如 “单选题:中=10”）对应若干层，合并成一个候选数组并打乱。
+# 每份试卷从候选数组上的游标处依次取题，取完一轮再重新打乱，所以：
+#   - 同一份试卷内不会重复（多个规格项候选重叠时也会跳过已选的题）
+#   - 各份试卷之间尽量少重叠：一轮取完之前每道题只会被用一次
+# 生成几千份试卷只是在数组上移动游标；select_exams 只返回题目下标，generate_exams 再复制题目、重排题号。
+#   python exam_generator.py 题库.json -n 200 --spec 判断题=10 --spec 单选题:中=15 --spec 单选题:难=5
+#   python exam_generator.py 题库.qarc --strata          只列出各层的题数
+
+TYPE_RE = re.compile(r'(判断题|单选题|多选题|简答题|填空题|计算题)')
+SCORE_RE = re.compile(r'[（(]\s*(\d+(?:\.\d+)?)\s*分\s*[）)]')
+DIFFICULTY_RE = re.compile(r'难度[：:]\s*(\S+)')
+# 不同来源对难度的写法不一
+DIFFICULTY_NAMES = {'易': '易', '容易': '易', '简单': '易', '适中': '中', '中': '中', '中等': '中',
+                    '一般': '中', '难': '难', '困难': '难', '较难': '难'}
+TYPE_NAMES = {'single': '单选题', 'multiple': '多选题', 'text': '简答题'}
+# 判断题的 type 也是 single，靠 正确(True)/错误(False) 这组选项认出来
+JUDGE_LABELS = [o.label for o in JUDGE_OPTION_SET]
+UNKNOWN = '未知'
+WILDCARD = '*'
+
+
+def _is_judge(question):
+    options = question.get('options') or ()
+    return options is JUDGE_OPTION_SET or [o['label'] for o in options] == JUDGE_LABELS
+
+
+def question_stratum(question):
+    """从 meta 中取出 (题型, 难度, 分值)；meta 缺失时题型按选项和 type 推断"""
+    meta = question.get('meta') or ''
+    m = TYPE_RE.search(meta)
+    if m:
+        q_type = m.group(1)
+    elif _is_judge(question):
+        q_type = '判断题'
+    else:
+        q_type = TYPE_NAMES.get(question['type'], UNKNOWN)
+    m = DIFFICULTY_RE.search(meta)
+    difficulty = DIFFICULTY_NAMES.get(m.group(1), m.group(1)) if m else UNKNOWN
+    m = SCORE_RE.search(meta)
+    score = float(m.group(1)) if m else None
+    return q_type, difficulty, score
+
+
+class StratifiedCorpus:
+    """按 (题型, 难度, 来源) 分层的题库；各层保存题目在 questions 中的下标"""
+
+    def __init__(self, exam_group):
+        self.questions = []
+        self.strata = defaultdict(list)
+        for exam in exam_group:
+            bank = exam.get('title', '')
+            for question in exam['questions']:
+                q_type, difficulty, _ = question_stratum(question)
+                self.strata[(q_type, difficulty, bank)].append(len(self.questions))
+                self.questions.append(question)
+
+    def __len__(self):
+        return len(self.questions)
+
+    def matching(self, q_type=WILDCARD, difficulty=WILDCARD, bank=WILDCARD):
+        """符合条件的所有题目编号；bank 按试卷标题前缀匹配"""
+        result = []
+        for (t, d, b), items in self.strata.items():
+            if q_type not in (WILDCARD, t) or difficulty not in (WILDCARD, d):
+                continue
+            if bank != WILDCARD and not b.startswith(bank):
+                continue
+            result.extend(items)
+        return result
+
+    def summary(self):
+        return sorted(((key, len(items)) for key, items in self.strata.items()), key=lambda x: x[0])
+
+
+def parse_spec(text):
+    """“题型[:难度[:来源]]=题数” -> ((题型, 难度, 来源), 题数)，省略的部分不限"""
+    key, _, count = text.rpartition('=')
+    if not key or not count.isdigit():
+        raise ValueError(f'组卷规格应为 题型[:难度[:来源]]=题数：{text}')
+    parts = (key.split(':') + [WILDCARD, WILDCARD])[:3]
+    return tuple(p or WILDCARD for p in parts), int(count)
+
+
+class _Pool:
+    """一个规格项的候选题：打乱后按游标轮流取，一轮取完再重新打乱"""
+
+    def __init__(self, items, rng):
+        self.items = list(items)
+        self.rng = rng
+        self.pos = len(self.items)
+        self.rounds = 0
+
+    def draw(self, k, taken):
+        # 常见情况：本轮剩下的题足够，且与本卷已选的题不重叠，直接切片
+        end = self.pos + k
+        if end <= len(self.items):
+            picked = self.items[self.pos:end]
+            if taken.isdisjoint(picked):
+                taken.update(picked)
+                self.pos = end
+                return picked
+        picked = []
+        scanned = 0
+        while len(picked) < k and scanned < 2 * len(self.items):
+            if self.pos >= len(self.items):
+                self.rng.shuffle(self.items)
+                self.pos = 0
+                self.rounds += 1
+            item = self.items[self.pos]
+            self.pos += 1
+            scanned += 1
+            if item not in taken:
+                taken.add(item)
+                picked.append(item)
+        return picked
+
+
+def renumber(question, new_id):
+    """题目的副本，id 改为在新试卷中的序号（选项组仍然共享）"""
+    if isinstance(question, Question):
+        return Question(new_id, question.type, question.content, question.options, question.correct_answer,
+                        question.user_answer, question.explanation, question.meta)
+    return dict(question, id=new_id)
+
+
+def select_exams(corpus, specs, count, seed=None):
+    """按规格 [((题型, 难度, 来源), 题数), ...] 为 count 份试卷选题，只返回题目下标
+
+    返回 (每份试卷的下标列表, 统计)。某一项候选题不够时该项取到多少算多少，并记在统计的 shortfall 中。
+    """
+    rng = random.Random(seed)
+    pools = [(key, k, _Pool(corpus.matching(*key), rng)) for key, k in specs]
+    selections = []
+    usage = Counter()
+    shortfall = Counter()
+    for _ in range(count):
+        taken = set()
+        picked = []
+        for key, k, pool in pools:
+            items = pool.draw(k, taken)
+            if len(items) < k:
+                shortfall[':'.join(key)] += k - len(items)
+            picked.extend(items)
+        usage.update(picked)
+        selections.append(picked)
+
+    stats = {
+        'exams': count,
+        'questions': sum(len(picked) for picked in selections),
+        'distinct': len(usage),
+        'maxUse': max(usage.values(), default=0),
+        'rounds': {':'.join(key): pool.rounds for key, _, pool in pools},
+        'shortfall': dict(shortfall),
+    }
+    return selections, stats
+
+
+def generate_exams(corpus, specs, count, title='随机试卷', seed=None, is_submitted=False):
+    """生成 count 份试卷，返回 (试卷列表, 统计)
+
+    给定 seed 时结果可复现，试卷 id 也由 seed 和标题固定下来（parse_engine.stable_exam_id）。
+    """
+    selections, stats = select_exams(corpus, specs, count, seed)
+    questions = corpus.questions
+    source = f'generated:{seed}' if seed is not None else None
+    exams = []
+    for n, picked in enumerate(selections):
+        exam_title = f'{title}（第{n + 1}套）'
+        exam_id = stable_exam_id(source, exam_title) if source else None
+        exams.append(make_exam(exam_title, [renumber(questions[item], i) for i, item in enumerate(picked)],
+                               offset=n, is_submitted=is_submitted, exam_id=exam_id))
+    return exams, stats
+
+
+def load_corpus(path):
+    """读取题库：试卷组 JSON 或 .qarc 归档"""
+    if path.endswith('.qarc'):
+        from exam_archive import read_archive
+        return read_archive(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        return load_exam_group(json.load(f))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='按题型/难度/来源分层随机组卷')
+    parser.add_argument('corpus', help='题库：试卷组 JSON 或 .qarc 归档')
+    parser.add_argument('-n', '--count', type=int, default=1, help='生成的试卷份数')
+    parser.add_argument('--spec', action='append', default=[], metavar='题型[:难度[:来源]]=题数',
+                        help='组卷规格，可重复；如 单选题:中=10、判断题=5、多选题::密码学=3')
+    parser.add_argument('--title', default='随机试卷', help='试卷标题')
+    parser.add_argument('--seed', type=int, default=None, help='随机种子（固定后结果和试卷 id 可复现）')
+    parser.add_argument('--strata', action='store_true', help='只列出各层的题数')
+    parser.add_argument('-o', '--output', default='generated_exams.json', help='输出的试卷组文件')
+    parser.add_argument('--compact', action='store_true', help='输出紧凑 JSON')
+    args = parser.parse_args()
+    # 规格写错时在读题库之前就报出来
+    try:
+        specs = [parse_spec(s) for s in args.spec]
+    except ValueError as e:
+        parser.error(str(e))
+
+    start = time.perf_counter()
+    corpus = StratifiedCorpus(load_corpus(args.corpus))
+    print(f"题库：{len(corpus)} 道题，{len(corpus.strata)} 层，分层耗时 {time.perf_counter() - start:.3f}s")
+    if args.strata or not args.spec:
+        for (q_type, difficulty, bank), size in corpus.summary():
+            print(f"  {q_type}:{difficulty}:{bank}  {size}")
+        return
+
+    start = time.perf_counter()
+    exams, stats = generate_exams(corpus, specs, args.count, args.title, args.seed)
+    elapsed = time.perf_counter() - start
+    write_exam_group(exams, args.output, args.compact)
+    print(f"生成 {stats['exams']} 份试卷，共 {stats['questions']} 道题（不同的题 {stats['distinct']} 道，"
+          f"单题最多出现 {stats['maxUse']} 次），耗时 {elapsed:.3f}s")
+    for key, missing in stats['shortfall'].items():
+        print(f"  ✗ {key}：候选题不足，共少 {missing} 道")
+    print(f"输出文件：{args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+import argparse
+import hashlib
+import json
+import os
+
+from explanation_store import NO_EXPLANATION, question_key
+from exam_output import write_exam_group
+from parse_engine import stable_exam_id
+from question_model import Question, load_exam_group
+
+# 试卷组合并（upsert）
+# 原来的 create_exam_group.py 等脚本直接拼 [判断题试卷, 单选题试卷]，每次运行都用当前时间戳做 id，
+# 把新结果并进已有试卷组时同一份试卷会出现两次。这里：
+#   - 试卷 id 由 “源文件名 + 大题标题” 的哈希得到（parse_engine.stable_exam_id），重新导入同一个大题得到同一个 id；
+#     批量导入时源文件名是相对输入目录的路径，不同目录下的同名题库不会撞 id
+#   - 同一批新试卷里 id 重复时直接报错，不会把两份不同的试卷合并成一份
+#   - 已有试卷组按 id 建哈希索引，新试卷 id 已存在就更新，不存在就追加到末尾；
+#     没出现在新批次里的试卷原样保留
+#   - 合并后内容与原来完全相同的试卷保留原对象（分片输出、索引都不会重写它）
+#   - 用户数据不丢：isSubmitted、timestamp 沿用原试卷，userAnswer 按题目内容哈希
+#     （与 explanation_store 相同）找回，题目换了位置也能对上；选项换了顺序时按选项内容换算答案字母；
+#     新结果没有解析时保留原解析
+# 整个过程对两个试卷组各扫一遍，输出顺序 = 原顺序 + 新增试卷按输入顺序，便于 diff。
+#   python exam_merge.py 数据库原理试卷组_final.json 新导入.json
+#   python exam_merge.py 试卷组.json 数据库原理判断题.json --source-ids --match-titles   并入老格式文件
+
+
+def _question_fields(q):
+    return (q.get('id'), q.get('type'), q.get('content'),
+            tuple((opt['label'], opt['html']) for opt in q.get('options') or ()),
+            q.get('correctAnswer'), q.get('explanation'), q.get('meta'))
+
+
+def content_hash(exam):
+    """试卷内容的哈希，不含 id、timestamp、isSubmitted 和题目的 userAnswer
+
+    Question 对象和字典得到相同的结果；用元组的 repr 而不是 JSON 序列化，合并大试卷组时快得多。
+    """
+    data = repr((exam['title'], [_question_fields(q) for q in exam['questions']]))
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def _remap_answer(answer, old_options, new_options):
+    """把旧题目上的用户答案（选项标签，多选用逗号连接）按选项内容换算成新题目的标签
+
+    内容哈希不看选项顺序，重新导入时选项可能换了位置；有标签在新题目里找不到对应选项时返回 None，不带过去。
+    """
+    old_options = old_options or ()
+    new_options = new_options or ()
+    if not old_options and not new_options:
+        return answer  # 简答题：答案是文本
+    old_html = {opt['label']: opt['html'] for opt in old_options}
+    if [(o['label'], o['html']) for o in old_options] == [(o['label'], o['html']) for o in new_options]:
+        return answer
+    new_label = {opt['html']: opt['label'] for opt in new_options}
+    order = [opt['label'] for opt in new_options]
+    labels = set()
+    for label in answer.split(','):
+        html = old_html.get(label)
+        if html is None or html not in new_label:
+            return None
+        labels.add(new_label[html])
+    return ','.join(label for label in order if label in labels)
+
+
+def _carry_over(question, old):
+    """把旧题目上的用户答案和已有解析带到新题目上"""
+    changes = {}
+    if old['userAnswer'] and not question['userAnswer']:
+        answer = _remap_answer(old['userAnswer'], old['options'], question['options'])
+        if answer:
+            changes['userAnswer'] = answer
+    explanation = question['explanation']
+    if (not explanation or explanation == NO_EXPLANATION) and old['explanation'] \
+            and old['explanation'] != NO_EXPLANATION:
+        changes['explanation'] = old['explanation']
+    if not changes:
+        return question
+    if isinstance(question, Question):
+        return question.replace(**{'user_answer' if k == 'userAnswer' else k: v for k, v in changes.items()})
+    return dict(question, **changes)
+
+
+def merge_exam(old, new):
+    """用新试卷的内容更新旧试卷，保留旧试卷的 id、timestamp、isSubmitted 和用户答案"""
+    previous = {}
+    for q in old['questions']:
+        previous.setdefault(question_key(q), q)
+    merged = dict(new)
+    merged['id'] = old['id']
+    merged['timestamp'] = old.get('timestamp', new.get('timestamp'))
+    if 'isSubmitted' in old:
+        merged['isSubmitted'] = old['isSubmitted']
+    questions = []
+    for q in new['questions']:
+        match = previous.get(question_key(q))
+        questions.append(_carry_over(q, match) if match is not None else q)
+    merged['questions'] = questions
+    return merged
+
+
+def upsert_exams(exam_group, new_exams, match_titles=False):
+    """把 new_exams 并入 exam_group，返回 (新试卷组, 统计)
+
+    match_titles=True 时 id 对不上的试卷再按标题匹配（用于并入老的时间戳 id 试卷组）。
+    统计：added 新增、updated 内容有变化、unchanged 内容相同（保留原对象）、kept 不在本批次中的原试卷。
+    new_exams 内部有重复 id 时抛 ValueError（不同试卷被合并成一份会丢题），不做任何合并。
+    """
+    seen = set()
+    duplicates = []
+    for exam in new_exams:
+        if exam['id'] in seen:
+            duplicates.append(f"{exam['id']}（{exam['title']}）")
+        seen.add(exam['id'])
+    if duplicates:
+        raise ValueError(f"待并入的试卷中有 {len(duplicates)} 份 id 重复：{', '.join(duplicates[:5])}"
+                         + ('…' if len(duplicates) > 5 else ''))
+    merged = list(exam_group)
+    index = {exam['id']: i for i, exam in enumerate(merged)}
+    titles = {}
+    if match_titles:
+        for i, exam in enumerate(merged):
+            titles.setdefault(exam['title'], i)
+    stats = {'added': 0, 'updated': 0, 'unchanged': 0, 'kept': 0}
+    touched = set()
+    for exam in new_exams:
+        i = index.get(exam['id'])
+        if i is None and match_titles:
+            i = titles.get(exam['title'])
+            if i is not None and merged[i]['id'] in touched:
+                i = None
+        if i is None:
+            index[exam['id']] = len(merged)
+            merged.append(exam)
+            touched.add(exam['id'])
+            stats['added'] += 1
+            continue
+        old = merged[i]
+        touched.add(old['id'])
+        old_hash = content_hash(old)
+        # 常见情况是重新导入的试卷与原来一模一样，先比哈希，不必逐题合并
+        if content_hash(exam) == old_hash or content_hash(candidate := merge_exam(old, exam)) == old_hash:
+            stats['unchanged'] += 1
+        else:
+            merged[i] = candidate
+            stats['updated'] += 1
+    stats['kept'] = sum(1 for exam in exam_group if exam['id'] not in touched)
+    return merged, stats
+
+
+def format_stats(stats):
+    return (f"新增 {stats['added']} 份，更新 {stats['updated']} 份，"
+            f"未变 {stats['unchanged']} 份，保留 {stats['kept']} 份")
+
+
+def read_exam_group(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return load_exam_group(data if isinstance(data, list) else [data])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='把新试卷并入已有试卷组（按试卷 id 更新或追加）')
+    parser.add_argument('base', help='已有的试卷组 JSON（不存在时视为空试卷组）')
+    parser.add_argument('updates', nargs='+', help='要并入的试卷组或单份试卷 JSON')
+    parser.add_argument('-o', '--output', default=None, help='输出文件，默认覆盖 base')
+    parser.add_argument('--source-ids', action='store_true',
+                        help='按 “文件名 + 试卷标题” 重新分配固定 id（用于合并老的时间戳 id 文件）')
+    parser.add_argument('--match-titles', action='store_true', help='id 对不上时按试卷标题匹配已有试卷')
+    parser.add_argument('--compact', action='store_true', help='输出紧凑 JSON')
+    args = parser.parse_args()
+
+    exam_group = read_exam_group(args.base) if os.path.exists(args.base) else []
+    for path in args.updates:
+        new_exams = read_exam_group(path)
+        if args.source_ids:
+            source = os.path.basename(path)
+            for exam in new_exams:
+                exam['id'] = stable_exam_id(source, exam['title'])
+        try:
+            exam_group, stats = upsert_exams(exam_group, new_exams, args.match_titles)
+        except ValueError as e:
+            print(f"错误：{path}：{e}")
+            exit(1)
+        print(f"{path}：{format_stats(stats)}")
+
+    output = args.output or args.base
+    write_exam_group(exam_group, output, args.compact)
+    print(f"输出文件：{output}，包含试卷数量：{len(exam_group)}")
+
+
+if __name__ == '__main__':
+    main()
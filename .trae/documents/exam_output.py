@@ -0,0 +1,175 @@
+import argparse
+import gzip
+import json
+import re
+import time
+
+from question_model import Question, QuestionEncoder
+
+try:
+    import brotli
+except ImportError:  # brotli 是可选依赖，没有安装时只能生成 .gz
+    brotli = None
+
+# 试卷组输出
+# 默认仍然输出 indent=2 的可读 JSON；紧凑模式用于给页面加载的大题库：
+#   - 去掉缩进和分隔符后的空格
+#   - 去掉 content / meta / 选项 html 中 “\n          ” 这类排版空白
+#     （页面按普通 HTML 渲染，连续空白本来就会被折叠成一个空格，显示效果不变）
+#   - 可选再生成 .gz / .br 预压缩文件，供静态服务器直接返回
+# 页面把试卷组 JSON.stringify 后存进 localStorage（quiz_tool_groups_v1），
+# 缩进不会进 localStorage，但字符串里的排版空白会，所以紧凑模式也能直接节省配额。
+#   python exam_output.py 题目格式.json -o 题目格式.min.json --compress gzip
+
+COMPRESSORS = ('gzip', 'brotli')
+# 大多数浏览器 localStorage 每个域约 5M 个字符
+LOCAL_STORAGE_QUOTA = 5 * 1024 * 1024
+
+# 换行及其前后的空白
+LAYOUT_WS_RE = re.compile(r'\s*\n\s*')
+# 这些标签内的空白有意义，不能折叠
+PRESERVE_WS_RE = re.compile(r'<(pre|textarea)\b', re.IGNORECASE)
+
+
+def compact_text(text):
+    """去掉首尾空白，把换行缩进折叠成一个空格"""
+    if not text:
+        return text
+    if PRESERVE_WS_RE.search(text):
+        return text.strip()
+    return LAYOUT_WS_RE.sub(' ', text).strip()
+
+
+def compact_question(question):
+    """返回去掉排版空白的题目字典（Question 或 dict 均可）"""
+    data = question.to_dict() if isinstance(question, Question) else dict(question)
+    data['content'] = compact_text(data.get('content'))
+    if data.get('meta'):
+        data['meta'] = compact_text(data['meta'])
+    data['options'] = [dict(opt, html=compact_text(opt['html'])) for opt in data.get('options', [])]
+    return data
+
+
+def compact_exam(exam):
+    return dict(exam, questions=[compact_question(q) for q in exam['questions']])
+
+
+def compact_exam_group(exam_group):
+    return [compact_exam(exam) for exam in exam_group]
+
+
+def dumps_json(data, compact=False):
+    """紧凑模式不带空白分隔符，否则为 indent=2；data 中的 Question 由 QuestionEncoder 转换"""
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':'), cls=QuestionEncoder)
+    return json.dumps(data, ensure_ascii=False, indent=2, cls=QuestionEncoder)
+
+
+def dumps_exam_group(exam_group, compact=False):
+    return dumps_json(compact_exam_group(exam_group) if compact else exam_group, compact)
+
+
+def dumps_exam(exam, compact=False):
+    return dumps_json(compact_exam(exam) if compact else exam, compact)
+
+
+def compress_bytes(data, method):
+    if method == 'gzip':
+        # mtime=0 让相同内容生成相同的 .gz，便于缓存和比对
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if method == 'brotli':
+        if brotli is None:
+            raise RuntimeError('未安装 brotli，无法生成 .br 文件（pip install brotli）')
+        return brotli.compress(data, quality=11)
+    raise ValueError(f'未知的压缩方式：{method}')
+
+
+def compressed_path(path, method):
+    return path + ('.gz' if method == 'gzip' else '.br')
+
+
+def write_exam_group(exam_group, path, compact=False, compress=()):
+    """写出试卷组，compress 中的每种方式额外生成一个预压缩文件；返回 {文件路径: 字节数}"""
+    data = dumps_exam_group(exam_group, compact).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(data)
+    sizes = {path: len(data)}
+    for method in compress:
+        target = compressed_path(path, method)
+        packed = compress_bytes(data, method)
+        with open(target, 'wb') as f:
+            f.write(packed)
+        sizes[target] = len(packed)
+    return sizes
+
+
+def best_parse_time(text, repeat=5):
+    """json.loads 的最好耗时，作为页面 JSON.parse 耗时的近似"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        json.loads(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def size_report(exam_group, repeat=5):
+    """对比可读格式和紧凑格式的体积、压缩后体积、解析耗时和 localStorage 占用"""
+    rows = []
+    for name, compact in (('indent=2', False), ('紧凑', True)):
+        text = dumps_exam_group(exam_group, compact)
+        data = text.encode('utf-8')
+        # 页面存入 localStorage 的是 JSON.stringify 的结果（无缩进）
+        stored = len(json.dumps(json.loads(text), ensure_ascii=False, separators=(',', ':')))
+        row = {
+            'name': name,
+            'bytes': len(data),
+            'gzip': len(compress_bytes(data, 'gzip')),
+            'brotli': len(compress_bytes(data, 'brotli')) if brotli is not None else None,
+            'parse': best_parse_time(text, repeat),
+            'storage_chars': stored,
+        }
+        rows.append(row)
+    return rows
+
+
+def print_size_report(rows):
+    base = rows[0]
+    print(f"\n=== 输出体积对比 ===")
+    print(f"{'格式':<10}{'原始':>12}{'gzip':>12}{'brotli':>12}{'解析':>10}{'localStorage':>16}")
+    for row in rows:
+        br = f"{row['brotli'] / 1024:10.1f}KB" if row['brotli'] is not None else f"{'-':>12}"
+        print(f"{row['name']:<10}{row['bytes'] / 1024:10.1f}KB{row['gzip'] / 1024:10.1f}KB{br}"
+              f"{row['parse'] * 1000:8.2f}ms{row['storage_chars']:>12}字符")
+    for row in rows[1:]:
+        print(f"{row['name']}：体积 -{1 - row['bytes'] / base['bytes']:.1%}，"
+              f"解析 -{1 - row['parse'] / base['parse']:.1%}，"
+              f"localStorage -{1 - row['storage_chars'] / base['storage_chars']:.1%}"
+              f"（约占配额 {row['storage_chars'] / LOCAL_STORAGE_QUOTA:.1%}）")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='把试卷组 JSON 转成紧凑格式并生成预压缩文件')
+    parser.add_argument('input', help='试卷组 JSON 文件')
+    parser.add_argument('-o', '--output', default=None, help='输出文件，默认为 <输入>.min.json')
+    parser.add_argument('--compress', choices=COMPRESSORS, nargs='*', default=[], help='额外生成的预压缩文件')
+    parser.add_argument('--report', action='store_true', help='只打印体积和解析耗时对比，不写文件')
+    args = parser.parse_args()
+    if 'brotli' in args.compress and brotli is None:
+        print("错误：未安装 brotli，无法生成 .br 文件（pip install brotli）")
+        exit(1)
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        exam_group = json.load(f)
+
+    if args.report:
+        print_size_report(size_report(exam_group))
+        return
+
+    output = args.output or re.sub(r'(\.json)?$', '.min.json', args.input, count=1)
+    for path, size in write_exam_group(exam_group, output, compact=True, compress=args.compress).items():
+        print(f"已写入：{path}（{size / 1024:.1f}KB）")
+
+
+if __name__ == '__main__':
+    main()
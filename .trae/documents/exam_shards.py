@@ -0,0 +1,168 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+from collections import Counter
+
+from exam_output import dumps_exam
+from question_model import load_exam_group
+
+# 分片输出：每份试卷一个文件，外加一个很小的 manifest.json
+#   out/
+#     manifest.json            试卷列表：id、标题、时间戳、题数、各题型数量、文件大小、内容哈希
+#     exam_1718000000000.json  单份试卷，格式与试卷组数组中的元素相同
+# 页面（或其他使用方）先读 manifest 立即列出所有试卷，做哪份再取哪份，
+# 不必一开始就下载并解析全部试卷的全部题目。
+#   python exam_shards.py 数据库原理试卷组_final.json -d shards/
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+SHARD_PATTERN = 'exam_*.json'
+
+
+def shard_name(exam):
+    return f"exam_{exam['id']}.json"
+
+
+def manifest_entry(exam, name, data):
+    """data 为分片文件的字节内容"""
+    return {
+        "id": exam['id'],
+        "title": exam['title'],
+        "timestamp": exam['timestamp'],
+        "isSubmitted": exam.get('isSubmitted', False),
+        "file": name,
+        "questionCount": len(exam['questions']),
+        "typeCounts": dict(Counter(q['type'] for q in exam['questions'])),
+        "bytes": len(data),
+        "sha256": hashlib.sha256(data).hexdigest()
+    }
+
+
+def read_manifest(out_dir):
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_atomic(path, data):
+    """先写临时文件再替换，读取方不会看到写了一半的文件"""
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def write_shards(exam_group, out_dir, compact=False):
+    """写出分片和 manifest，返回 (manifest, 实际重写的分片数)
+
+    内容哈希没变的分片不重写；上次有、这次没有的分片会被删除。manifest 最后写，
+    所以读取方要么看到旧的完整版本，要么看到新的完整版本。
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    old = read_manifest(out_dir)
+    old_hashes = {e['file']: e['sha256'] for e in old['exams']} if old else {}
+
+    entries = []
+    written = 0
+    for exam in exam_group:
+        name = shard_name(exam)
+        data = dumps_exam(exam, compact).encode('utf-8')
+        entry = manifest_entry(exam, name, data)
+        path = os.path.join(out_dir, name)
+        if old_hashes.get(name) != entry['sha256'] or not os.path.exists(path):
+            write_atomic(path, data)
+            written += 1
+        entries.append(entry)
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "examCount": len(entries),
+        "questionCount": sum(e['questionCount'] for e in entries),
+        "exams": entries
+    }
+    write_atomic(os.path.join(out_dir, MANIFEST_NAME),
+                 json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8'))
+
+    keep = {e['file'] for e in entries}
+    for path in glob.glob(os.path.join(out_dir, SHARD_PATTERN)):
+        if os.path.basename(path) not in keep:
+            os.remove(path)
+    return manifest, written
+
+
+class ShardedExamGroup:
+    """按需加载的试卷组
+
+    打开时只读 manifest；按下标或 id 取试卷时才读取对应分片，读过的分片会缓存。
+        group = ShardedExamGroup('shards')
+        for entry in group.entries: print(entry['title'], entry['questionCount'])
+        exam = group.get(exam_id)
+    """
+
+    def __init__(self, out_dir, verify=False):
+        self.out_dir = out_dir
+        self.verify = verify
+        manifest = read_manifest(out_dir)
+        if manifest is None:
+            raise FileNotFoundError(f'没有找到 {os.path.join(out_dir, MANIFEST_NAME)}')
+        if manifest.get('version') != MANIFEST_VERSION:
+            raise ValueError(f"不支持的 manifest 版本：{manifest.get('version')}")
+        self.manifest = manifest
+        self.entries = manifest['exams']
+        self._index = {e['id']: i for i, e in enumerate(self.entries)}
+        self._loaded = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getitem__(self, i):
+        entry = self.entries[i]
+        exam = self._loaded.get(entry['id'])
+        if exam is None:
+            exam = self._load(entry)
+            self._loaded[entry['id']] = exam
+        return exam
+
+    def __iter__(self):
+        for i in range(len(self.entries)):
+            yield self[i]
+
+    def get(self, exam_id, default=None):
+        i = self._index.get(exam_id)
+        return default if i is None else self[i]
+
+    def loaded_count(self):
+        return len(self._loaded)
+
+    def _load(self, entry):
+        with open(os.path.join(self.out_dir, entry['file']), 'rb') as f:
+            data = f.read()
+        if self.verify and hashlib.sha256(data).hexdigest() != entry['sha256']:
+            raise ValueError(f"分片内容与 manifest 中的哈希不一致：{entry['file']}")
+        return load_exam_group([json.loads(data)])[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='把试卷组拆成每份试卷一个文件，并生成 manifest.json')
+    parser.add_argument('input', help='试卷组 JSON 文件')
+    parser.add_argument('-d', '--out-dir', default=None, help='输出目录，默认为 <输入>_shards')
+    parser.add_argument('--compact', action='store_true', help='分片使用紧凑 JSON')
+    args = parser.parse_args()
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        exam_group = json.load(f)
+
+    out_dir = args.out_dir or os.path.splitext(args.input)[0] + '_shards'
+    manifest, written = write_shards(exam_group, out_dir, args.compact)
+    total = sum(e['bytes'] for e in manifest['exams'])
+    print(f"输出目录：{out_dir}")
+    print(f"试卷 {manifest['examCount']} 份，题目 {manifest['questionCount']} 道，"
+          f"分片共 {total / 1024:.1f}KB，本次写入 {written} 个分片")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,331 @@
+import argparse
+import json
+import os
+import re
+import time
+
+from exam_output import compact_question
+from question_model import Question, QuestionEncoder
+
+# 流式读写试卷组 JSON
+# json.load 要把整个试卷组连同所有题目一次读进内存，峰值内存是文件大小的好几倍。
+# 这里按块读取文本，只在 “试卷” 和 “题目” 两层手动扫描数组/对象的边界，
+# 每道题本身仍交给 json 的 C 解码器（raw_decode）解析，所以同一时刻内存里只有一道题：
+#   for header, questions in iter_exams('试卷组.json'):
+#       for q in questions: ...
+#       # 读完 questions 后，header 中也有了写在 questions 之后的字段（如 isSubmitted）
+# ExamGroupWriter 按同样的粒度写出，输出与 json.dump(indent=2) / 紧凑格式逐字节相同，
+# 于是 “填写解析”、“校验” 这类逐题处理可以在常数内存里跑完多 GB 的题库：
+#   python exam_stream.py stats 试卷组.json
+#   python exam_stream.py explain 试卷组.json -o 试卷组_with_explanations.json
+
+CHUNK_SIZE = 1 << 16
+WS_RE = re.compile(r'[ \t\n\r]*')
+
+
+class StreamError(ValueError):
+    pass
+
+
+class _Scanner:
+    """在按块读入的文本上移动的游标"""
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self.offset = 0  # buf[0] 在整个文件中的字符偏移
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        if self.pos:
+            self.offset += self.pos
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        self.buf += chunk
+        return True
+
+    def error(self, message):
+        return StreamError(f'{message}（字符偏移 {self.offset + self.pos}）')
+
+    def peek(self):
+        """跳过空白，返回下一个字符；文件结束时返回 ''"""
+        while True:
+            self.pos = WS_RE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise self.error(f'应为 {char!r}')
+        self.pos += 1
+
+    def value(self):
+        """解码下一个 JSON 值
+
+        值恰好停在缓冲区末尾时（数字可能被截断）先补读再解码一次。
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise self.error('JSON 不完整或格式错误') from None
+            if end == len(self.buf) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def separator(self, close):
+        """读取元素之间的 ','，遇到 close 时返回 False"""
+        char = self.peek()
+        if char == ',':
+            self.pos += 1
+            return True
+        if char == close:
+            self.pos += 1
+            return False
+        raise self.error(f"应为 ',' 或 {close!r}")
+
+
+def _fields(scanner, header, stop_at_questions):
+    """读取对象中剩余的 键: 值，存进 header；遇到 questions 时停在它的值之前并返回 True"""
+    while True:
+        key = scanner.value()
+        if not isinstance(key, str):
+            raise scanner.error('对象的键不是字符串')
+        scanner.expect(':')
+        if key == 'questions' and stop_at_questions:
+            return True
+        header[key] = scanner.value()
+        if not scanner.separator('}'):
+            return False
+
+
+def _iter_questions(scanner, header, model):
+    """逐题产出；题目读完后接着把试卷剩下的字段读进 header"""
+    scanner.expect('[')
+    if scanner.peek() == ']':
+        scanner.pos += 1
+    else:
+        while True:
+            data = scanner.value()
+            yield Question.from_dict(data) if model else data
+            if not scanner.separator(']'):
+                break
+    if scanner.separator('}'):
+        _fields(scanner, header, False)
+
+
+def _iter_exam(scanner, model):
+    """读取一份试卷，产出一次 (header, 题目迭代器)"""
+    scanner.expect('{')
+    header = {}
+    if scanner.peek() == '}':
+        scanner.pos += 1
+    elif _fields(scanner, header, True):
+        questions = _iter_questions(scanner, header, model)
+        yield header, questions
+        # 使用方没读完的题目在这里跳过
+        for _ in questions:
+            pass
+        return
+    yield header, iter(())
+
+
+def iter_exams(path_or_file, model=False, chunk_size=CHUNK_SIZE):
+    """逐份产出 (header, questions)
+
+    header 是试卷中除 questions 外的字段；questions 是题目迭代器，必须在取下一份试卷前读完
+    （没读完的会被跳过），读完之后 header 中才有写在 questions 之后的字段。
+    model=True 时题目为 Question 对象，否则为字典。文件也可以是单份试卷（对象）。
+    """
+    if isinstance(path_or_file, (str, os.PathLike)):
+        with open(path_or_file, 'r', encoding='utf-8') as f:
+            yield from iter_exams(f, model, chunk_size)
+        return
+
+    scanner = _Scanner(path_or_file, chunk_size)
+    first = scanner.peek()
+    if first == '{':
+        yield from _iter_exam(scanner, model)
+    elif first == '[':
+        scanner.pos += 1
+        if scanner.peek() == ']':
+            scanner.pos += 1
+        else:
+            while True:
+                yield from _iter_exam(scanner, model)
+                if not scanner.separator(']'):
+                    break
+    else:
+        raise scanner.error('试卷组应为数组或对象')
+    if scanner.peek() != '':
+        raise scanner.error('JSON 结束后还有多余内容')
+
+
+def iter_questions(path_or_file, model=False):
+    """逐题产出 (header, question)"""
+    for header, questions in iter_exams(path_or_file, model):
+        for question in questions:
+            yield header, question
+
+
+class ExamGroupWriter:
+    """流式写出试卷组，输出与 exam_output.dumps_exam_group 相同
+
+        with ExamGroupWriter('out.json') as writer:
+            for header, questions in iter_exams('in.json'):
+                writer.write_exam(header, (fix(q) for q in questions))
+    """
+
+    def __init__(self, path_or_file, compact=False):
+        self.compact = compact
+        if isinstance(path_or_file, (str, os.PathLike)):
+            self.f = open(path_or_file, 'w', encoding='utf-8')
+            self._owns = True
+        else:
+            self.f = path_or_file
+            self._owns = False
+        self.exam_count = 0
+        self.question_count = 0
+        self._closed = False
+        self.f.write('[')
+
+    def _dumps(self, value, level):
+        if self.compact:
+            return json.dumps(value, ensure_ascii=False, separators=(',', ':'), cls=QuestionEncoder)
+        text = json.dumps(value, ensure_ascii=False, indent=2, cls=QuestionEncoder)
+        return text.replace('\n', '\n' + '  ' * level)
+
+    def _field(self, key, value, first):
+        sep = '' if first else ','
+        if self.compact:
+            return f'{sep}{self._dumps(key, 0)}:{self._dumps(value, 0)}'
+        return f'{sep}\n    {self._dumps(key, 0)}: {self._dumps(value, 2)}'
+
+    def write_exam(self, header, questions):
+        """写出一份试卷：先写 header 中已有的字段，再逐题写 questions，
+        最后补上读完 questions 后 header 中新出现的字段"""
+        f = self.f
+        nl = '' if self.compact else '\n  '
+        f.write(('' if self.exam_count == 0 else ',') + nl + '{')
+        written = set()
+        for key, value in list(header.items()):
+            if key == 'questions':
+                continue
+            f.write(self._field(key, value, not written))
+            written.add(key)
+
+        f.write(self._field('questions', [], not written)[:-1])
+        count = 0
+        for question in questions:
+            if self.compact:
+                data = compact_question(question)
+                f.write((',' if count else '') + self._dumps(data, 0))
+            else:
+                f.write((',' if count else '') + '\n      ' + self._dumps(question, 3))
+            count += 1
+        f.write(('' if self.compact or not count else '\n    ') + ']')
+        written.add('questions')
+
+        for key, value in list(header.items()):
+            if key not in written:
+                f.write(self._field(key, value, False))
+        f.write(('' if self.compact else '\n  ') + '}')
+        self.exam_count += 1
+        self.question_count += count
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self.f.write(('\n' if self.exam_count and not self.compact else '') + ']')
+        if self._owns:
+            self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def transform(input_path, output_path, func, compact=False, model=True):
+    """逐题执行 func(header, question) -> question 并流式写出，返回 (试卷数, 题数)
+
+    返回 None 的题目会被丢掉（题号不会自动重排）。
+    """
+    with ExamGroupWriter(output_path, compact) as writer:
+        for header, questions in iter_exams(input_path, model):
+            mapped = (func(header, q) for q in questions)
+            writer.write_exam(header, (q for q in mapped if q is not None))
+        return writer.exam_count, writer.question_count
+
+
+def stream_stats(path):
+    exams = questions = 0
+    types = {}
+    for header, items in iter_exams(path):
+        exams += 1
+        for q in items:
+            questions += 1
+            types[q.get('type')] = types.get(q.get('type'), 0) + 1
+    return {'exams': exams, 'questions': questions, 'types': types}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='流式读写试卷组 JSON（常数内存）')
+    sub = parser.add_subparsers(dest='command', required=True)
+    stats = sub.add_parser('stats', help='统计试卷数、题数和各题型数量')
+    stats.add_argument('input', help='试卷组 JSON 文件')
+    explain = sub.add_parser('explain', help='逐题填写解析（见 explanation_store.py）')
+    explain.add_argument('input', help='试卷组 JSON 文件')
+    explain.add_argument('-o', '--output', required=True, help='输出文件')
+    explain.add_argument('--compact', action='store_true', help='输出紧凑 JSON')
+    copy = sub.add_parser('copy', help='流式复制（可在可读格式和紧凑格式之间转换）')
+    copy.add_argument('input', help='试卷组 JSON 文件')
+    copy.add_argument('-o', '--output', required=True, help='输出文件')
+    copy.add_argument('--compact', action='store_true', help='输出紧凑 JSON')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.command == 'stats':
+        result = stream_stats(args.input)
+        print(f"试卷 {result['exams']} 份，题目 {result['questions']} 道，题型：{result['types']}")
+    elif args.command == 'explain':
+        from explanation_store import NO_EXPLANATION, ExplanationStore
+        store = ExplanationStore()
+
+        def attach(header, question):
+            explanation = store.get(question)
+            if explanation is not None:
+                question['explanation'] = explanation
+            elif not question['explanation']:
+                question['explanation'] = NO_EXPLANATION
+            return question
+
+        exams, questions = transform(args.input, args.output, attach, args.compact)
+        stats = store.stats()
+        print(f"输出文件：{args.output}，试卷 {exams} 份，题目 {questions} 道，"
+              f"解析命中 {stats['hits']}，未命中 {stats['misses']}")
+    else:
+        exams, questions = transform(args.input, args.output, lambda header, q: q, args.compact)
+        print(f"输出文件：{args.output}，试卷 {exams} 份，题目 {questions} 道")
+    print(f"耗时 {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
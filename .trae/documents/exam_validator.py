@@ -0,0 +1,298 @@
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from exam_stream import iter_exams
+from question_model import Option
+
+# 试卷组格式校验（取代原来的 verify_output.py / validate_fixed.py / check_output.py）
+# 原来的三个脚本只看前 3 道题、结果打印到屏幕、每验证一份就重新读一遍文件。
+# 这里把试卷组读一次，逐份试卷、逐道题检查全部题目：
+#   试卷：id / timestamp / title / questions 齐全且类型正确，试卷 id 不重复
+#   题目：必需字段齐全，type 是 single / multiple / text，content 非空
+#   选项：每个选项都是对象，有字符串 label 和 html，label 不重复；选择题至少两个选项，简答题没有选项
+#   答案：correctAnswer 必须是选项的 label，多选题按逗号拆开逐个检查（如 A,B,C）；简答题缺答案只算警告
+#   题号：id 从 0 开始连续递增、不重复
+# 试卷之间互不依赖，试卷多时分发到进程池；结果是一份 JSON 报告，有错误时退出码为 1，
+# 批处理可以据此中止。
+#   python exam_validator.py 数据库原理试卷组_final.json -o report.json
+#   python exam_validator.py 数据库原理判断题.json 数据库原理单选题.json
+#   python exam_validator.py 大题库.json --stream      逐题流式校验（见 exam_stream.py）
+
+REPORT_VERSION = 1
+ERROR = 'error'
+WARNING = 'warning'
+
+# 试卷 id 由 make_exam 生成为时间戳字符串，老文件里也有整数
+EXAM_FIELDS = (('id', (str, int)), ('timestamp', int), ('title', str), ('questions', (list, tuple)))
+QUESTION_FIELDS = ('id', 'type', 'content', 'options', 'correctAnswer', 'userAnswer', 'explanation')
+QUESTION_TYPES = ('single', 'multiple', 'text')
+CHOICE_TYPES = ('single', 'multiple')
+
+# 每份试卷同一种问题最多逐条列出的次数，超出的只计数，免得一个坏文件撑爆报告
+MAX_ISSUES_PER_CODE = 20
+
+
+def issue(severity, code, message, question=None, question_id=None):
+    item = {"severity": severity, "code": code, "message": message}
+    if question is not None:
+        item["question"] = question
+        item["questionId"] = question_id
+    return item
+
+
+def check_options(q_type, options):
+    """检查选项形状，返回 (问题列表, label 集合)"""
+    issues = []
+    labels = set()
+    if not isinstance(options, (list, tuple)):
+        return [(ERROR, 'options_type', 'options 不是数组')], labels
+    for i, opt in enumerate(options):
+        if not isinstance(opt, (dict, Option)):
+            issues.append((ERROR, 'option_type', f'第 {i + 1} 个选项不是对象'))
+            continue
+        if not ('label' in opt and 'html' in opt):
+            issues.append((ERROR, 'option_shape', f'第 {i + 1} 个选项缺少 label 或 html'))
+            continue
+        label = opt['label']
+        if not isinstance(label, str) or not label or not isinstance(opt['html'], str):
+            issues.append((ERROR, 'option_shape', f'第 {i + 1} 个选项的 label/html 不是非空字符串'))
+            continue
+        if label in labels:
+            issues.append((ERROR, 'option_duplicate_label', f'选项 label 重复：{label}'))
+        labels.add(label)
+    if q_type in CHOICE_TYPES and len(options) < 2:
+        issues.append((ERROR, 'option_count', f'选择题只有 {len(options)} 个选项'))
+    elif q_type == 'text' and options:
+        issues.append((WARNING, 'option_count', f'简答题带有 {len(options)} 个选项'))
+    return issues, labels
+
+
+def check_answer(q_type, answer, labels):
+    if not isinstance(answer, str) or not answer.strip():
+        # 简答题（如计算题）在原始题库里常常没有参考答案，只提示
+        severity = WARNING if q_type == 'text' else ERROR
+        return [(severity, 'answer_missing', '缺少 correctAnswer')]
+    if q_type == 'text':
+        return []
+    if q_type == 'single':
+        if answer not in labels:
+            return [(ERROR, 'answer_not_in_options', f'答案 {answer} 不在选项中')]
+        return []
+    parts = answer.split(',')
+    issues = []
+    missing = [a for a in parts if a not in labels]
+    if missing:
+        issues.append((ERROR, 'answer_not_in_options', f"答案 {','.join(missing)} 不在选项中"))
+    if len(set(parts)) != len(parts):
+        issues.append((ERROR, 'answer_duplicate', f'多选答案有重复：{answer}'))
+    if len(parts) == 1:
+        issues.append((WARNING, 'answer_single_in_multiple', f'多选题只有一个答案：{answer}'))
+    return issues
+
+
+def check_question(q):
+    """检查一道题，返回 [(severity, code, message), ...]"""
+    missing = [field for field in QUESTION_FIELDS if field not in q]
+    if missing:
+        return [(ERROR, 'missing_field', f"缺少字段：{', '.join(missing)}")]
+
+    issues = []
+    q_type = q['type']
+    if q_type not in QUESTION_TYPES:
+        issues.append((ERROR, 'bad_type', f'未知题型：{q_type}'))
+    content = q['content']
+    if not isinstance(content, str) or not content.strip():
+        issues.append((ERROR, 'empty_content', '题干为空'))
+
+    option_issues, labels = check_options(q_type, q['options'])
+    issues.extend(option_issues)
+    issues.extend(check_answer(q_type, q['correctAnswer'], labels))
+
+    user_answer = q['userAnswer']
+    if user_answer is not None and not isinstance(user_answer, str):
+        issues.append((ERROR, 'user_answer_type', f'userAnswer 不是字符串：{user_answer!r}'))
+    elif user_answer and q_type in CHOICE_TYPES and labels and any(a not in labels for a in user_answer.split(',')):
+        issues.append((WARNING, 'user_answer_not_in_options', f'userAnswer {user_answer} 不在选项中'))
+    return issues
+
+
+def validate_exam(exam, questions=None):
+    """检查一份试卷，返回 {"id", "title", "questionCount", "errors", "warnings", "issues", "counts"}
+
+    流式校验时 exam 为不含 questions 的试卷头，题目由 questions 迭代器逐题提供。
+    """
+    result = {"id": None, "title": None, "questionCount": 0, "errors": 0, "warnings": 0,
+              "issues": [], "counts": {}}
+    issues = result['issues']
+    counts = Counter()
+
+    def add(severity, code, message, question=None, question_id=None):
+        counts[code] += 1
+        result['errors' if severity == ERROR else 'warnings'] += 1
+        if counts[code] <= MAX_ISSUES_PER_CODE:
+            issues.append(issue(severity, code, message, question, question_id))
+
+    if not hasattr(exam, 'get') or not hasattr(exam, 'keys'):
+        add(ERROR, 'exam_type', '试卷不是对象')
+        result['counts'] = dict(counts)
+        return result
+
+    streamed = questions is not None
+    if not streamed:
+        questions = exam.get('questions')
+        if not isinstance(questions, (list, tuple)):
+            questions = ()
+
+    seen_ids = set()
+    prev_id = -1
+    count = 0
+    for i, q in enumerate(questions):
+        count += 1
+        if not hasattr(q, 'get'):
+            add(ERROR, 'question_type', '题目不是对象', i)
+            continue
+        qid = q.get('id')
+        for severity, code, message in check_question(q):
+            add(severity, code, message, i, qid)
+        if not isinstance(qid, int) or isinstance(qid, bool):
+            if 'id' in q:
+                add(ERROR, 'id_type', f'题目 id 不是整数：{qid!r}', i, qid)
+            continue
+        # 只在跳号处报告一次，缺一道题不会让后面所有题都报错
+        if qid in seen_ids:
+            add(ERROR, 'id_duplicate', f'题目 id 重复：{qid}', i, qid)
+        elif qid != prev_id + 1:
+            add(ERROR, 'id_not_contiguous', f'题目 id 应为 {prev_id + 1}，实际为 {qid}', i, qid)
+        seen_ids.add(qid)
+        prev_id = qid
+    result['questionCount'] = count
+
+    # 流式读取时写在 questions 之后的字段要等题目读完才有，所以试卷字段放在最后检查
+    result['id'] = exam.get('id')
+    result['title'] = exam.get('title')
+    for field, types in EXAM_FIELDS:
+        if field == 'questions' and streamed:
+            continue
+        if field not in exam:
+            add(ERROR, 'exam_missing_field', f'试卷缺少字段：{field}')
+        elif not isinstance(exam[field], types) or isinstance(exam[field], bool):
+            add(ERROR, 'exam_field_type', f'试卷字段 {field} 类型错误')
+    if 'isSubmitted' in exam and not isinstance(exam['isSubmitted'], bool):
+        add(WARNING, 'exam_field_type', '试卷字段 isSubmitted 不是布尔值')
+
+    result['counts'] = dict(counts)
+    return result
+
+
+def validate_exam_group(exam_group, workers=None):
+    """校验试卷组（数组）或单份试卷（对象），返回报告字典"""
+    start = time.perf_counter()
+    exams = [exam_group] if isinstance(exam_group, dict) else list(exam_group)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(exams) < workers * 2:
+        results = list(map(validate_exam, exams))
+    else:
+        chunksize = max(1, len(exams) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(validate_exam, exams, chunksize=chunksize))
+    return build_report(results, start)
+
+
+def validate_stream(path):
+    """用 exam_stream 逐题读取并校验，内存占用与文件大小无关（单进程）"""
+    start = time.perf_counter()
+    results = [validate_exam(header, questions) for header, questions in iter_exams(path)]
+    return build_report(results, start)
+
+
+def _valid_exam_id(exam_id):
+    return isinstance(exam_id, (str, int)) and not isinstance(exam_id, bool)
+
+
+def build_report(results, start):
+    """汇总各试卷的校验结果，检查试卷 id 是否重复"""
+    report_exams = []
+    totals = Counter()
+    errors = warnings = 0
+    # 只统计合法类型的 id；数组、对象这类 id 已在 validate_exam 里报了 exam_field_type，也不能当字典键
+    exam_ids = Counter(r['id'] for r in results if _valid_exam_id(r['id']))
+    for i, result in enumerate(results):
+        if _valid_exam_id(result['id']) and exam_ids[result['id']] > 1:
+            result['issues'].append(issue(ERROR, 'exam_id_duplicate', f"试卷 id 重复：{result['id']}"))
+            result['counts']['exam_id_duplicate'] = 1
+            result['errors'] += 1
+        totals.update(result['counts'])
+        errors += result['errors']
+        warnings += result['warnings']
+        if result['issues']:
+            report_exams.append({
+                "exam": i,
+                "id": result['id'],
+                "title": result['title'],
+                "errors": result['errors'],
+                "warnings": result['warnings'],
+                "issues": result['issues']
+            })
+
+    return {
+        "version": REPORT_VERSION,
+        "ok": errors == 0,
+        "examCount": len(results),
+        "questionCount": sum(r['questionCount'] for r in results),
+        "errorCount": errors,
+        "warningCount": warnings,
+        "codes": dict(totals.most_common()),
+        "exams": report_exams,
+        "elapsed": round(time.perf_counter() - start, 4)
+    }
+
+
+def print_validation_report(report, path=None, file=sys.stderr):
+    name = f"{path}：" if path else ''
+    status = '✓ 校验通过' if report['ok'] else '✗ 校验失败'
+    print(f"{status}：{name}{report['examCount']} 份试卷，{report['questionCount']} 道题，"
+          f"错误 {report['errorCount']} 个，警告 {report['warningCount']} 个，"
+          f"耗时 {report['elapsed']:.3f}s", file=file)
+    for code, count in report['codes'].items():
+        print(f"  {code}: {count}", file=file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='校验试卷组 JSON 的格式，输出 JSON 报告')
+    parser.add_argument('inputs', nargs='+', help='试卷组（数组）或单份试卷（对象）JSON 文件')
+    parser.add_argument('-o', '--output', default=None, help='报告文件，默认输出到标准输出')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='进程数，默认等于 CPU 核数')
+    parser.add_argument('--stream', action='store_true', help='流式读取，逐题校验（适合内存放不下的大文件）')
+    parser.add_argument('--strict', action='store_true', help='有警告也视为失败')
+    args = parser.parse_args()
+
+    reports = {}
+    for path in args.inputs:
+        if args.stream:
+            report = validate_stream(path)
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            report = validate_exam_group(data, args.workers)
+        print_validation_report(report, path)
+        reports[path] = report
+
+    ok = all(r['ok'] and not (args.strict and r['warningCount']) for r in reports.values())
+    result = {"ok": ok, "files": reports}
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+import argparse
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+from question_dedup import key_text, normalize_text, question_key_parts
+from question_model import load_exam_group
+
+# 按题目内容寻址的解析库
+# 解析不再按 “第几题 + 试卷标题” 查找，而是按题目内容的稳定哈希：
+#   键 = blake2b(规范化后的 题干 + 排序后的选项)，与 question_dedup 的比较文本相同，
+#   所以题目换了位置、选项换了顺序、出现在别的试卷里，或者去重合并之后，都能找到同一条解析。
+# 解析库是一个 JSON 文件（explanations.json），第一次查询时才读取；
+# 题目 -> 键 的计算（规范化 + 哈希）前面有 LRU 缓存，重复出现的题目不必再算一遍。
+#   python explanation_store.py import 数据库原理试卷组_with_explanations.json   从已有试卷组收集解析
+#   python explanation_store.py stats
+
+STORE_VERSION = 1
+DEFAULT_STORE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'explanations.json')
+NO_EXPLANATION = "本题暂无解析"
+KEY_CACHE_SIZE = 1 << 16
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def _key_of_parts(parts):
+    return hashlib.blake2b(key_text(parts).encode('utf-8'), digest_size=12).hexdigest()
+
+
+def question_key(question):
+    """题目内容的稳定哈希"""
+    return _key_of_parts(question_key_parts(question))
+
+
+def key_cache_info():
+    return _key_of_parts.cache_info()
+
+
+class ExplanationStore:
+    """解析库：{内容哈希: 解析}，第一次访问时才从文件加载"""
+
+    def __init__(self, path=DEFAULT_STORE):
+        self.path = path
+        self._entries = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def entries(self):
+        if self._entries is None:
+            self._entries = {}
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') != STORE_VERSION:
+                    raise ValueError(f"不支持的解析库版本：{data.get('version')}")
+                self._entries = data['explanations']
+        return self._entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, question, default=None):
+        entry = self.entries.get(question_key(question))
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return entry['explanation']
+
+    def add(self, question, explanation):
+        """记录一条解析；preview 只是方便人工查看和编辑解析库文件"""
+        self.entries[question_key(question)] = {
+            "preview": normalize_text(question['content'])[:40],
+            "explanation": explanation
+        }
+
+    def save(self, path=None):
+        path = path or self.path
+        data = {"version": STORE_VERSION, "explanations": self.entries}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0}
+
+
+def collect_explanations(exam_group, store):
+    """把试卷组中已有的解析收进解析库，返回收录的条数"""
+    count = 0
+    for exam in exam_group:
+        for question in exam['questions']:
+            explanation = question['explanation']
+            if explanation and explanation != NO_EXPLANATION:
+                store.add(question, explanation)
+                count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='按题目内容寻址的解析库')
+    parser.add_argument('--store', default=DEFAULT_STORE, help='解析库文件')
+    sub = parser.add_subparsers(dest='command', required=True)
+    imp = sub.add_parser('import', help='从已有试卷组收集解析')
+    imp.add_argument('exam_groups', nargs='+', help='带解析的试卷组 JSON')
+    sub.add_parser('stats', help='显示解析库条目数')
+    args = parser.parse_args()
+
+    store = ExplanationStore(args.store)
+    if args.command == 'import':
+        before = len(store)
+        for path in args.exam_groups:
+            with open(path, 'r', encoding='utf-8') as f:
+                exam_group = load_exam_group(json.load(f))
+            print(f"{path}：收录 {collect_explanations(exam_group, store)} 条解析")
+        store.save()
+        print(f"解析库：{args.store}，新增 {len(store) - before} 条，共 {len(store)} 条")
+    else:
+        print(f"解析库：{args.store}，共 {len(store)} 条")
+
+
+if __name__ == '__main__':
+    main()
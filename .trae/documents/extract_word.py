@@ -1,16 +1,86 @@
-from docx import Document
-import re
-
-def extract_text_from_word():
-    doc = Document('c:\\Users\\DAI\\IdeaProjects\\vue_project_2\\.trae\\documents\\数据库原理作业选择.docx')
-    full_text = []
-    for para in doc.paragraphs:
-        text = para.text
-        if text.strip():
-            full_text.append(text)
-    return '\n'.join(full_text)
-
-text = extract_text_from_word()
-print(text)
-with open('c:\\Users\\DAI\\IdeaProjects\\vue_project_2\\.trae\\documents\\temp.txt', 'w', encoding='utf-8') as f:
-    f.write(text)
+import argparse
+import sys
+import zipfile
+import xml.etree.ElementTree as ET
+
+# 流式提取 Word 文本
+# 直接从 .docx 压缩包里的 word/document.xml 增量解析，边读边产出段落，
+# 表格单元格里的段落也会按文档顺序产出；已处理的元素会立即从树上移除，
+# 所以内存占用与文档大小无关。只用标准库，不再依赖 python-docx。
+
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+W_P = W_NS + 'p'
+W_T = W_NS + 't'
+W_TAB = W_NS + 'tab'
+W_BR = W_NS + 'br'
+W_CR = W_NS + 'cr'
+W_TBL = W_NS + 'tbl'
+
+DEFAULT_DOCX = 'c:\\Users\\DAI\\IdeaProjects\\vue_project_2\\.trae\\documents\\数据库原理作业选择.docx'
+DEFAULT_OUTPUT = 'c:\\Users\\DAI\\IdeaProjects\\vue_project_2\\.trae\\documents\\temp.txt'
+
+
+def iter_docx_paragraphs(path):
+    """按文档顺序逐个产出段落文本（包括表格单元格中的段落）"""
+    with zipfile.ZipFile(path) as zf, zf.open('word/document.xml') as stream:
+        stack = []    # 当前打开的元素，用来在处理完后把元素从父节点上摘掉
+        buffers = []  # 当前打开的段落（文本框里的段落会嵌套在段落里）
+        for event, elem in ET.iterparse(stream, events=('start', 'end')):
+            if event == 'start':
+                stack.append(elem)
+                if elem.tag == W_P:
+                    buffers.append([])
+                continue
+
+            stack.pop()
+            tag = elem.tag
+            if buffers:
+                if tag == W_T:
+                    buffers[-1].append(elem.text or '')
+                elif tag == W_TAB:
+                    buffers[-1].append('\t')
+                elif tag in (W_BR, W_CR):
+                    buffers[-1].append('\n')
+            if tag == W_P:
+                yield ''.join(buffers.pop())
+            if tag in (W_P, W_TBL) and stack:
+                # 段落和表格处理完就丢掉，保证内存不随文档增长
+                stack[-1].remove(elem)
+
+
+def iter_docx_lines(path):
+    """产出非空的文本行，段落内的换行拆成多行，可直接交给 question_tokenizer.tokenize_lines"""
+    for para in iter_docx_paragraphs(path):
+        for line in para.split('\n'):
+            if line.strip():
+                yield line
+
+
+def extract_text_from_word(path=DEFAULT_DOCX):
+    return '\n'.join(iter_docx_lines(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='从 .docx 中流式提取文本')
+    parser.add_argument('docx', nargs='?', default=DEFAULT_DOCX, help='Word 文档路径')
+    parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT, help='输出的文本文件，- 表示只输出到屏幕')
+    args = parser.parse_args()
+
+    if args.output == '-':
+        for line in iter_docx_lines(args.docx):
+            print(line)
+        return
+
+    # 逐行写出 temp.txt，不在内存中拼接整篇文档
+    count = 0
+    with open(args.output, 'w', encoding='utf-8') as f:
+        for line in iter_docx_lines(args.docx):
+            if count:
+                f.write('\n')
+            f.write(line)
+            count += 1
+    print(f"共提取 {count} 行，已写入：{args.output}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,20 +1,18 @@
-import re
+from question_grammar import JUDGE_SECTION_RE, JUDGE_ITEM_RE
 
 # 读取文件内容
 with open(r'c:\Users\DAI\IdeaProjects\vue_project_2\.trae\documents\temp.txt', 'r', encoding='utf-8') as f:
     text = f.read()
 
 # 提取判断题部分
-judge_section = re.search(r'第一题：判断对错(.*?)第二题：选择题', text, re.DOTALL)
+judge_section = JUDGE_SECTION_RE.search(text)
 if judge_section:
     judge_text = judge_section.group(1)
     
-    # 修复后的正则表达式，处理答案后面可能的空行
-    # (?s) 启用 DOTALL 模式，让 . 匹配换行符
-    # [\s\n]* 匹配答案后面可能的空格和换行符
-    pattern = r'(?s)[\(（](\d+)[\)）]\s+(.*?)\n([√×])[\s\n]*'
-    
-    matches = re.findall(pattern, judge_text)
+    # 修复后的正则表达式（question_grammar.JUDGE_ITEM_RE）按行前进：
+    # 题号后允许没有空格，题干可以跨越多行，但不会越过下一个题号或答案行，
+    # 缺答案时最多回溯到下一个题号，不会像非贪婪 DOTALL 那样扫到文本末尾
+    matches = JUDGE_ITEM_RE.findall(judge_text)
     
     print(f"修复后的正则表达式匹配到 {len(matches)} 个判断题")
     print(f"题号列表：{[match[0] for match in matches]}")
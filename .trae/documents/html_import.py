@@ -0,0 +1,457 @@
+import argparse
+import html
+import os
+import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+
+from batch_ingest import collect_sources, source_names
+from exam_merge import format_stats, read_exam_group, upsert_exams
+from exam_output import write_exam_group
+from parse_engine import make_exam, stable_exam_id
+from question_model import JUDGE_OPTION_SET, Question, option_set
+
+# 批量导入平台保存下来的答题页面（.html）
+# 识别规则与 quiz-app-container.vue 的 parseAndGenerate 相同，支持两种页面：
+#   常规页面    题目容器 class 含 plugins-testType- / studentTestDetail-list；
+#              .content-box 题干、.desc 题型分值难度、.SingleChoice-radio / .el-radio-group 选项、
+#              .answer-correct-type i 正确答案、.reference-name/.reference-cont 参考答案、.analysisDesc 解析
+#   Angular 页面 app-object-quiz-item；.question-body 题干、nz-radio-group / nz-checkbox-wrapper 选项、
+#              .correct-answer 正确答案、.knowledge-points 解析
+# 页面不建 DOM：html.parser 按事件逐块喂入，只维护打开元素的栈和当前一道题的字段，
+# 题目容器关闭时就产出这道题。题干和选项保留原 HTML（与页面粘贴导入一致），
+# 判断题转换成 正确(True)/错误(False) 两个选项，多选答案写成 A,B,C。
+# 每个页面生成一份试卷，id 由文件名 + 页面标题决定；多个页面分发到进程池并行解析。
+#   python html_import.py 保存的页面/ -o 导入试卷组.json
+#   python html_import.py "pages/**/*.html" -o 试卷组.json --upsert -j 4
+
+PAGE_EXTS = ('.html', '.htm')
+CHUNK_SIZE = 64 * 1024
+VOID_TAGS = frozenset(('area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+                       'param', 'source', 'track', 'wbr'))
+RAW_TAGS = frozenset(('script', 'style'))
+# 需要收集内容的元素角色
+CAPTURED = frozenset(('title', 'content', 'desc', 'option', 'choice', 'choice_div', 'opt_span', 'answer',
+                      'ref_name', 'ref_cont', 'analysis', 'kp', 'kp_title'))
+
+LETTER_RE = re.compile(r'^([A-Z])\.\s*(.*)$', re.S)
+META_TYPES = (('判断', 'judge'), ('多选', 'multiple'), ('单选', 'single'), ('简答', 'text'), ('填空', 'text'),
+              ('论述', 'text'), ('计算', 'text'))
+TRUE_WORDS = ('正确', '对', '√', 'T', '是')
+FALSE_WORDS = ('错误', '错', '×', 'F', '否')
+# 没有题型说明时，两个选项恰好是这些文字才当作判断题（TCP/FTP、是/否 这类单选题不算）
+JUDGE_OPTION_TEXTS = frozenset((('正确', '错误'), ('对', '错'), ('√', '×'), ('正确(True)', '错误(False)')))
+
+
+def fix_html_content(content):
+    """与页面的 fixHtmlContent 相同：补全协议相对的图片地址，图片不带 referrer"""
+    if not content:
+        return ''
+    content = content.replace('src="//', 'src="https://')
+    return content.replace('<img ', '<img referrerpolicy="no-referrer" ')
+
+
+def _squash(text):
+    return ' '.join(text.split())
+
+
+class _Capture:
+    """一个元素的 innerHTML 和 innerText"""
+    __slots__ = ('role', 'html', 'text')
+
+    def __init__(self, role):
+        self.role = role
+        self.html = []
+        self.text = []
+
+
+class QuizPageParser(HTMLParser):
+    """事件驱动的答题页面解析器；feed() 可以分块调用，解析出的题目累积在 questions 中"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.title = ''
+        self.questions = []
+        self.skipped = 0          # 找到题目容器但没有题干的题
+        self._stack = []          # [(tag, roles, captures)]
+        self._captures = []       # 当前打开的所有收集区
+        self._inside = Counter()  # 角色 -> 打开的层数
+        self._q = None            # 当前题目的字段
+        self._opt = None          # 当前选项的字段
+
+    # ---- 元素角色 ----
+
+    def _roles(self, tag, classes):
+        inside = self._inside
+        if tag in RAW_TAGS:
+            return ('raw',)
+        if self._q is None:
+            if tag == 'app-object-quiz-item':
+                self._q = {'style': 'angular', 'options': []}
+                return ('item',)
+            if 'plugins-testType-' in classes or 'studentTestDetail-list' in classes:
+                self._q = {'style': 'standard', 'options': []}
+                return ('item',)
+            if tag == 'title' and not self.title:
+                return ('title',)
+            return ()
+
+        names = classes.split()
+        roles = []
+        if self._q['style'] == 'standard':
+            if 'content-box' in names and 'content' not in self._q and not inside['content']:
+                roles.append('content')
+            if 'desc' in names and 'meta' not in self._q:
+                roles.append('desc')
+            if 'SingleChoice-radio' in names or 'el-radio-group' in names:
+                roles.append('options')
+                self._q.setdefault('hint', 'single')
+            elif 'el-checkbox-group' in names or 'MultipleChoice-checkbox' in names:
+                roles.append('options')
+                self._q.setdefault('hint', 'multiple')
+            if tag == 'label' and inside['options'] and not inside['option']:
+                roles.append('option')
+            if 'choice' in names and inside['option'] and not inside['choice']:
+                roles.append('choice')
+            if tag == 'div' and inside['choice'] and not inside['choice_div'] and 'html' not in self._opt:
+                roles.append('choice_div')
+            if 'answer-correct-type' in names:
+                roles.append('answer_type')
+            if tag == 'i' and inside['answer_type'] and not inside['answer']:
+                roles.append('answer')
+            if 'reference-name' in names:
+                roles.append('ref_name')
+            if 'reference-cont' in names:
+                roles.append('ref_cont')
+            if 'analysisDesc' in names:
+                roles.append('analysis')
+        else:
+            if 'question-body' in names and 'content' not in self._q and not inside['content']:
+                roles.append('content')
+            if tag == 'nz-radio-group' and not inside['options']:
+                roles.append('options')
+                self._q.setdefault('hint', 'single')
+            elif tag == 'nz-checkbox-wrapper' and not inside['options']:
+                roles.append('options')
+                self._q['hint'] = 'multiple'
+            if tag == 'label' and inside['options'] and not inside['option']:
+                roles.append('option')
+            if tag == 'span' and inside['option'] and 'ant-radio' not in classes and 'ant-checkbox' not in classes:
+                roles.append('opt_span')
+            if 'correct-answer' in names:
+                roles.append('answer')
+            if 'knowledge-points' in names:
+                roles.append('kp')
+            if 'item-title' in names and inside['kp']:
+                roles.append('kp_title')
+        if 'option' in roles:
+            self._opt = {}
+        return tuple(roles)
+
+    # ---- HTMLParser 事件 ----
+
+    def handle_starttag(self, tag, attrs):
+        raw = self.get_starttag_text()
+        for cap in self._captures:
+            cap.html.append(raw)
+        if tag in VOID_TAGS:
+            return
+        classes = ''
+        for name, value in attrs:
+            if name == 'class' and value:
+                classes = value
+                break
+        roles = self._roles(tag, classes)
+        captures = []
+        for role in roles:
+            self._inside[role] += 1
+            if role in CAPTURED:
+                captures.append(_Capture(role))
+        self._captures.extend(captures)
+        self._stack.append((tag, roles, captures))
+
+    def handle_startendtag(self, tag, attrs):
+        raw = self.get_starttag_text()
+        for cap in self._captures:
+            cap.html.append(raw)
+
+    def handle_endtag(self, tag):
+        stack = self._stack
+        for depth in range(len(stack) - 1, -1, -1):
+            if stack[depth][0] == tag:
+                break
+        else:
+            return  # 没有对应开始标签的结束标签，忽略
+        # 同时关闭没有写结束标签的内层元素（如 <p>、<li>）
+        while len(stack) > depth:
+            _, roles, captures = stack.pop()
+            for cap in captures:
+                self._captures.remove(cap)
+            for cap in reversed(captures):
+                self._finish(cap)
+            for role in reversed(roles):
+                self._inside[role] -= 1
+                if role == 'item':
+                    self._finish_question()
+        end = f'</{tag}>'
+        for cap in self._captures:
+            cap.html.append(end)
+
+    def handle_data(self, data):
+        if self._inside['raw']:
+            return
+        for cap in self._captures:
+            cap.html.append(data)
+            cap.text.append(data)
+
+    def _reference(self, raw):
+        text = html.unescape(raw)
+        for cap in self._captures:
+            cap.html.append(raw)
+            cap.text.append(text)
+
+    def handle_entityref(self, name):
+        if not self._inside['raw']:
+            self._reference(f'&{name};')
+
+    def handle_charref(self, name):
+        if not self._inside['raw']:
+            self._reference(f'&#{name};')
+
+    # ---- 收集区结束 ----
+
+    def _finish(self, cap):
+        role = cap.role
+        q, opt = self._q, self._opt
+        if role == 'title':
+            self.title = _squash(''.join(cap.text))
+            return
+        if q is None:
+            return
+        if role == 'content':
+            q['content'] = fix_html_content(''.join(cap.html))
+        elif role == 'desc':
+            q['meta'] = _squash(''.join(cap.text))
+        elif role == 'choice':
+            opt['text'] = _squash(''.join(cap.text))
+        elif role == 'choice_div':
+            opt['html'] = fix_html_content(''.join(cap.html))
+        elif role == 'opt_span':
+            opt['span'] = ''.join(cap.html).strip()
+        elif role == 'option':
+            self._finish_option(_squash(''.join(cap.text)))
+        elif role == 'answer':
+            answer = _squash(''.join(cap.text))
+            if q['style'] == 'angular':
+                answer = answer.replace('正确答案:', '').replace('正确答案：', '').strip().replace('，', ',')
+            q.setdefault('answer', answer)
+        elif role == 'ref_name':
+            q['pendingReference'] = '参考答案' in ''.join(cap.text)
+        elif role == 'ref_cont':
+            if q.pop('pendingReference', False):
+                q.setdefault('reference', _squash(''.join(cap.text)))
+        elif role == 'analysis':
+            q['explanation'] = _squash(''.join(cap.text).replace('试题解析', ''))
+        elif role == 'kp_title':
+            q['kpTitle'] = _squash(''.join(cap.text))
+        elif role == 'kp':
+            text = _squash(''.join(cap.text))
+            q['kp'] = text[4:].strip() if text.startswith('答案解析') else text
+
+    def _finish_option(self, label_text):
+        opt, self._opt = self._opt, None
+        if self._q['style'] == 'standard':
+            text = opt.get('text')
+            if text is None:
+                return  # 常规页面只认带 .choice 的选项
+            m = LETTER_RE.match(text)
+            label = m.group(1) if m else '?'
+            content = opt['html'] if 'html' in opt else (m.group(2) if m else text)
+        else:
+            text = opt.get('span') or label_text
+            m = LETTER_RE.match(text)
+            label, content = (m.group(1), m.group(2)) if m else (text, text)
+        self._q['options'].append((label, content))
+
+    def _finish_question(self):
+        q, self._q = self._q, None
+        question = build_question(q)
+        if question is None:
+            self.skipped += 1
+        else:
+            question.id = len(self.questions)
+            self.questions.append(question)
+
+
+def _meta_type(q):
+    """题型说明（如 “单选题”）给出的题型，没有时返回 None"""
+    meta = q.get('meta') or ''
+    for word, q_type in META_TYPES:
+        if word in meta:
+            return q_type
+    return None
+
+
+def _question_type(q):
+    q_type = _meta_type(q)
+    if q_type:
+        return q_type
+    if q.get('hint'):
+        return q['hint']
+    return 'single' if q['options'] else 'text'
+
+
+def _judge_answer(answer, options):
+    """把 对/错、√/×、选项字母 等判断题答案换成 正确(True)/错误(False)"""
+    for label, content in options:
+        if answer == label:
+            answer = re.sub(r'<[^>]+>', '', content).strip()
+            break
+    if answer.startswith(TRUE_WORDS):
+        return '正确(True)'
+    if answer.startswith(FALSE_WORDS):
+        return '错误(False)'
+    return answer
+
+
+def _is_judge_options(options):
+    if len(options) != 2:
+        return False
+    return tuple(re.sub(r'<[^>]+>', '', content).strip() for _, content in options) in JUDGE_OPTION_TEXTS
+
+
+def build_question(q):
+    """把解析器收集到的字段拼成 Question；没有题干的返回 None"""
+    content = q.get('content')
+    if not content:
+        return None
+    q_type = _question_type(q)
+    options = q['options']
+    answer = q.get('reference') if q_type == 'text' and q.get('reference') else q.get('answer', '')
+    if q_type == 'text':
+        options = ()
+    # 题型说明缺失时才按选项文字认判断题；判断题在页面上也是单选按钮组，hint 为 single 不排除
+    elif q_type == 'judge' or (q_type == 'single' and _meta_type(q) is None and _is_judge_options(options)):
+        q_type, options, answer = 'single', JUDGE_OPTION_SET, _judge_answer(answer, options)
+    else:
+        letters = re.findall(r'[A-Z]', answer)
+        if q_type == 'single' and len(letters) > 1:
+            q_type = 'multiple'
+        if q_type == 'multiple':
+            answer = ','.join(letters)
+        options = option_set(options)
+    explanation = q.get('explanation') or q.get('kpTitle') or q.get('kp') or ''
+    return Question(None, q_type, content, options, answer, '', explanation, q.get('meta'))
+
+
+def parse_page(path, encoding='utf-8'):
+    """逐块读取并解析一个页面，返回 (页面标题, 题目列表, 跳过的题数)"""
+    parser = QuizPageParser()
+    with open(path, 'r', encoding=encoding, errors='replace') as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            parser.feed(chunk)
+    parser.close()
+    return parser.title, parser.questions, parser.skipped
+
+
+def import_page(path):
+    """进程池中的任务：解析一个页面，返回解析结果和耗时"""
+    start = time.perf_counter()
+    try:
+        title, questions, skipped = parse_page(path)
+    except Exception as e:  # 单个页面失败不影响整批
+        return {'path': path, 'title': '', 'questions': [], 'skipped': 0,
+                'error': f'{type(e).__name__}: {e}', 'elapsed': time.perf_counter() - start}
+    return {'path': path, 'title': title, 'questions': questions, 'skipped': skipped, 'error': None,
+            'size': os.path.getsize(path), 'elapsed': time.perf_counter() - start}
+
+
+def import_pages(paths, workers=None):
+    """并行解析所有页面，结果按输入顺序返回"""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(paths) < workers * 2:
+        return [import_page(p) for p in paths]
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(import_page, paths, chunksize=chunksize))
+
+
+def build_exam_group(results, names=None):
+    """每个有题目的页面生成一份试卷；标题取页面 <title>，没有时用文件名
+    试卷 id 由页面相对输入目录的路径（names，见 batch_ingest.source_names；默认文件名）+ 标题决定"""
+    names = names or {}
+    exam_group = []
+    for result in results:
+        if not result['questions']:
+            continue
+        name = os.path.basename(result['path'])
+        title = result['title'] or os.path.splitext(name)[0]
+        exam_group.append(make_exam(title, result['questions'], offset=len(exam_group), is_submitted=False,
+                                    exam_id=stable_exam_id(names.get(result['path'], name), title)))
+    return exam_group
+
+
+def print_report(results, elapsed):
+    print(f"\n=== 页面导入报告 ===")
+    total = 0
+    types = Counter()
+    for result in results:
+        name = os.path.basename(result['path'])
+        if result['error']:
+            print(f"✗ {name}：{result['error']}")
+            continue
+        questions = result['questions']
+        total += len(questions)
+        types.update(q.type for q in questions)
+        if not questions:
+            print(f"✗ {name}：未识别到题目结构")
+        elif result['skipped']:
+            print(f"  {name}：{len(questions)} 道题，{result['skipped']} 道没有题干已跳过")
+    pages = len(results)
+    size = sum(r.get('size', 0) for r in results)
+    print(f"\n共 {pages} 个页面，{total} 道题（{', '.join(f'{t} {n}' for t, n in types.most_common())}），"
+          f"总耗时 {elapsed:.3f}s，{pages / elapsed if elapsed else 0:.0f} 页/s，"
+          f"{size / 1024 / 1024 / elapsed if elapsed else 0:.1f}MB/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='批量导入保存下来的答题页面（.html）')
+    parser.add_argument('inputs', nargs='+', help='页面文件、目录或通配符（如 "pages/**/*.html"）')
+    parser.add_argument('-o', '--output', default='导入试卷组.json', help='输出的试卷组文件')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='进程数，默认等于 CPU 核数')
+    parser.add_argument('--upsert', action='store_true', help='并入已有的输出文件（按试卷 id 更新或追加）')
+    parser.add_argument('--compact', action='store_true', help='输出紧凑 JSON')
+    args = parser.parse_args()
+
+    paths = collect_sources(args.inputs, PAGE_EXTS)
+    if not paths:
+        print("没有找到 .html/.htm 页面")
+        return
+    try:
+        names = source_names(args.inputs, paths)
+    except ValueError as e:
+        print(f"错误：{e}")
+        exit(1)
+    start = time.perf_counter()
+    results = import_pages(paths, args.workers)
+    print_report(results, time.perf_counter() - start)
+
+    exam_group = build_exam_group(results, names)
+    if args.upsert and os.path.exists(args.output):
+        try:
+            exam_group, stats = upsert_exams(read_exam_group(args.output), exam_group)
+        except ValueError as e:
+            print(f"错误：{e}")
+            exit(1)
+        print(f"合并到 {args.output}：{format_stats(stats)}")
+    write_exam_group(exam_group, args.output, args.compact)
+    print(f"输出文件：{args.output}，包含试卷数量：{len(exam_group)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+import sqlite3
+
+from question_model import QuestionEncoder, load_sections
+
+# 增量导入缓存
+# 在输出文件旁边放一个 SQLite 数据库，记录每个源文件的内容哈希和解析结果。
+# 源文件没变就直接复用上次的解析结果，只有变化的文件才重新提取和解析。
+
+# 解析器输出格式变化时递增，旧缓存会整体失效
+CACHE_VERSION = 2
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """按块计算文件内容的 sha256，不把整个文件读进内存"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class IngestCache:
+    """以源文件内容哈希为键的解析结果缓存"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.hits = 0
+        self.misses = 0
+        self.conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS sources ('
+            'path TEXT PRIMARY KEY, hash TEXT, size INTEGER, mtime_ns INTEGER, sections TEXT)'
+        )
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is None or row[0] != str(CACHE_VERSION):
+            self.conn.execute('DELETE FROM sources')
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (str(CACHE_VERSION),))
+            self.conn.commit()
+
+    def lookup(self, path):
+        """返回 (解析结果或 None, 内容哈希)
+
+        大小和修改时间都没变时只做一次 stat，不必重新计算哈希；
+        否则重新计算哈希，内容没变（例如只是被 touch 过）仍然算命中。
+        """
+        key = os.path.abspath(path)
+        st = os.stat(path)
+        row = self.conn.execute(
+            'SELECT hash, size, mtime_ns, sections FROM sources WHERE path = ?', (key,)
+        ).fetchone()
+        if row and row[1] == st.st_size and row[2] == st.st_mtime_ns:
+            self.hits += 1
+            return load_sections(json.loads(row[3])), row[0]
+
+        digest = file_hash(path)
+        if row and row[0] == digest:
+            self.conn.execute('UPDATE sources SET size = ?, mtime_ns = ? WHERE path = ?',
+                              (st.st_size, st.st_mtime_ns, key))
+            self.hits += 1
+            return load_sections(json.loads(row[3])), digest
+
+        self.misses += 1
+        return None, digest
+
+    def store(self, path, digest, sections):
+        """记录一个源文件的解析结果"""
+        st = os.stat(path)
+        self.conn.execute(
+            'INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?, ?)',
+            (os.path.abspath(path), digest, st.st_size, st.st_mtime_ns,
+             json.dumps(sections, ensure_ascii=False, cls=QuestionEncoder))
+        )
+
+    def prune(self, paths):
+        """删除不在 paths 中的旧记录（源文件已被删除或改名）"""
+        keep = {os.path.abspath(p) for p in paths}
+        stale = [row[0] for row in self.conn.execute('SELECT path FROM sources') if row[0] not in keep]
+        self.conn.executemany('DELETE FROM sources WHERE path = ?', [(p,) for p in stale])
+        return len(stale)
+
+    def stats(self):
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0.0
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': rate}
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
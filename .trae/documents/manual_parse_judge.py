@@ -1,90 +1,54 @@
-import re
 import json
 from datetime import datetime
 
+from question_gaps import analyze_tokens, print_gap_report
+from question_tokenizer import NUMBER, tokenize, section_tokens, iter_judge_items
+
 # 读取文件内容
 with open(r'c:\Users\DAI\IdeaProjects\vue_project_2\.trae\documents\temp.txt', 'r', encoding='utf-8') as f:
     text = f.read()
 
-# 提取判断题部分
-judge_section = re.search(r'第一题：判断对错(.*?)第二题：选择题', text, re.DOTALL)
-if judge_section:
-    judge_text = judge_section.group(1)
-    
+# 单遍分词，只取判断题部分
+judge_tokens = list(section_tokens(tokenize(text), '判断'))
+if judge_tokens:
     # 获取所有题号
-    all_numbers = re.findall(r'[\(（](\d+)[\)）]', judge_text)
+    all_numbers = [str(tok.value) for tok in judge_tokens if tok.kind == NUMBER]
     
     print(f"找到 {len(all_numbers)} 个题号：{all_numbers}")
     
+    # 一次遍历建立 题号 -> (题干, 答案) 的索引，不再对每个题号重新扫描全文
+    parsed = {}
+    for num, content, answer, _ in iter_judge_items(judge_tokens):
+        parsed.setdefault(num, (content, answer))
+    
+    # 题号范围和缺失/重复情况由 question_gaps 算出，不再写死 range(1, 36)
+    gaps = analyze_tokens(judge_tokens)['sections'][0]
+    print_gap_report({'sections': [gaps]})
+
     judge_questions = []
     
-    for expected_num in range(1, 36):  # 手动遍历1到35题
-        expected_num_str = str(expected_num)
-        
-        # 搜索当前题号的题目
-        # 尝试不同的括号格式
-        patterns = [
-            f'\({expected_num_str}\)',  # (1)
-            f'（{expected_num_str}）'   # （1）
-        ]
-        
-        found = False
-        
-        for pattern in patterns:
-            # 找到当前题号的位置
-            pos = judge_text.find(pattern)
-            if pos != -1:
-                found = True
-                
-                # 提取从当前题号到下一个题号或文本结束的内容
-                next_pos = len(judge_text)
-                
-                # 查找下一个题号
-                for next_num in range(expected_num + 1, 36):
-                    next_patterns = [
-                        f'\({next_num}\)',
-                        f'（{next_num}）'
-                    ]
-                    for next_pat in next_patterns:
-                        np = judge_text.find(next_pat, pos + 1)
-                        if np != -1 and np < next_pos:
-                            next_pos = np
-                            break
-                    if next_pos != len(judge_text):
-                        break
-                
-                # 提取当前题目的内容
-                current_content = judge_text[pos:next_pos]
-                
-                # 从内容中提取题目文本和答案
-                content_match = re.search(r'[\)）]\s+(.+?)\n([√×])', current_content, re.DOTALL)
-                
-                if content_match:
-                    content = content_match.group(1).strip()
-                    answer = content_match.group(2)
-                    
-                    question = {
-                        "id": len(judge_questions),
-                        "type": "single",
-                        "content": f"\n          <p><span>{expected_num}.</span>&nbsp; <span>{content}</span></p>\n        ",
-                        "options": [
-                            {"label": "正确(True)", "html": "正确(True)"},
-                            {"label": "错误(False)", "html": "错误(False)"}
-                        ],
-                        "correctAnswer": "正确(True)" if answer == "√" else "错误(False)",
-                        "userAnswer": "",
-                        "explanation": "",
-                        "meta": f"\n          {expected_num}、判断题（1分）\n          分值：1分\n          难度：适中\n        "
-                    }
-                    judge_questions.append(question)
-                    print(f"✓ 成功解析第{expected_num}题")
-                else:
-                    print(f"✗ 无法解析第{expected_num}题的内容")
-                    print(f"  题目内容：{current_content[:100]}...")
-                
-                break
-        
-        if not found:
+    for expected_num in range(1, gaps['expected'] + 1):
+        if expected_num in parsed:
+            content, answer = parsed[expected_num]
+            
+            question = {
+                "id": len(judge_questions),
+                "type": "single",
+                "content": f"\n          <p><span>{expected_num}.</span>&nbsp; <span>{content}</span></p>\n        ",
+                "options": [
+                    {"label": "正确(True)", "html": "正确(True)"},
+                    {"label": "错误(False)", "html": "错误(False)"}
+                ],
+                "correctAnswer": "正确(True)" if answer == "√" else "错误(False)",
+                "userAnswer": "",
+                "explanation": "",
+                "meta": f"\n          {expected_num}、判断题（1分）\n          分值：1分\n          难度：适中\n        "
+            }
+            judge_questions.append(question)
+            print(f"✓ 成功解析第{expected_num}题")
+        elif str(expected_num) in all_numbers:
+            print(f"✗ 无法解析第{expected_num}题的内容")
+        else:
             print(f"✗ 未找到第{expected_num}题")
     
     print(f"\n=== 解析结果 ===")
@@ -0,0 +1,371 @@
+import hashlib
+from datetime import datetime
+
+from question_model import Question, JUDGE_OPTION_SET, option_set
+from question_tokenizer import SECTION, NUMBER, OPTION, ANSWER, TEXT, tokenize, tokenize_file
+
+# 统一的题目解析引擎
+# 由 question_tokenizer 的 token 流驱动一个状态机，单遍产出页面可直接加载的题目：
+#   id, type, content, options, correctAnswer, userAnswer, explanation, meta
+# 每种题型由注册表中的处理函数负责拼装，新增题型只需要 @register_handler 一个函数。
+
+# 题型处理函数注册表：题型 -> 处理函数(raw) -> Question（id 由引擎填写）
+HANDLERS = {}
+
+# 大题标题关键字 -> 题型，按顺序匹配；“选择” 大题根据答案个数自动区分单选/多选
+SECTION_KINDS = [
+    ('判断', 'judge'),
+    ('单选', 'single'),
+    ('多选', 'multiple'),
+    ('选择', 'choice'),
+    ('简答', 'text'),
+    ('填空', 'text'),
+]
+
+# 题型 -> 试卷标题后缀
+TYPE_TITLES = {
+    'judge': '判断题',
+    'single': '单选题',
+    'multiple': '多选题',
+    'choice': '单选题',
+    'text': '简答题',
+}
+
+# 单道题的大小上限：超过的题目不再继续累积内容，直接标记为无法解析，
+# 这样一道缺少题号/答案、把后面几千行都吞进来的坏题不会拖慢整批。
+# 选项个数不单独设上限，同样受这两个上限约束
+MAX_QUESTION_CHARS = 5000
+MAX_QUESTION_LINES = 200
+EXAM_ID_DIGITS = 15
+
+# 状态机状态
+IDLE = 'idle'        # 还没有遇到题目
+STEM = 'stem'        # 正在读题干
+OPTIONS = 'options'  # 正在读选项
+DONE = 'done'        # 已读到答案
+
+
+class ParseError(ValueError):
+    """单道题无法解析时由处理函数抛出，引擎会记录下来并继续处理后面的题"""
+
+
+def option_label(i):
+    """第 i 个选项（从 0 开始）的字母：A-Z，之后是 AA、AB …"""
+    label = ''
+    i += 1
+    while i:
+        i, r = divmod(i - 1, 26)
+        label = chr(ord('A') + r) + label
+    return label
+
+
+class RawQuestion:
+    """状态机收集到的一道题的原始内容"""
+
+    def __init__(self, num, offset, line):
+        self.num = num
+        self.offset = offset
+        self.line = line
+        self.stem = []
+        self.options = []
+        self.answer = None
+        self.size = 0
+        self.lines = 0
+        self.overflow = None
+
+    @property
+    def content(self):
+        return '\n'.join(self.stem).strip()
+
+    def _grow(self, text, max_chars, max_lines):
+        """累计大小，超过上限时记录原因并返回 False"""
+        if self.overflow:
+            return False
+        self.size += len(text)
+        self.lines += 1
+        if self.size > max_chars:
+            self.overflow = f"题目超过 {max_chars} 字符"
+        elif self.lines > max_lines:
+            self.overflow = f"题目超过 {max_lines} 行"
+        return self.overflow is None
+
+    def add_stem(self, text, max_chars=MAX_QUESTION_CHARS, max_lines=MAX_QUESTION_LINES):
+        if self._grow(text, max_chars, max_lines):
+            self.stem.append(text)
+
+    def add_option(self, text, max_chars=MAX_QUESTION_CHARS, max_lines=MAX_QUESTION_LINES):
+        """追加选项，按出现顺序重新编号，修正 OCR 把 C 识别成 B 之类的错误"""
+        if self._grow(text, max_chars, max_lines):
+            self.options.append((option_label(len(self.options)), text))
+
+    def extend_option(self, text, max_chars=MAX_QUESTION_CHARS, max_lines=MAX_QUESTION_LINES):
+        """选项跨行时把续行接到最后一个选项后面"""
+        if self._grow(text, max_chars, max_lines):
+            label, prev = self.options[-1]
+            self.options[-1] = (label, f'{prev} {text}')
+
+
+def register_handler(kind):
+    """注册题型处理函数"""
+    def decorator(func):
+        HANDLERS[kind] = func
+        return func
+    return decorator
+
+
+def section_kind(title):
+    """根据大题标题判断题型，未知标题按选择题处理"""
+    for keyword, kind in SECTION_KINDS:
+        if keyword in title:
+            return kind
+    return 'choice'
+
+
+def format_meta(num, type_name):
+    return f"\n          {num}、{type_name}（1分）\n          分值：1分\n          难度：适中\n        "
+
+
+def build_question(q_type, content, options, answer, meta):
+    """按页面加载的格式构造题目（id 由引擎按大题内的顺序填写）"""
+    return Question(None, q_type, content, options, answer, meta=meta)
+
+
+def _choice_options(raw):
+    if not raw.options:
+        raise ParseError("没有选项")
+    return option_set((label, f"  {text}") for label, text in raw.options)
+
+
+def _check_answer_labels(raw, answer):
+    labels = {label for label, _ in raw.options}
+    missing = [a for a in answer.split(',') if a not in labels]
+    if missing:
+        raise ParseError(f"答案 {answer} 不在选项中")
+
+
+@register_handler('judge')
+def handle_judge(raw):
+    """判断题：页面按单选题展示，选项固定为 正确(True)/错误(False)"""
+    if raw.answer not in ('√', '×'):
+        raise ParseError("缺少 √/× 答案")
+    return build_question(
+        "single",
+        f"\n          <p><span>{raw.num}.</span>&nbsp; <span>{raw.content}</span></p>\n        ",
+        JUDGE_OPTION_SET,
+        "正确(True)" if raw.answer == "√" else "错误(False)",
+        format_meta(raw.num, "判断题")
+    )
+
+
+@register_handler('single')
+def handle_single(raw):
+    """单选题"""
+    if not raw.answer or ',' in raw.answer or raw.answer in ('√', '×'):
+        raise ParseError("缺少单选答案")
+    options = _choice_options(raw)
+    _check_answer_labels(raw, raw.answer)
+    return build_question(
+        "single",
+        f"\n          <p>{raw.content}</p>\n        ",
+        options,
+        raw.answer,
+        format_meta(raw.num, "单选题")
+    )
+
+
+@register_handler('multiple')
+def handle_multiple(raw):
+    """多选题，答案用逗号连接，如 A,B,C"""
+    if not raw.answer or raw.answer in ('√', '×'):
+        raise ParseError("缺少多选答案")
+    options = _choice_options(raw)
+    _check_answer_labels(raw, raw.answer)
+    return build_question(
+        "multiple",
+        f"\n          <p>{raw.content}</p>\n        ",
+        options,
+        raw.answer,
+        format_meta(raw.num, "多选题")
+    )
+
+
+@register_handler('choice')
+def handle_choice(raw):
+    """选择题大题：一个答案是单选，多个答案是多选"""
+    if raw.answer and ',' in raw.answer:
+        return HANDLERS['multiple'](raw)
+    return HANDLERS['single'](raw)
+
+
+@register_handler('text')
+def handle_text(raw):
+    """简答题/填空题：没有选项，答案为 “答案：” 后面的文本"""
+    if not raw.answer:
+        raise ParseError("缺少答案")
+    return build_question(
+        "text",
+        f"\n          <p>{raw.content}</p>\n        ",
+        (),
+        raw.answer,
+        format_meta(raw.num, "简答题")
+    )
+
+
+def parse_tokens(tokens, answer_fixes=None, handlers=None,
+                 max_chars=MAX_QUESTION_CHARS, max_lines=MAX_QUESTION_LINES):
+    """单遍状态机：把 token 流解析成按大题分组的题目
+
+    answer_fixes: {(题型, 题号): 答案}，用于修正原文中缺失或错误的答案
+    max_chars/max_lines: 单题大小上限，超过的题目记为错误
+    返回 [{'title', 'kind', 'questions', 'errors'}, ...]，errors 为 (题号, 行号, 偏移, 原因)
+    """
+    handlers = handlers or HANDLERS
+    answer_fixes = answer_fixes or {}
+    sections = []
+    section = None
+    current = None
+    state = IDLE
+    last_num = 0
+
+    def flush():
+        nonlocal current
+        if current is None or section is None:
+            current = None
+            return
+        kind = section['kind']
+        fixed = answer_fixes.get((kind, current.num))
+        if fixed is not None:
+            current.answer = fixed
+        try:
+            if current.overflow:
+                raise ParseError(current.overflow)
+            question = handlers[kind](current)
+        except ParseError as e:
+            section['errors'].append((current.num, current.line, current.offset, str(e)))
+        else:
+            question.id = len(section['questions'])
+            section['questions'].append(question)
+        current = None
+
+    def start(num, tok):
+        nonlocal current, state, last_num
+        flush()
+        current = RawQuestion(num, tok.offset, tok.line)
+        state = STEM
+        last_num = num
+
+    for tok in tokens:
+        kind = tok.kind
+        if kind == SECTION:
+            flush()
+            section = {'title': tok.value, 'kind': section_kind(tok.value), 'questions': [], 'errors': []}
+            sections.append(section)
+            state = IDLE
+            last_num = 0
+        elif section is None:
+            continue
+        elif kind == NUMBER:
+            start(tok.value, tok)
+            if tok.text:
+                current.add_stem(tok.text, max_chars, max_lines)
+        elif kind == OPTION:
+            if current is None:
+                continue
+            if section['kind'] == 'judge':
+                # 判断题里出现的选项样式文本仍然属于题干
+                current.add_stem(f'{tok.value}. {tok.text}', max_chars, max_lines)
+            else:
+                current.add_option(tok.text, max_chars, max_lines)
+                state = OPTIONS
+        elif kind == ANSWER:
+            if current is not None:
+                current.answer = tok.value
+                state = DONE
+        elif kind == TEXT:
+            text = tok.text
+            if text.startswith(('答案：', '答案:')):
+                if current is not None:
+                    current.answer = text[3:].strip()
+                    state = DONE
+            elif state == STEM:
+                current.add_stem(text, max_chars, max_lines)
+            elif state == OPTIONS:
+                current.extend_option(text, max_chars, max_lines)
+            elif state == DONE:
+                # 答案之后出现的无题号文本视为下一道题（原文中漏掉题号的情况）
+                start(last_num + 1, tok)
+                current.add_stem(text, max_chars, max_lines)
+
+    flush()
+    return sections
+
+
+def parse_text(text, answer_fixes=None, **limits):
+    """解析完整文本"""
+    return parse_tokens(tokenize(text), answer_fixes, **limits)
+
+
+def parse_file(path, answer_fixes=None, **limits):
+    """逐行解析文件"""
+    return parse_tokens(tokenize_file(path), answer_fixes, **limits)
+
+
+def questions_of(sections, kind):
+    """取出某种题型大题中的全部题目（多个同类大题会按顺序合并并重新编号）"""
+    questions = []
+    for section in sections:
+        if section['kind'] == kind:
+            for q in section['questions']:
+                questions.append(q.replace(id=len(questions)))
+    return questions
+
+
+def stable_exam_id(source, section):
+    """由源文件名和大题标题得到固定的试卷 id（与时间戳 id 一样是数字字符串）"""
+    digest = hashlib.blake2b(f'{source}\x1f{section}'.encode('utf-8'), digest_size=8).digest()
+    return f'{int.from_bytes(digest, "big") % 10 ** EXAM_ID_DIGITS:0{EXAM_ID_DIGITS}d}'
+
+
+def make_exam(title, questions, offset=0, is_submitted=None, exam_id=None):
+    """构造试卷结构，offset 用于同一批生成的多份试卷错开 id/时间戳；exam_id 默认为时间戳"""
+    timestamp = int(datetime.now().timestamp() * 1000) + offset
+    exam = {
+        "id": exam_id or f"{timestamp}",
+        "timestamp": timestamp,
+        "title": title,
+        "questions": questions
+    }
+    if is_submitted is not None:
+        exam["isSubmitted"] = is_submitted
+    return exam
+
+
+def sections_to_exams(prefix, sections, offset=0, source=None):
+    """每个非空大题生成一份试卷，标题为 前缀 + 题型，如 “数据库原理判断题”
+
+    给出 source（源文件名）时试卷 id 由 源文件名 + 大题标题 决定（stable_exam_id），
+    重新导入同一个文件得到相同的 id，可以用 exam_merge 并入已有试卷组；同名大题按出现顺序区分。
+    """
+    exams = []
+    seen = {}
+    for section in sections:
+        if not section['questions']:
+            continue
+        title = f"{prefix}{TYPE_TITLES.get(section['kind'], section['title'])}"
+        exam_id = None
+        if source is not None:
+            n = seen[section['title']] = seen.get(section['title'], 0) + 1
+            exam_id = stable_exam_id(source, section['title'] if n == 1 else f"{section['title']}#{n}")
+        exams.append(make_exam(title, section['questions'], offset=offset + len(exams),
+                               is_submitted=True, exam_id=exam_id))
+    return exams
+
+
+if __name__ == '__main__':
+    import sys
+
+    path = sys.argv[1] if len(sys.argv) > 1 else 'temp.txt'
+    for section in parse_file(path):
+        print(f"{section['title']}（{section['kind']}）：解析成功 {len(section['questions'])} 道题")
+        for num, line, offset, reason in section['errors']:
+            print(f"  ✗ 第{num}题（第{line}行，偏移{offset}）：{reason}")
@@ -0,0 +1,444 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows 没有 resource 模块，改用 psapi 取峰值工作集
+    resource = None
+
+try:
+    import pyinstrument
+except ImportError:  # pyinstrument 是可选依赖，没有安装时只能用 cProfile
+    pyinstrument = None
+
+# 流水线性能记录
+# 每个阶段（提取、规范化、解析、组卷、合并、解析说明、校验、写出……）记录：
+#   wall / cpu        墙钟时间和本进程 CPU 时间（time.process_time）
+#   items / itemsPerSec  阶段处理的条目数（行、题、试卷）和吞吐
+#   peakRss / rssGrowth  阶段结束时进程的峰值 RSS，以及本阶段把峰值抬高了多少
+#   tracemallocPeak   --trace-memory 时本阶段 Python 堆的峰值（开启后整体会变慢）
+#   counters / regex  阶段内的计数器；--count-regex 时各预编译正则的成功匹配次数
+# 另外记录各缓存的命中/未命中（增量缓存、解析库、内容哈希缓存）。
+# 结果可以写成 JSON 运行报告，也可以写成 Prometheus 文本格式（node_exporter 的 textfile collector 可直接读取）。
+# --profile 阶段名 对指定阶段开启 cProfile（或 --profiler pyinstrument），结果写到 --profile-dir。
+# 计数和内存只统计主进程；进程池中的工作进程只体现在 childPeakRss 里，需要细看时用 -j 1。
+#   python -m quiz_pipeline temp.txt --metrics run.json --prometheus run.prom --profile 解析
+#   python batch_ingest.py 题库/ --metrics run.json --count-regex -j 1
+
+REPORT_VERSION = 1
+PROFILERS = ('cprofile', 'pyinstrument')
+# 打补丁统计匹配次数的模块（模块级的预编译正则）
+REGEX_MODULES = ('question_grammar', 'question_tokenizer', 'text_normalize', 'parse_engine', 'question_dedup',
+                 'exam_output', 'html_import')
+PROFILE_TOP = 15
+
+
+def _windows_peak_rss():
+    import ctypes
+    from ctypes import wintypes
+
+    class Counters(ctypes.Structure):
+        _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                    ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                    ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                    ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+
+    counters = Counters()
+    counters.cb = ctypes.sizeof(Counters)
+    handle = ctypes.windll.kernel32.GetCurrentProcess()
+    if not ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+        return None
+    return counters.PeakWorkingSetSize
+
+
+def peak_rss(children=False):
+    """进程（或已结束的子进程中最大的那个）的峰值 RSS，单位字节；取不到时为 None"""
+    if resource is not None:
+        who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+        peak = resource.getrusage(who).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024  # Linux 上单位是 KB
+    if sys.platform == 'win32' and not children:
+        try:
+            return _windows_peak_rss()
+        except (OSError, AttributeError):
+            return None
+    return None
+
+
+class _CountingPattern:
+    """包装预编译正则，记录成功匹配的次数；其余属性原样转发"""
+    __slots__ = ('_pattern', '_name', '_metrics')
+
+    def __init__(self, pattern, name, metrics):
+        self._pattern = pattern
+        self._name = name
+        self._metrics = metrics
+
+    def __getattr__(self, attr):
+        return getattr(self._pattern, attr)
+
+    def match(self, *args, **kwargs):
+        m = self._pattern.match(*args, **kwargs)
+        if m is not None:
+            self._metrics.count_regex(self._name)
+        return m
+
+    def fullmatch(self, *args, **kwargs):
+        m = self._pattern.fullmatch(*args, **kwargs)
+        if m is not None:
+            self._metrics.count_regex(self._name)
+        return m
+
+    def search(self, *args, **kwargs):
+        m = self._pattern.search(*args, **kwargs)
+        if m is not None:
+            self._metrics.count_regex(self._name)
+        return m
+
+    def finditer(self, *args, **kwargs):
+        for m in self._pattern.finditer(*args, **kwargs):
+            self._metrics.count_regex(self._name)
+            yield m
+
+    def findall(self, *args, **kwargs):
+        result = self._pattern.findall(*args, **kwargs)
+        self._metrics.count_regex(self._name, len(result))
+        return result
+
+    def subn(self, *args, **kwargs):
+        result, n = self._pattern.subn(*args, **kwargs)
+        self._metrics.count_regex(self._name, n)
+        return result, n
+
+    def sub(self, *args, **kwargs):
+        return self.subn(*args, **kwargs)[0]
+
+
+class StageRecord:
+    """一个阶段的测量结果；阶段内设置 items 记录处理的条目数，计数用 PipelineMetrics.count()"""
+
+    def __init__(self, name, items=None):
+        self.name = name
+        self.items = items
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.peak_rss = None
+        self.rss_growth = None
+        self.traced_peak = None
+        self.counters = Counter()
+        self.regex = Counter()
+        self.profile = None
+
+    def to_dict(self):
+        data = {
+            "name": self.name,
+            "wall": round(self.wall, 6),
+            "cpu": round(self.cpu, 6),
+            "items": self.items,
+            "itemsPerSec": round(self.items / self.wall, 1) if self.items and self.wall else None,
+            "peakRss": self.peak_rss,
+            "rssGrowth": self.rss_growth,
+            "tracemallocPeak": self.traced_peak,
+        }
+        if self.counters:
+            data["counters"] = dict(self.counters)
+        if self.regex:
+            data["regex"] = dict(self.regex)
+        if self.profile:
+            data["profile"] = self.profile
+        return data
+
+
+class PipelineMetrics:
+    """记录流水线各阶段的耗时、吞吐、内存、计数和缓存命中
+
+        metrics = PipelineMetrics()
+        with metrics.stage('解析') as s:
+            sections = parse_tokens(tokens)
+            s.items = sum(len(x['questions']) for x in sections)
+        metrics.write_json('run.json')
+    """
+
+    def __init__(self, profile=(), profiler='cprofile', profile_dir='.', trace_memory=False):
+        if profiler not in PROFILERS:
+            raise ValueError(f'未知的分析器：{profiler}')
+        if profiler == 'pyinstrument' and profile and pyinstrument is None:
+            raise RuntimeError('未安装 pyinstrument，无法按阶段采样（pip install pyinstrument，或改用 cprofile）')
+        self.profile = set(profile or ())
+        self.profiler = profiler
+        self.profile_dir = profile_dir
+        self.trace_memory = trace_memory
+        self.stages = []
+        self.counters = Counter()
+        self.regex = Counter()
+        self.caches = {}
+        self.started = datetime.now()
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.process_time()
+        self._current = None
+        self._patched = []
+        self._started_tracing = False
+
+    # ---- 阶段 ----
+
+    def _profiled(self, name):
+        return 'all' in self.profile or name in self.profile
+
+    @contextmanager
+    def stage(self, name, items=None):
+        record = StageRecord(name, items)
+        outer, self._current = self._current, record
+        rss_before = peak_rss()
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            tracemalloc.reset_peak()
+        profiler = self._start_profile() if self._profiled(name) else None
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        try:
+            yield record
+        finally:
+            record.wall = time.perf_counter() - start_wall
+            record.cpu = time.process_time() - start_cpu
+            if profiler is not None:
+                record.profile = self._stop_profile(profiler, name)
+            if self.trace_memory:
+                record.traced_peak = tracemalloc.get_traced_memory()[1]
+            record.peak_rss = peak_rss()
+            if record.peak_rss is not None and rss_before is not None:
+                record.rss_growth = record.peak_rss - rss_before
+            self._current = outer
+            self.stages.append(record)
+
+    @property
+    def timings(self):
+        return [(s.name, s.wall) for s in self.stages]
+
+    # ---- 计数与缓存 ----
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+        if self._current is not None:
+            self._current.counters[name] += n
+
+    def count_regex(self, name, n=1):
+        self.regex[name] += n
+        if self._current is not None:
+            self._current.regex[name] += n
+
+    def cache(self, name, hits, misses):
+        """记录一个缓存的命中情况（同名累加）"""
+        entry = self.caches.setdefault(name, {"hits": 0, "misses": 0})
+        entry["hits"] += hits
+        entry["misses"] += misses
+        total = entry["hits"] + entry["misses"]
+        entry["hitRate"] = round(entry["hits"] / total, 4) if total else None
+
+    def instrument_regexes(self, modules=REGEX_MODULES):
+        """把这些模块里的模块级预编译正则换成计数包装，close() 时还原
+
+        只有在调用时按模块全局名查找正则的代码才会被统计（本仓库的脚本都是这样用的）。
+        """
+        names = {}
+        for module_name in modules:
+            module = sys.modules.get(module_name)
+            if module is None:
+                continue
+            for attr, value in list(vars(module).items()):
+                if isinstance(value, re.Pattern):
+                    # 同一个正则被别的模块 from ... import 进去时，按定义它的模块计名
+                    name = names.setdefault(id(value), f'{module_name}.{attr}')
+                    setattr(module, attr, _CountingPattern(value, name, self))
+                    self._patched.append((module, attr, value))
+
+    def close(self):
+        for module, attr, value in reversed(self._patched):
+            setattr(module, attr, value)
+        self._patched = []
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    # ---- 分析器 ----
+
+    def _start_profile(self):
+        if self.profiler == 'pyinstrument':
+            profiler = pyinstrument.Profiler()
+            profiler.start()
+            return profiler
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    def _stop_profile(self, profiler, name):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        stem = os.path.join(self.profile_dir, f'profile_{len(self.stages) + 1:02d}_{name}')
+        if self.profiler == 'pyinstrument':
+            profiler.stop()
+            path = stem + '.txt'
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(profiler.output_text(unicode=True, color=False))
+            return {"profiler": "pyinstrument", "path": path}
+        profiler.disable()
+        path = stem + '.prof'
+        profiler.dump_stats(path)
+        out = io.StringIO()
+        stats = pstats.Stats(profiler, stream=out)
+        top = []
+        for (filename, line, func), (_, calls, tottime, cumtime, _) in \
+                sorted(stats.stats.items(), key=lambda kv: kv[1][3], reverse=True)[:PROFILE_TOP]:
+            top.append({"function": f'{os.path.basename(filename)}:{line}({func})', "calls": calls,
+                        "tottime": round(tottime, 6), "cumtime": round(cumtime, 6)})
+        return {"profiler": "cprofile", "path": path, "top": top}
+
+    # ---- 输出 ----
+
+    def to_dict(self):
+        return {
+            "version": REPORT_VERSION,
+            "command": sys.argv,
+            "started": self.started.isoformat(timespec='seconds'),
+            "wall": round(time.perf_counter() - self._start_wall, 6),
+            "cpu": round(time.process_time() - self._start_cpu, 6),
+            "peakRss": peak_rss(),
+            "childPeakRss": peak_rss(children=True) or None,
+            "stages": [s.to_dict() for s in self.stages],
+            "counters": dict(self.counters),
+            "caches": self.caches,
+            "regex": dict(self.regex),
+        }
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    def prometheus_text(self, prefix='quiz'):
+        """Prometheus 文本格式；同名阶段多次出现时时间和条目数累加、内存取最大"""
+        run = self.to_dict()
+        stages = {}
+        for s in self.stages:
+            agg = stages.setdefault(s.name, {"wall": 0.0, "cpu": 0.0, "items": 0, "peakRss": None,
+                                             "tracemallocPeak": None})
+            agg["wall"] += s.wall
+            agg["cpu"] += s.cpu
+            agg["items"] += s.items or 0
+            for key, value in (("peakRss", s.peak_rss), ("tracemallocPeak", s.traced_peak)):
+                if value is not None:
+                    agg[key] = max(agg[key] or 0, value)
+
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            samples = [(labels, value) for labels, value in samples if value is not None]
+            if not samples:
+                return
+            lines.append(f'# HELP {prefix}_{name} {help_text}')
+            lines.append(f'# TYPE {prefix}_{name} {kind}')
+            for labels, value in samples:
+                label_text = ','.join(f'{k}="{_escape_label(v)}"' for k, v in labels.items())
+                lines.append(f'{prefix}_{name}{{{label_text}}} {value}' if label_text
+                             else f'{prefix}_{name} {value}')
+
+        metric('run_wall_seconds', 'gauge', 'Wall-clock time of the whole run', [({}, run['wall'])])
+        metric('run_cpu_seconds', 'gauge', 'CPU time of the main process', [({}, run['cpu'])])
+        metric('run_peak_rss_bytes', 'gauge', 'Peak resident set size of the main process',
+               [({}, run['peakRss'])])
+        metric('run_child_peak_rss_bytes', 'gauge', 'Largest peak RSS among finished worker processes',
+               [({}, run['childPeakRss'])])
+        metric('stage_wall_seconds', 'gauge', 'Wall-clock time per pipeline stage',
+               [({"stage": n}, round(a["wall"], 6)) for n, a in stages.items()])
+        metric('stage_cpu_seconds', 'gauge', 'CPU time per pipeline stage',
+               [({"stage": n}, round(a["cpu"], 6)) for n, a in stages.items()])
+        metric('stage_items', 'gauge', 'Items processed per pipeline stage',
+               [({"stage": n}, a["items"]) for n, a in stages.items() if a["items"]])
+        metric('stage_items_per_second', 'gauge', 'Throughput per pipeline stage',
+               [({"stage": n}, round(a["items"] / a["wall"], 1)) for n, a in stages.items()
+                if a["items"] and a["wall"]])
+        metric('stage_peak_rss_bytes', 'gauge', 'Process peak RSS at the end of the stage',
+               [({"stage": n}, a["peakRss"]) for n, a in stages.items()])
+        metric('stage_tracemalloc_peak_bytes', 'gauge', 'Peak traced Python heap during the stage',
+               [({"stage": n}, a["tracemallocPeak"]) for n, a in stages.items()])
+        metric('events_total', 'counter', 'Pipeline event counters',
+               [({"name": n}, v) for n, v in sorted(self.counters.items())])
+        metric('cache_hits_total', 'counter', 'Cache hits',
+               [({"cache": n}, c["hits"]) for n, c in self.caches.items()])
+        metric('cache_misses_total', 'counter', 'Cache misses',
+               [({"cache": n}, c["misses"]) for n, c in self.caches.items()])
+        metric('cache_hit_ratio', 'gauge', 'Cache hit ratio',
+               [({"cache": n}, c["hitRate"]) for n, c in self.caches.items()])
+        metric('regex_matches_total', 'counter', 'Successful matches per precompiled pattern',
+               [({"stage": s.name, "pattern": p}, v) for s in self.stages for p, v in sorted(s.regex.items())])
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path, prefix='quiz'):
+        # 先写临时文件再替换，textfile collector 不会读到写了一半的文件
+        tmp = f'{path}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus_text(prefix))
+        os.replace(tmp, path)
+
+    def report(self, file=sys.stdout):
+        total = sum(s.wall for s in self.stages)
+        print(f"\n=== 各阶段耗时 ===", file=file)
+        print(f"  {'阶段':<8}{'墙钟':>10}{'CPU':>10}{'占比':>8}{'数量':>10}{'数量/s':>12}{'峰值RSS':>10}", file=file)
+        for s in self.stages:
+            share = s.wall / total if total else 0
+            rate = f'{s.items / s.wall:.0f}' if s.items and s.wall else '-'
+            rss = f'{s.peak_rss / 1024 / 1024:.0f}MB' if s.peak_rss else '-'
+            print(f"  {s.name:<8}{s.wall * 1000:>8.2f}ms{s.cpu * 1000:>8.2f}ms{share:>8.1%}"
+                  f"{s.items if s.items is not None else '-':>10}{rate:>12}{rss:>10}", file=file)
+        print(f"  {'合计':<8}{total * 1000:>8.2f}ms", file=file)
+        for name, entry in self.caches.items():
+            rate = f"{entry['hitRate']:.0%}" if entry['hitRate'] is not None else '-'
+            print(f"  缓存 {name}：命中 {entry['hits']}，未命中 {entry['misses']}，命中率 {rate}", file=file)
+        if self.regex:
+            top = ', '.join(f'{name.split(".")[-1]} {n}' for name, n in self.regex.most_common(6))
+            print(f"  正则匹配：{top}", file=file)
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def add_metrics_arguments(parser):
+    """给命令行加上性能记录相关的选项"""
+    group = parser.add_argument_group('性能记录')
+    group.add_argument('--metrics', default=None, metavar='JSON', help='写出 JSON 运行报告')
+    group.add_argument('--prometheus', default=None, metavar='PROM', help='写出 Prometheus 文本格式指标')
+    group.add_argument('--profile', action='append', default=[], metavar='阶段',
+                       help='对该阶段开启分析器，可重复；all 表示所有阶段')
+    group.add_argument('--profiler', choices=PROFILERS, default='cprofile', help='分析器（默认 cprofile）')
+    group.add_argument('--profile-dir', default='profiles', help='分析结果目录')
+    group.add_argument('--trace-memory', action='store_true', help='用 tracemalloc 记录各阶段的 Python 堆峰值（较慢）')
+    group.add_argument('--count-regex', action='store_true', help='统计各预编译正则的匹配次数（仅主进程）')
+
+
+def metrics_from_args(args):
+    metrics = PipelineMetrics(args.profile, args.profiler, args.profile_dir, args.trace_memory)
+    if args.count_regex:
+        metrics.instrument_regexes()
+    return metrics
+
+
+def finish_metrics(metrics, args):
+    """按命令行选项写出报告，并还原正则包装"""
+    metrics.close()
+    if args.metrics:
+        metrics.write_json(args.metrics)
+        print(f"运行报告：{args.metrics}")
+    if args.prometheus:
+        metrics.write_prometheus(args.prometheus)
+        print(f"Prometheus 指标：{args.prometheus}")
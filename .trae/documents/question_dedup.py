@@ -0,0 +1,369 @@
+import argparse
+import html
+import json
+import os
+import re
+import time
+import unicodedata
+import zlib
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations, repeat
+
+from exam_output import write_exam_group
+from question_model import JUDGE_OPTION_SET, load_exam_group
+
+# 近似重复题目检测（MinHash + LSH）
+# 多个题库之间经常有措辞略有不同、选项顺序不同的同一道题，两两比较是 O(n²)。
+# 这里的做法：
+#   1. 规范化：去掉 HTML 标签、题号、空白和标点，NFKC 把全角字符折叠成半角；
+#      选项文本排序后拼到题干后面，所以选项顺序不影响结果
+#   2. 取字符 3-gram 作为 shingle
+#   3. 单次排列 MinHash（one permutation hashing）：每个 shingle 只哈希一次（crc32），按哈希值分桶、
+#      桶内取最小值得到 NUM_PERM 维签名。纯 Python 下比 “NUM_PERM 个哈希函数各算一遍” 快一个数量级
+#   4. LSH 分带：签名切成 BANDS 段，至少 MIN_SHARED_BANDS 段完全相同（很短的题目一段即可）为候选对；
+#      全部为空桶的段不参与，否则很短的题目之间会因为空桶相同而大量碰撞。
+#      1~3 步按块分发到进程池，只把每段的哈希值传回来
+#   5. 候选对再用精确 Jaccard 相似度复核，超过阈值的用并查集合并成簇
+#   python question_dedup.py 题目格式.json --report 题目格式.dedup.json
+
+NUM_PERM = 128
+BANDS = 16           # 每段 8 行：相似度 0.8 时成为候选的概率约 0.95，0.4 时约 0.01
+# 桶内不超过这么多道题时两两比较，更大的桶（大量真实重复）只与第一道比较
+MAX_PAIRWISE_BUCKET = 16
+# 候选对至少要在这么多段上相同
+MIN_SHARED_BANDS = 2
+SHINGLE_SIZE = 3
+THRESHOLD = 0.8
+
+TAG_RE = re.compile(r'<[^>]+>')
+# 只有图片的题目（公式截图）用公式文本或图片地址参与比较
+IMG_RE = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+IMG_ATTR_RE = re.compile(r'(data-latex|src)="([^"]*)"')
+# 题干开头的题号：1. / 1、 / (1)
+LEADING_NUMBER_RE = re.compile(r'^\s*(?:\d+\s*[\.、．]|[\(（]\s*\d+\s*[\)）])')
+# 空白、标点和符号都不参与比较
+NOISE_RE = re.compile(r'[\s\W_]+')
+# 同上，但保留题干/选项之间的分隔符，整道题只做一次替换
+NOISE_KEEP_SEP_RE = re.compile(r'[^\w\x1f]+|_+')
+
+JUDGE_LABELS = [o.label for o in JUDGE_OPTION_SET]
+
+# 空桶的占位值，大于任何哈希值
+EMPTY = 1 << 32
+# 题干和各选项拼在一起做一次规范化，之后再按这个字符拆开
+PART_SEP = '\x1f'
+# 进程池每个任务处理的题数
+CHUNK_SIZE = 2000
+
+
+def _img_text(m):
+    attrs = dict(IMG_ATTR_RE.findall(m.group(0)))
+    if 'data-latex' in attrs:
+        return ' ' + attrs['data-latex'] + ' '
+    # 去掉签名等查询参数，同一张图的地址保持一致
+    return ' ' + attrs.get('src', '').split('?')[0] + ' '
+
+
+def normalize_text(text):
+    text = IMG_RE.sub(_img_text, text or '')
+    text = html.unescape(TAG_RE.sub(' ', text))
+    text = unicodedata.normalize('NFKC', text)
+    text = LEADING_NUMBER_RE.sub('', text)
+    return NOISE_RE.sub('', text).lower()
+
+
+def question_key_parts(question):
+    """参与比较的原始文本：题干和各选项 html（判断题的 正确/错误 选项不参与）"""
+    options = question['options']
+    if options is JUDGE_OPTION_SET or [o['label'] for o in options] == JUDGE_LABELS:
+        return (question['content'] or '',)
+    return (question['content'] or '',) + tuple(o['html'] or '' for o in options)
+
+
+def key_text(parts):
+    """规范化后的比较文本：题干 + 排序后的选项，选项顺序不影响结果"""
+    text = IMG_RE.sub(_img_text, PART_SEP.join(parts))
+    text = unicodedata.normalize('NFKC', html.unescape(TAG_RE.sub(' ', text)))
+    # \x1f 也算空白，题号只从题干里去掉，不能跨过分隔符吃掉选项开头的数字
+    content, sep, options = text.partition(PART_SEP)
+    text = NOISE_KEEP_SEP_RE.sub('', LEADING_NUMBER_RE.sub('', content) + sep + options).lower()
+    if not sep:
+        return text
+    content, *options = text.split(PART_SEP)
+    options.sort()
+    return content + '|' + '|'.join(options)
+
+
+def question_key_text(question):
+    return key_text(question_key_parts(question))
+
+
+def answer_key(question):
+    """正确答案对应的选项文本，选项顺序不同的同一道题答案字母不同但这里相同"""
+    labels = {a.strip() for a in question['correctAnswer'].split(',')}
+    texts = sorted(normalize_text(o['html']) for o in question['options'] if o['label'] in labels)
+    return tuple(texts) if texts else question['correctAnswer']
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def signature(text, num_perm=NUM_PERM, size=SHINGLE_SIZE):
+    """文本的单次排列 MinHash 签名，没有任何 shingle 落入的桶保持为 EMPTY
+
+    shingle 不先做成集合：文本整体编码成 UTF-32（每个字符 4 字节），第 i 个 shingle 就是
+    data[4i:4i+4*size] 这段字节，直接交给 crc32，不必为每个 shingle 切字符串、再编码一次；
+    重复的 shingle 哈希值相同，取最小值时自然去重。
+    crc32 在 C 里算完，比 hashlib 快得多，32 位对 shingle 分桶已经足够。
+    """
+    sig = [EMPTY] * num_perm
+    if not text:
+        return sig
+    data = text.encode('utf-32-le')
+    width = 4 * size
+    crc32 = zlib.crc32
+    # 不超过 size 个字符的文本整体作为一个 shingle（与 shingles() 相同）
+    count = max(len(text) - size, 0) + 1
+    for i in range(0, 4 * count, 4):
+        h = crc32(data[i:i + width])
+        bucket = h % num_perm
+        value = h // num_perm
+        if value < sig[bucket]:
+            sig[bucket] = value
+    return sig
+
+
+def band_hashes(parts_chunk, num_perm=NUM_PERM, bands=BANDS):
+    """进程池任务：一批题目 -> [(比较文本, 每段签名的哈希值), ...]
+
+    全部为空桶的段哈希值等于 empty_band_hash(rows)，由调用方跳过（空文本的各段都是这个值）。
+    """
+    rows = num_perm // bands
+    result = []
+    for parts in parts_chunk:
+        text = key_text(parts)
+        result.append((text, tuple(map(hash, zip(*[iter(signature(text, num_perm))] * rows)))))
+    return result
+
+
+def empty_band_hash(rows):
+    return hash((EMPTY,) * rows)
+
+
+class UnionFind:
+    def __init__(self, n):
+        self.parent = list(range(n))
+
+    def find(self, x):
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            # 以较小的下标为根，簇的代表题目是最先出现的那道
+            if rb < ra:
+                ra, rb = rb, ra
+            self.parent[rb] = ra
+
+
+def iter_questions(exam_group):
+    """产出 (试卷下标, 题目下标, 题目)"""
+    for ei, exam in enumerate(exam_group):
+        for qi, question in enumerate(exam['questions']):
+            yield ei, qi, question
+
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    # 并集的大小由交集算出，不必再建一个集合
+    common = len(a & b)
+    return common / (len(a) + len(b) - common)
+
+
+def find_duplicates(items, threshold=THRESHOLD, num_perm=NUM_PERM, bands=BANDS, workers=None):
+    """items 为题目列表，返回 (簇列表, 统计信息)
+
+    每个簇是 [(下标, 与代表题目的相似度), ...]，第一个为代表题目（最先出现的那道）。
+    workers 为签名阶段的进程数，默认等于 CPU 核数；题目不多时直接在当前进程计算。
+    """
+    if num_perm % bands:
+        raise ValueError('num_perm 必须是 bands 的整数倍')
+    workers = workers or os.cpu_count() or 1
+    parts = [question_key_parts(q) for q in items]
+    chunks = [parts[i:i + CHUNK_SIZE] for i in range(0, len(parts), CHUNK_SIZE)]
+    texts = []
+    rows = []
+    empty = empty_band_hash(num_perm // bands)
+
+    def fill(results):
+        for chunk in results:
+            for text, hashes in chunk:
+                texts.append(text)
+                rows.append(hashes)
+
+    if workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            fill(executor.map(band_hashes, chunks, repeat(num_perm), repeat(bands)))
+    else:
+        fill(map(band_hashes, chunks, repeat(num_perm), repeat(bands)))
+
+    # 按段分桶：先用 Counter（C 实现）找出出现不止一次的哈希值，只有这些题目才逐个放进桶里
+    pairs = []
+    for column in zip(*rows):
+        repeated = {h for h, count in Counter(column).items() if count > 1}
+        repeated.discard(empty)
+        if not repeated:
+            continue
+        band = defaultdict(list)
+        for i in [i for i, h in enumerate(column) if h in repeated]:
+            band[column[i]].append(i)
+        for members in band.values():
+            if len(members) <= MAX_PAIRWISE_BUCKET:
+                pairs.extend(combinations(members, 2))
+            else:
+                # 链式相似由并查集传递
+                pairs.extend(zip(repeat(members[0]), members[1:]))
+
+    # 只在一段上碰撞的几乎都是假阳性（两道题恰好共用一个常见的 shingle），至少两段相同才复核；
+    # 非空段不超过 MIN_SHARED_BANDS 的短题目一段相同就复核
+    filled = [bands - hashes.count(empty) for hashes in rows]
+    candidates = [pair for pair, count in Counter(pairs).items()
+                  if count >= MIN_SHARED_BANDS
+                  or filled[pair[0]] <= MIN_SHARED_BANDS or filled[pair[1]] <= MIN_SHARED_BANDS]
+    del pairs, rows
+
+    # 只有进入候选对的题目才需要 shingle 集合
+    shingle_sets = {}
+
+    def shingle_set_of(i):
+        result = shingle_sets.get(i)
+        if result is None:
+            result = shingle_sets[i] = shingles(texts[i])
+        return result
+
+    uf = UnionFind(len(items))
+    confirmed = 0
+    for a, b in sorted(candidates):
+        if uf.find(a) == uf.find(b):
+            continue
+        if jaccard(shingle_set_of(a), shingle_set_of(b)) >= threshold:
+            uf.union(a, b)
+            confirmed += 1
+
+    groups = defaultdict(list)
+    for i in range(len(items)):
+        root = uf.find(i)
+        if root != i:
+            groups[root].append(i)
+    clusters = []
+    for root, members in sorted(groups.items()):
+        cluster = [(root, 1.0)] + [(m, jaccard(shingle_set_of(root), shingle_set_of(m))) for m in members]
+        clusters.append(cluster)
+    stats = {'questions': len(items), 'candidates': len(candidates), 'confirmed': confirmed,
+             'clusters': len(clusters), 'duplicates': sum(len(c) - 1 for c in clusters)}
+    return clusters, stats
+
+
+def dedup_report(exam_group, threshold=THRESHOLD, workers=None):
+    """对整个试卷组做近似重复检测，返回可直接写成 JSON 的报告"""
+    start = time.perf_counter()
+    located = list(iter_questions(exam_group))
+    clusters, stats = find_duplicates([q for _, _, q in located], threshold, workers=workers)
+    report_clusters = []
+    for cluster in clusters:
+        members = []
+        for index, similarity in cluster:
+            ei, qi, question = located[index]
+            members.append({
+                "exam": exam_group[ei]['title'],
+                "examIndex": ei,
+                "questionIndex": qi,
+                "questionId": question['id'],
+                "similarity": round(similarity, 3),
+                "correctAnswer": question['correctAnswer'],
+                "answerKey": answer_key(question),
+                "preview": normalize_text(question['content'])[:40]
+            })
+        answers = {m.pop('answerKey') for m in members}
+        report_clusters.append({"size": len(members), "answerConflict": len(answers) > 1, "members": members})
+    stats['threshold'] = threshold
+    stats['elapsed'] = round(time.perf_counter() - start, 3)
+    return {"stats": stats, "clusters": report_clusters}
+
+
+def merge_duplicates(exam_group, report):
+    """只保留每个簇的代表题目，其余重复题从所在试卷中删除，题目 id 重新编号；返回删除的题数
+
+    答案不一致的簇里只删除与代表题目答案相同的成员，答案不同的题目原样保留，留给人工核对。
+    """
+    def key_of(member):
+        return answer_key(exam_group[member['examIndex']]['questions'][member['questionIndex']])
+
+    drop = defaultdict(set)
+    for cluster in report['clusters']:
+        head, *rest = cluster['members']
+        if cluster['answerConflict']:
+            head_key = key_of(head)
+            rest = [m for m in rest if key_of(m) == head_key]
+        for member in rest:
+            drop[member['examIndex']].add(member['questionIndex'])
+    removed = 0
+    for ei, indexes in drop.items():
+        exam = exam_group[ei]
+        kept = [q for qi, q in enumerate(exam['questions']) if qi not in indexes]
+        removed += len(exam['questions']) - len(kept)
+        exam['questions'] = [q.replace(id=i) for i, q in enumerate(kept)]
+    return removed
+
+
+def print_dedup_report(report, limit=10):
+    stats = report['stats']
+    print(f"\n=== 近似重复检测（阈值 {stats['threshold']}）===")
+    print(f"题目 {stats['questions']} 道，候选对 {stats['candidates']}，确认 {stats['confirmed']}，"
+          f"重复簇 {stats['clusters']} 个，可去除 {stats['duplicates']} 道，耗时 {stats['elapsed']:.3f}s")
+    for cluster in report['clusters'][:limit]:
+        head = cluster['members'][0]
+        flag = '，答案不一致' if cluster['answerConflict'] else ''
+        print(f"  [{cluster['size']}道{flag}] {head['preview']}")
+        for m in cluster['members']:
+            print(f"      {m['exam']} 第{m['questionIndex'] + 1}题  相似度 {m['similarity']:.2f}  答案 {m['correctAnswer']}")
+    if len(report['clusters']) > limit:
+        print(f"  ……其余 {len(report['clusters']) - limit} 个簇见报告文件")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='试卷组近似重复题目检测')
+    parser.add_argument('input', help='试卷组 JSON 文件')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD, help='Jaccard 相似度阈值')
+    parser.add_argument('--report', default=None, help='报告文件，默认为 <输入>.dedup.json')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='进程数，默认等于 CPU 核数')
+    parser.add_argument('--merge', default=None, help='去重后的试卷组输出文件（每簇只保留第一道）')
+    args = parser.parse_args()
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        exam_group = load_exam_group(json.load(f))
+
+    report = dedup_report(exam_group, args.threshold, args.workers)
+    print_dedup_report(report)
+    report_path = args.report or re.sub(r'(\.json)?$', '.dedup.json', args.input, count=1)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"报告文件：{report_path}")
+
+    if args.merge:
+        removed = merge_duplicates(exam_group, report)
+        write_exam_group(exam_group, args.merge)
+        print(f"去重后的试卷组：{args.merge}，删除 {removed} 道重复题")
+
+
+if __name__ == '__main__':
+    main()
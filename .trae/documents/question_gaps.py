@@ -0,0 +1,252 @@
+import argparse
+import json
+import sys
+
+from question_tokenizer import ANSWER, NUMBER, SECTION, tokenize_file
+
+# 题号连续性检查（取代原来的 check_missing_questions.py / check_missing_questions_v2.py）
+# 原来的脚本只看判断题、写死了 “第12题到第23题之间” 和 range(1, 36)。
+# 这里在分词的同一遍里记录每个大题的所有题号标记，读完后一次算出：
+#   missing      缺失的题号（连续缺失合并成一段），附上前后两个题号标记的位置，
+#                缺失的题就在这两个偏移之间（解析器在这里丢了同步）
+#   duplicates   重复出现的题号及每次出现的位置
+#   outOfOrder   比前一个题号小的题号（倒序）
+#   outliers     比已出现的最大题号大出 OUTLIER_JUMP 以上、之后题号又回落的标记（或大题最后一个这样的标记），
+#                通常是正文里的 (2024) 之类被当成了题号；不计入缺失和应有题数
+#   unanswered   到下一个题号（或大题结束）之前都没有答案行的题
+#   extraAnswers 同一题号后出现了第二个答案行，通常是漏掉了题号的题
+# 所有位置都是 (字符偏移, 行号)，与 question_tokenizer 的 Token 相同。
+# 只保存题号和位置，不保存文本，几千道题的文档也只走一遍。
+#   python question_gaps.py temp.txt
+#   python question_gaps.py temp.txt --expect 判断=35 --context 80 -o gaps.json
+
+REPORT_VERSION = 1
+ISSUE_KEYS = ('missing', 'duplicates', 'outOfOrder', 'outliers', 'unanswered', 'extraAnswers')
+# 题号一次跳过这么多以上、后面又回落，就当作误认的题号
+OUTLIER_JUMP = 20
+
+
+def _pos(tok, num=None):
+    pos = {"offset": tok.offset, "line": tok.line}
+    if num is not None:
+        pos = {"num": num, **pos}
+    return pos
+
+
+class SequenceAnalyzer:
+    """观察 token 流并记录题号；watch() 原样转发 token，可以直接串在解析器前面
+
+        analyzer = SequenceAnalyzer()
+        sections = parse_tokens(analyzer.watch(tokenize_lines(lines)))
+        report = analyzer.report()
+    """
+
+    def __init__(self, expect=None, offset_map=None):
+        # expect: {大题名称前缀: 题数}，用来发现末尾缺失的题
+        self.expect = expect or {}
+        # token 来自规范化后的文本时（text_normalize），报告中的偏移换算回原文
+        self.offset_map = offset_map
+        self.sections = []
+        self._section = None
+        self._last = None       # 最近一个题号 token
+        self._answered = True   # 最近一个题号之后是否已经出现答案
+
+    def _open(self, title, tok):
+        self._close()
+        self._section = {"title": title, "offset": tok.offset if tok else 0, "line": tok.line if tok else 0,
+                         "marks": [], "unanswered": [], "extraAnswers": []}
+        self.sections.append(self._section)
+
+    def _close(self):
+        if self._last is not None and not self._answered:
+            self._section['unanswered'].append(_pos(self._last, self._last.value))
+        self._last = None
+        self._answered = True
+
+    def feed(self, tok):
+        if self.offset_map is not None:
+            tok = tok._replace(offset=self.offset_map.to_original(tok.offset))
+        kind = tok.kind
+        if kind == SECTION:
+            self._open(tok.value, tok)
+        elif kind == NUMBER:
+            if self._section is None:
+                self._open('', None)
+            if self._last is not None and not self._answered:
+                self._section['unanswered'].append(_pos(self._last, self._last.value))
+            self._section['marks'].append((tok.value, tok.offset, tok.line))
+            self._last = tok
+            self._answered = False
+        elif kind == ANSWER and self._section is not None:
+            if self._answered:
+                after = self._last.value if self._last is not None else None
+                self._section['extraAnswers'].append(_pos(tok, after))
+            self._answered = True
+
+    def watch(self, tokens):
+        for tok in tokens:
+            self.feed(tok)
+            yield tok
+
+    def expected_count(self, title):
+        for prefix, count in self.expect.items():
+            if title.startswith(prefix):
+                return count
+        return None
+
+    def report(self):
+        self._close()
+        sections = [analyze_section(s, self.expected_count(s['title'])) for s in self.sections]
+        issues = sum(s['issueCount'] for s in sections)
+        return {"version": REPORT_VERSION, "ok": issues == 0, "issueCount": issues, "sections": sections}
+
+
+def _missing_runs(seen, total):
+    """1..total 中没出现的题号，连续的合并成 (起, 止)
+
+    只看出现过的题号之间的空档，不逐个走 1..total：混进一个 (20230615) 这样的数也只多一段。
+    """
+    runs = []
+    prev = 0
+    for num in sorted(n for n in seen if 0 < n <= total):
+        if num > prev + 1:
+            runs.append([prev + 1, num - 1])
+        prev = num
+    if total > prev:
+        runs.append([prev + 1, total])
+    return runs
+
+
+def analyze_section(section, expected=None):
+    """根据一个大题的题号标记 [(题号, 偏移, 行号), ...] 计算缺失、重复、倒序和异常题号"""
+    marks = section['marks']
+    # later[i]：第 i 个标记之后最小的题号，用来判断大跳之后题号有没有回落
+    later = [None] * len(marks)
+    low = None
+    for i in range(len(marks) - 1, -1, -1):
+        later[i] = low
+        low = marks[i][0] if low is None else min(low, marks[i][0])
+    seen = {}
+    out_of_order = []
+    outliers = []
+    highest = 0
+    for i, (num, offset, line) in enumerate(marks):
+        if num > highest + OUTLIER_JUMP:
+            # 之后的题号回落到跳跃之前，或者大题在这里结束（前面已经有题号）
+            falls_back = later[i] < num - OUTLIER_JUMP if later[i] is not None else highest > 0
+            if falls_back:
+                outliers.append({"num": num, "prev": highest, "offset": offset, "line": line})
+                continue
+        occurrences = seen.setdefault(num, [])
+        if not occurrences and num < highest:
+            out_of_order.append({"num": num, "prev": highest, "offset": offset, "line": line})
+        occurrences.append({"offset": offset, "line": line})
+        highest = max(highest, num)
+
+    total = max(expected or 0, highest)
+    missing = []
+    for low, high in _missing_runs(seen, total):
+        # 缺失段两侧的题号都出现过（段是极大的），缺的题就在它们第一次出现的位置之间
+        after, before = seen.get(low - 1), seen.get(high + 1)
+        missing.append({
+            "from": low, "to": high, "count": high - low + 1,
+            "after": {"num": low - 1, **after[0]} if after else None,
+            "before": {"num": high + 1, **before[0]} if before else None
+        })
+
+    result = {
+        "title": section['title'],
+        "offset": section['offset'],
+        "line": section['line'],
+        "markCount": len(marks),
+        "first": next(iter(seen), None),
+        "last": highest or None,
+        "expected": total,
+        "missing": missing,
+        "duplicates": [{"num": num, "occurrences": occ} for num, occ in sorted(seen.items()) if len(occ) > 1],
+        "outOfOrder": out_of_order,
+        "outliers": outliers,
+        "unanswered": section['unanswered'],
+        "extraAnswers": section['extraAnswers'],
+    }
+    result['issueCount'] = sum(len(result[key]) for key in ISSUE_KEYS)
+    return result
+
+
+def analyze_tokens(tokens, expect=None, offset_map=None):
+    analyzer = SequenceAnalyzer(expect, offset_map)
+    for tok in tokens:
+        analyzer.feed(tok)
+    return analyzer.report()
+
+
+def analyze_file(path, expect=None):
+    return analyze_tokens(tokenize_file(path), expect)
+
+
+def parse_expect(items):
+    expect = {}
+    for item in items or ():
+        name, _, count = item.partition('=')
+        expect[name] = int(count)
+    return expect
+
+
+def _context(text, offset, width):
+    return text[max(0, offset - width):offset + width].replace('\n', '⏎')
+
+
+def print_gap_report(report, text=None, width=0, file=sys.stdout):
+    """打印报告；给出原文和 width 时附上每个位置前后 width 个字符"""
+    def where(pos):
+        s = f"第{pos['line']}行（偏移{pos['offset']}）"
+        if text is not None and width:
+            s += f"  …{_context(text, pos['offset'], width)}…"
+        return s
+
+    for section in report['sections']:
+        mark = '✓' if not section['issueCount'] else '✗'
+        print(f"{mark} {section['title'] or '（大题之前）'}：{section['markCount']} 个题号，"
+              f"第 {section['first']} - {section['last']} 题，应有 {section['expected']} 题", file=file)
+        for gap in section['missing']:
+            nums = f"{gap['from']}" if gap['from'] == gap['to'] else f"{gap['from']}-{gap['to']}"
+            after = f"第{gap['after']['num']}题 {where(gap['after'])}" if gap['after'] else '大题开头'
+            before = f"第{gap['before']['num']}题 {where(gap['before'])}" if gap['before'] else '大题结尾'
+            print(f"  缺失 {nums}：在 {after} 与 {before} 之间", file=file)
+        for dup in section['duplicates']:
+            places = '、'.join(where(o) for o in dup['occurrences'])
+            print(f"  重复 {dup['num']}：{places}", file=file)
+        for item in section['outOfOrder']:
+            print(f"  倒序 {item['num']}（前一题为 {item['prev']}）：{where(item)}", file=file)
+        for item in section['outliers']:
+            print(f"  异常题号 {item['num']}（前一题为 {item['prev']}，可能不是题号）：{where(item)}", file=file)
+        for item in section['unanswered']:
+            print(f"  第{item['num']}题没有答案：{where(item)}", file=file)
+        for item in section['extraAnswers']:
+            print(f"  多余的答案行（第{item['num']}题之后，可能漏了题号）：{where(item)}", file=file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='检查题号的缺失、重复和倒序')
+    parser.add_argument('input', help='提取出的题库文本（如 temp.txt）')
+    parser.add_argument('--expect', action='append', metavar='大题=题数',
+                        help='某个大题应有的题数（按名称前缀匹配），可重复，如 --expect 判断=35')
+    parser.add_argument('--context', type=int, default=0, help='打印每个位置前后若干个字符')
+    parser.add_argument('-o', '--output', default=None, help='JSON 报告文件')
+    args = parser.parse_args()
+
+    report = analyze_file(args.input, parse_expect(args.expect))
+    text = None
+    if args.context:
+        with open(args.input, 'r', encoding='utf-8') as f:
+            text = f.read()
+    print_gap_report(report, text, args.context)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n{'✓ 题号完整' if report['ok'] else '✗ 发现 ' + str(report['issueCount']) + ' 处问题'}")
+    sys.exit(0 if report['ok'] else 1)
+
+
+if __name__ == '__main__':
+    main()
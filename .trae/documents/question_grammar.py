@@ -0,0 +1,54 @@
+import re
+
+# 题目文法：所有正则集中在这里预编译一次，各脚本直接引用编译好的对象，
+# 不再在循环里拼 f-string 模式或每次调用都重新查找/编译。
+# 同一用途的多个写法放在 *_VARIANTS 里，由 bench_grammar.py 在真实和恶意输入上计时比较。
+
+# ---- 分词器使用的行级模式（全部锚定在行首） ----
+
+# 大题标题：第一题：判断对错
+SECTION_RE = re.compile(r'第([一二三四五六七八九十百]+)题[：:]\s*(.*)')
+# 题号：(1) 或 （1），题号后可以没有空格
+NUMBER_RE = re.compile(r'[\(（]\s*(\d+)\s*[\)）]\s*')
+# 选择题答案行：A / A,B / ABC
+CHOICE_ANSWER_RE = re.compile(r'[A-H](?:\s*[,，、]?\s*[A-H])*')
+# 选项标记：行首或空白之后的字母，后面跟 . ． 、 中的一个
+OPTION_MARK_VARIANTS = {
+    # 用后顾断言检查前面是空白：模式不以字符集开头，引擎只能逐个位置尝试
+    'lookbehind': re.compile(r'(?:^|(?<=\s))([A-H])\s*[\.．、]'),
+    # 以字符集开头，引擎可以快速跳过不含 A-H 的位置；前面是否为空白由调用方检查
+    'charset_prefix': re.compile(r'([A-H])\s*[\.．、]'),
+}
+OPTION_MARK_RE = OPTION_MARK_VARIANTS['charset_prefix']
+
+# ---- 整段文本上使用的模式 ----
+
+# 判断题大题
+JUDGE_SECTION_RE = re.compile(r'第一题：判断对错(.*?)第二题：选择题', re.DOTALL)
+# 文本中任意位置的题号
+NUMBER_MARK_RE = re.compile(r'[\(（](\d+)[\)）]')
+
+# 判断题 “题号 + 题干 + 答案行” 的各种写法
+JUDGE_ITEM_VARIANTS = {
+    # 原有写法：非贪婪 DOTALL。缺答案时会一直扫到文本末尾，最坏 O(n²)；题号后必须有空白
+    'nongreedy_dotall': re.compile(r'[\(（](\d+)[\)）]\s+(.*?)\n([√×])', re.DOTALL),
+    'nongreedy_plus': re.compile(r'[\(（](\d+)[\)）]\s+(.+?)\n([√×])', re.DOTALL),
+    # debug_regex.py 中的限长写法：回溯有上界，但超过 200 字的题干会漏掉
+    'bounded_200': re.compile(r'[\(（](\d+)[\)）]\s+(.{0,200}?)\n([√×])', re.DOTALL),
+    # 按行前进：题干只能跨越不以题号/答案开头的行，缺答案时最多回溯到下一个题号，整体线性
+    'tempered_lines': re.compile(
+        r'^[\(（](\d+)[\)）][ \t]*(.*(?:\n(?![\(（]\d+[\)）]|[√×][ \t]*$).*)*)\n([√×])[ \t]*$',
+        re.MULTILINE
+    ),
+}
+
+# 由 bench_grammar.py 的测量结果选定：唯一在所有输入上都正确且不退化的写法
+JUDGE_ITEM_RE = JUDGE_ITEM_VARIANTS['tempered_lines']
+
+# 原 parse_new_format.py 中逐个选项搜索的链式写法（每题 4 次 DOTALL 搜索），仅用于基准对比
+OPTION_CHAIN_LEGACY = [
+    re.compile(r'A\.?\s+(.*?)\nB\.?\s+', re.DOTALL),
+    re.compile(r'B\.?\s+(.*?)\nC\.?\s+', re.DOTALL),
+    re.compile(r'C\.?\s+(.*?)\nD\.?\s+', re.DOTALL),
+    re.compile(r'D\.?\s+(.*?)\n[ABCD]\n', re.DOTALL),
+]
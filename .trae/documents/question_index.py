@@ -0,0 +1,374 @@
+import argparse
+import glob
+import hashlib
+import html
+import json
+import math
+import os
+import re
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from question_dedup import IMG_RE, TAG_RE, _img_text
+from question_model import QuestionEncoder, load_exam_group
+
+# 题目全文索引
+# 把题干、选项和解析切成词元建立倒排索引，保存在试卷组旁边的 <试卷组>.index/ 目录中：
+#   - 中文按相邻两字切分（bigram），英文/数字按整词切分，都转成小写：
+#       “候选码是BETWEEN” -> 候选 选码 码是 between
+#   - 每份试卷一个索引段文件，文件名取试卷内容的哈希；重建时内容没变的试卷直接复用旧文件，
+#     改动一份试卷只重新切分、写出这一份，再重写很小的 manifest.json
+#   - 倒排表只记录 (题目下标, 出现次数)，不记录位置；短语查询先用倒排表求交集，
+#     再在候选题目的规范化文本中确认短语连续出现
+#   - 查询逐段进行：某个词元不在段的词典里，整段直接跳过；结果按 BM25 排序
+# 查询语法：
+#   候选码 3NF         同时包含（AND），连续的中文自动按短语匹配
+#   BETWEEN OR LIKE    任意一个
+#   范式 -3NF          排除
+#   "group by"         英文短语
+#   python question_index.py build 数据库原理试卷组_final.json
+#   python question_index.py search 数据库原理试卷组_final.index "候选码 OR 3NF"
+
+INDEX_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+# BM25 参数
+K1 = 1.2
+B = 0.75
+
+TOKEN_RE = re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+|[a-z0-9]+')
+QUERY_RE = re.compile(r'(-?)"([^"]*)"|(\S+)')
+# 规范化文本中各部分（题干、选项、解析）之间的分隔，短语不会跨部分匹配
+PART_SEP = ' | '
+
+
+def index_text(text):
+    """去掉 HTML 并规范化（全角转半角、转小写）"""
+    text = html.unescape(TAG_RE.sub(' ', IMG_RE.sub(_img_text, text or '')))
+    return unicodedata.normalize('NFKC', text).lower()
+
+
+def text_runs(text):
+    """连续的中文或连续的英文数字，标点和空白都是分隔"""
+    return TOKEN_RE.findall(index_text(text))
+
+
+def runs_tokens(runs):
+    tokens = []
+    for run in runs:
+        if len(run) < 2 or run.isascii():
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def tokenize(text):
+    return runs_tokens(text_runs(text))
+
+
+def question_text(question):
+    """题干、选项、解析的规范化文本：每段内的词之间一个空格，段之间用 PART_SEP 分隔"""
+    parts = [question['content']] + [o['html'] for o in question['options']] + [question['explanation']]
+    return PART_SEP.join(' '.join(text_runs(part)) for part in parts)
+
+
+def exam_hash(exam):
+    data = json.dumps([exam['title'], exam['questions']], ensure_ascii=False,
+                      separators=(',', ':'), cls=QuestionEncoder)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def build_segment(exam):
+    """为一份试卷建立索引段：{"title", "texts", "lens", "postings": {词元: [题目下标, 次数, ...]}}"""
+    texts = []
+    lens = []
+    postings = defaultdict(list)
+    for qi, question in enumerate(exam['questions']):
+        text = question_text(question)
+        tokens = runs_tokens(run for run in text.split() if run != '|')
+        texts.append(text)
+        lens.append(len(tokens))
+        for token, tf in Counter(tokens).items():
+            postings[token] += (qi, tf)
+    return {"title": exam['title'], "texts": texts, "lens": lens, "postings": dict(postings)}
+
+
+def segment_file(digest):
+    return f'seg_{digest[:24]}.json'
+
+
+def write_json(path, data):
+    """紧凑格式，先写临时文件再替换"""
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp, path)
+
+
+class QuestionIndex:
+    """按试卷分段的倒排索引，保存在一个目录中"""
+
+    def __init__(self, path):
+        self.path = path
+        self.order = []        # 试卷 id 顺序
+        self.exams = {}        # 试卷 id -> {"hash", "file"}
+        self._segments = {}    # 段文件名 -> 已加载的索引段
+        manifest = os.path.join(path, MANIFEST_NAME)
+        if os.path.exists(manifest):
+            with open(manifest, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            # 格式变了就整体重建
+            if data.get('version') == INDEX_VERSION:
+                self.order = data['order']
+                self.exams = data['exams']
+
+    # ---- 建立与增量更新 ----
+
+    def update(self, exam_group, workers=None):
+        """按试卷组更新索引，内容没变的试卷复用原来的段文件；返回重新切分的试卷数
+
+        需要重新切分的试卷较多时分发到进程池。
+        """
+        os.makedirs(self.path, exist_ok=True)
+        exams = {}
+        todo = {}
+        for exam in exam_group:
+            digest = exam_hash(exam)
+            name = segment_file(digest)
+            if name not in todo and not os.path.exists(os.path.join(self.path, name)):
+                todo[name] = exam
+            exams[exam['id']] = {"hash": digest, "file": name}
+
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(todo) < workers * 2:
+            segments = map(build_segment, todo.values())
+            self._write_segments(todo, segments)
+        else:
+            chunksize = max(1, len(todo) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                self._write_segments(todo, executor.map(build_segment, todo.values(), chunksize=chunksize))
+        self.exams = exams
+        self.order = [exam['id'] for exam in exam_group]
+        write_json(os.path.join(self.path, MANIFEST_NAME),
+                   {"version": INDEX_VERSION, "order": self.order, "exams": self.exams})
+
+        keep = {entry['file'] for entry in exams.values()}
+        for path in glob.glob(os.path.join(self.path, 'seg_*.json')):
+            name = os.path.basename(path)
+            if name not in keep:
+                os.remove(path)
+                self._segments.pop(name, None)
+        return len(todo)
+
+    def _write_segments(self, todo, segments):
+        for name, segment in zip(todo, segments):
+            write_json(os.path.join(self.path, name), segment)
+            self._segments[name] = segment
+
+    def segment(self, exam_id):
+        name = self.exams[exam_id]['file']
+        segment = self._segments.get(name)
+        if segment is None:
+            with open(os.path.join(self.path, name), 'r', encoding='utf-8') as f:
+                segment = self._segments[name] = json.load(f)
+        return segment
+
+    def load_all(self):
+        """预先加载全部索引段（否则第一次查询时加载）"""
+        for exam_id in self.order:
+            self.segment(exam_id)
+        return self
+
+    # ---- 查询 ----
+
+    @staticmethod
+    def _clause(words):
+        """把一个子句（一个词或引号中的短语）转成 (词元列表, 确认短语用的正则或 None)"""
+        runs = text_runs(' '.join(words))
+        tokens = runs_tokens(runs)
+        if len(tokens) <= 1:
+            return tokens, None
+        phrase = ' '.join(runs)
+        # 英文单词两端必须是词边界，“group by” 不能匹配 “subgroup bye”
+        head = r'(?<![a-z0-9])' if phrase[0].isascii() else ''
+        tail = r'(?![a-z0-9])' if phrase[-1].isascii() else ''
+        return tokens, re.compile(head + re.escape(phrase) + tail)
+
+    @staticmethod
+    def _match_segment(segment, tokens, phrase):
+        """在一个段中匹配子句，返回 {题目下标: 出现次数}"""
+        if len(tokens) == 1 and len(tokens[0]) == 1 and not tokens[0].isascii():
+            # 单个汉字：索引中只有两字词元，直接在文本中查找
+            char = tokens[0]
+            return {qi: text.count(char) for qi, text in enumerate(segment['texts']) if char in text}
+        postings = segment['postings']
+        lists = []
+        for token in tokens:
+            plist = postings.get(token)
+            if plist is None:
+                return {}
+            lists.append(plist)
+        if phrase is None:
+            plist = lists[0]
+            return dict(zip(plist[::2], plist[1::2]))
+        # 从最短的倒排表开始求交集，再在文本中确认短语连续出现
+        lists.sort(key=len)
+        common = set(lists[0][::2])
+        for plist in lists[1:]:
+            common.intersection_update(plist[::2])
+            if not common:
+                return {}
+        texts = segment['texts']
+        hits = {}
+        for qi in common:
+            count = len(phrase.findall(texts[qi]))
+            if count:
+                hits[qi] = count
+        return hits
+
+    def _parse_query(self, query):
+        """返回 (AND 的各组子句，每组内为 OR, 排除的子句)"""
+        groups = []
+        excluded = []
+        pending_or = False
+        for m in QUERY_RE.finditer(query):
+            negate, phrase, word = m.group(1), m.group(2), m.group(3)
+            if word == 'OR':
+                pending_or = True
+                continue
+            if phrase is not None:
+                words = phrase.split()
+            else:
+                negate = '-' if word.startswith('-') and len(word) > 1 else ''
+                words = [word[1:] if negate else word]
+            clause = self._clause(words)
+            if not clause[0]:
+                continue
+            if negate:
+                excluded.append(clause)
+            elif pending_or and groups:
+                groups[-1].append(clause)
+            else:
+                groups.append([clause])
+            pending_or = False
+        return groups, excluded
+
+    def search(self, query, limit=20):
+        """执行查询，返回按得分排序的 [{examId, examTitle, questionIndex, score, preview}, ...]"""
+        groups, excluded = self._parse_query(query)
+        if not groups:
+            return []
+        clauses = [clause for group in groups for clause in group]
+
+        # 第一遍：逐段求出满足条件的题目，同时统计每个子句的文档频率
+        total_docs = 0
+        total_len = 0
+        df = [0] * len(clauses)
+        matches = []   # (试卷序号, 段, {题目下标: [每个子句的次数]})
+        for position, exam_id in enumerate(self.order):
+            segment = self.segment(exam_id)
+            total_docs += len(segment['lens'])
+            total_len += sum(segment['lens'])
+            hits = [self._match_segment(segment, *clause) for clause in clauses]
+            for c, h in enumerate(hits):
+                df[c] += len(h)
+            matched = None
+            c = 0
+            for group in groups:
+                union = set().union(*hits[c:c + len(group)])
+                c += len(group)
+                matched = union if matched is None else matched & union
+                if not matched:
+                    break
+            if not matched:
+                continue
+            for clause in excluded:
+                matched -= self._match_segment(segment, *clause).keys()
+            if matched:
+                matches.append((position, segment, {qi: [h.get(qi, 0) for h in hits] for qi in matched}))
+
+        # 第二遍：按 BM25 打分，同分时按试卷和题目顺序
+        avgdl = total_len / total_docs if total_docs else 0.0
+        idf = [math.log(1 + (total_docs - n + 0.5) / (n + 0.5)) for n in df]
+        scored = []
+        for position, segment, docs in matches:
+            lens = segment['lens']
+            for qi, tfs in docs.items():
+                norm = K1 * (1 - B + B * lens[qi] / avgdl) if avgdl else K1
+                score = sum(w * tf * (K1 + 1) / (tf + norm) for w, tf in zip(idf, tfs) if tf)
+                scored.append((-score, position, qi))
+        scored.sort()
+
+        results = []
+        for neg_score, position, qi in scored[:limit]:
+            exam_id = self.order[position]
+            segment = self.segment(exam_id)
+            results.append({"examId": exam_id, "examTitle": segment['title'], "questionIndex": qi,
+                            "score": round(-neg_score, 4),
+                            "preview": segment['texts'][qi].split(PART_SEP, 1)[0][:40]})
+        return results
+
+    def stats(self):
+        terms = set()
+        questions = 0
+        for exam_id in self.order:
+            segment = self.segment(exam_id)
+            terms.update(segment['postings'])
+            questions += len(segment['lens'])
+        return {'exams': len(self.order), 'questions': questions, 'terms': len(terms)}
+
+
+def index_path(group_path):
+    return re.sub(r'(\.json)?$', '.index', group_path, count=1)
+
+
+def build_index(exam_group, path, workers=None):
+    """在 path 目录中增量建立/更新索引，返回 (索引, 重新切分的试卷数)"""
+    index = QuestionIndex(path)
+    rebuilt = index.update(exam_group, workers)
+    return index, rebuilt
+
+
+def directory_size(path):
+    return sum(os.path.getsize(p) for p in glob.glob(os.path.join(path, '*.json')))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='题目全文索引')
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('build', help='为试卷组建立（或增量更新）索引')
+    build.add_argument('exam_group', help='试卷组 JSON 文件')
+    build.add_argument('-o', '--output', default=None, help='索引目录，默认为 <试卷组>.index')
+    build.add_argument('-j', '--workers', type=int, default=None, help='进程数，默认等于 CPU 核数')
+    search = sub.add_parser('search', help='查询')
+    search.add_argument('index', help='索引目录')
+    search.add_argument('query', help='查询语句，如 "候选码 OR 3NF"')
+    search.add_argument('-n', '--limit', type=int, default=20, help='最多返回的结果数')
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        with open(args.exam_group, 'r', encoding='utf-8') as f:
+            exam_group = load_exam_group(json.load(f))
+        output = args.output or index_path(args.exam_group)
+        start = time.perf_counter()
+        index, rebuilt = build_index(exam_group, output, args.workers)
+        elapsed = time.perf_counter() - start
+        stats = index.stats()
+        print(f"索引目录：{output}（{directory_size(output) / 1024:.1f}KB）")
+        print(f"试卷 {stats['exams']} 份（重新切分 {rebuilt} 份），题目 {stats['questions']} 道，"
+              f"词元 {stats['terms']} 个，耗时 {elapsed:.3f}s")
+        return
+
+    index = QuestionIndex(args.index).load_all()
+    start = time.perf_counter()
+    results = index.search(args.query, args.limit)
+    elapsed = time.perf_counter() - start
+    for r in results:
+        print(f"{r['score']:7.3f}  {r['examTitle']} 第{r['questionIndex'] + 1}题  {r['preview']}")
+    print(f"共 {len(results)} 条结果，查询耗时 {elapsed * 1000:.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
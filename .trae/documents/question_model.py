@@ -0,0 +1,181 @@
+import json
+import sys
+
+# 紧凑的题目内存表示
+# 题库很大时（去重、校验要同时持有十万道题），每道题一个嵌套字典的开销占了大头：
+#   - Question / Option 使用 __slots__，没有每个对象一份的 __dict__
+#   - 判断题的 正确(True)/错误(False) 选项整组共享，不再每题复制两个字典
+#   - meta 这种带题号的固定格式文本用 sys.intern 去重，不同试卷里的 “1、判断题（1分）…” 只存一份
+#   - 序列化时才按需转成字典（QuestionEncoder），不提前构造整棵字典树
+# Question 同时支持 question['correctAnswer'] 这种字典式访问，老脚本不用改。
+
+# JSON 字段名 -> 属性名
+FIELDS = (
+    ('id', 'id'),
+    ('type', 'type'),
+    ('content', 'content'),
+    ('options', 'options'),
+    ('correctAnswer', 'correct_answer'),
+    ('userAnswer', 'user_answer'),
+    ('explanation', 'explanation'),
+    ('meta', 'meta'),
+)
+_ATTRS = dict(FIELDS)
+
+
+class Option:
+    """一个选项；共享选项组里的对象不要原地修改"""
+    __slots__ = ('label', 'html')
+
+    def __init__(self, label, html):
+        self.label = label
+        self.html = html
+
+    def __getitem__(self, key):
+        if key == 'label':
+            return self.label
+        if key == 'html':
+            return self.html
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in ('label', 'html')
+
+    def __eq__(self, other):
+        if isinstance(other, Option):
+            return self.label == other.label and self.html == other.html
+        if isinstance(other, dict):
+            return other == self.to_dict()
+        return NotImplemented
+
+    def __repr__(self):
+        return f'Option({self.label!r}, {self.html!r})'
+
+    def to_dict(self):
+        return {"label": self.label, "html": self.html}
+
+
+# 共享选项组：(label, html) 元组 -> Option 元组
+_OPTION_SETS = {}
+
+
+def option_set(pairs, share=False):
+    """根据 [(label, html), ...] 构造选项元组
+
+    已登记的选项组（如判断题）直接返回共享对象；share=True 时把新组合也登记下来。
+    """
+    key = tuple(pairs)
+    shared = _OPTION_SETS.get(key)
+    if shared is not None:
+        return shared
+    options = tuple(Option(label, html) for label, html in key)
+    if share:
+        _OPTION_SETS[key] = options
+    return options
+
+
+JUDGE_OPTION_SET = option_set([("正确(True)", "正确(True)"), ("错误(False)", "错误(False)")], share=True)
+
+
+class Question:
+    """页面加载格式的一道题"""
+    __slots__ = tuple(attr for _, attr in FIELDS)
+
+    def __init__(self, id, type, content, options, correct_answer,
+                 user_answer='', explanation='', meta=''):
+        self.id = id
+        self.type = type
+        self.content = content
+        self.options = options
+        self.correct_answer = correct_answer
+        self.user_answer = user_answer
+        self.explanation = explanation
+        self.meta = sys.intern(meta) if meta else meta
+
+    # ---- 字典式访问，兼容原来直接操作字典的脚本 ----
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, _ATTRS[key])
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        try:
+            attr = _ATTRS[key]
+        except KeyError:
+            raise KeyError(key) from None
+        if attr == 'meta' and value:
+            value = sys.intern(value)
+        setattr(self, attr, value)
+
+    def __contains__(self, key):
+        return key in _ATTRS
+
+    def get(self, key, default=None):
+        attr = _ATTRS.get(key)
+        return default if attr is None else getattr(self, attr)
+
+    def keys(self):
+        return [key for key, _ in FIELDS]
+
+    def __eq__(self, other):
+        if isinstance(other, (Question, dict)):
+            return self.to_dict() == (other.to_dict() if isinstance(other, Question) else other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f'Question(id={self.id!r}, type={self.type!r}, correct_answer={self.correct_answer!r})'
+
+    def replace(self, **changes):
+        """返回修改了部分属性的副本（选项组仍然共享）"""
+        q = Question(self.id, self.type, self.content, self.options, self.correct_answer,
+                     self.user_answer, self.explanation, self.meta)
+        for attr, value in changes.items():
+            setattr(q, attr, value)
+        return q
+
+    def to_dict(self):
+        data = {
+            "id": self.id,
+            "type": self.type,
+            "content": self.content,
+            "options": [opt.to_dict() for opt in self.options],
+            "correctAnswer": self.correct_answer,
+            "userAnswer": self.user_answer,
+            "explanation": self.explanation,
+        }
+        # 部分导入的题目没有 meta 字段，原样保留
+        if self.meta is not None:
+            data["meta"] = self.meta
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        options = option_set((opt['label'], opt['html']) for opt in data.get('options', []))
+        return cls(data.get('id'), data.get('type', 'single'), data.get('content', ''), options,
+                   data.get('correctAnswer', ''), data.get('userAnswer', ''),
+                   data.get('explanation', ''), data.get('meta'))
+
+
+class QuestionEncoder(json.JSONEncoder):
+    """json.dump 时遇到 Question/Option 才转成字典，逐题序列化"""
+
+    def default(self, o):
+        if isinstance(o, (Question, Option)):
+            return o.to_dict()
+        return super().default(o)
+
+
+def load_exam_group(data):
+    """把 json.load 得到的试卷组中的题目转换成 Question（原地替换）"""
+    for exam in data:
+        exam['questions'] = [Question.from_dict(q) for q in exam['questions']]
+    return data
+
+
+def load_sections(data):
+    """把缓存中的解析结果（json 字典）转换回 Question"""
+    for section in data:
+        section['questions'] = [Question.from_dict(q) for q in section['questions']]
+    return data
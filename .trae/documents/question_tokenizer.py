@@ -0,0 +1,173 @@
+from collections import namedtuple
+
+from question_grammar import SECTION_RE, NUMBER_RE, CHOICE_ANSWER_RE, OPTION_MARK_RE
+
+# 单遍流式题目分词器
+# 逐行扫描 temp.txt，只走一遍文本，按行产出带类型的 token，
+# 所有解析脚本都基于这里的 token 流构建，不再对同一段文本反复 find / re.search。
+
+# token 类型
+SECTION = 'section'  # 大题标题，如 “第一题：判断对错”
+NUMBER = 'number'    # 题号行，(1) 或 （1） 两种括号形式
+OPTION = 'option'    # 选项，A. / A、 / A 、 等形式，一行可以包含多个选项
+ANSWER = 'answer'    # 答案行，√ / × / A-H
+TEXT = 'text'        # 其余内容（题干续行等）
+
+# kind: token 类型
+# value: SECTION 为大题名称，NUMBER 为题号(int)，OPTION 为选项字母，ANSWER 为规范化后的答案，TEXT 为 None
+# text: 去掉题号/选项标记后的文本
+# offset: token 在原文中的字符偏移
+# line: 所在行号（从 1 开始）
+Token = namedtuple('Token', ['kind', 'value', 'text', 'offset', 'line'])
+
+
+def normalize_answer(raw):
+    """把答案行规范化为页面使用的格式：√ / × 或逗号分隔的选项字母"""
+    raw = raw.strip()
+    if raw in ('√', '×'):
+        return raw
+    return ','.join(ch for ch in raw if 'A' <= ch <= 'H')
+
+
+def split_options(line, offset=0, first='A'):
+    """把一行拆成 (题干前缀, [(选项字母, 选项文本, 偏移), ...])
+
+    一行中所有选项标记只用一次 finditer 找出，选项文本取相邻两个标记之间的内容。
+    first 为第一个选项要求的字母（题号行内联选项必须从 A 开始，避免把题干里的 “B.” 误判为选项）；
+    为 None 时要求行首就是选项标记。之后的标记必须按字母顺序出现（OCR 偶尔把 C 识别成 B，允许重复字母）。
+    """
+    # 选项标记必须在行首或空白之后，例如 “达到3NF.” 里的 F 不算
+    marks = [m for m in OPTION_MARK_RE.finditer(line) if m.start() == 0 or line[m.start() - 1].isspace()]
+    if not marks:
+        return line, []
+
+    start = None
+    for i, m in enumerate(marks):
+        if (first is None and m.start() == 0) or m.group(1) == first:
+            start = i
+            break
+    if start is None:
+        return line, []
+
+    picked = [marks[start]]
+    for m in marks[start + 1:]:
+        if m.group(1) >= picked[-1].group(1):
+            picked.append(m)
+
+    prefix = line[:picked[0].start()]
+    options = []
+    for i, m in enumerate(picked):
+        end = picked[i + 1].start() if i + 1 < len(picked) else len(line)
+        options.append((m.group(1), line[m.end():end].strip(), offset + m.start()))
+    return prefix, options
+
+
+def tokenize_lines(lines):
+    """对逐行输入做分词，lines 可以是任何可迭代的行（文件对象、生成器等）
+
+    每行按首字符分派，至多做一次锚定匹配加一次选项扫描，整体是线性时间，内存只与当前行有关。
+    """
+    section_match = SECTION_RE.match
+    number_match = NUMBER_RE.match
+    choice_answer = CHOICE_ANSWER_RE.fullmatch
+    option_match = OPTION_MARK_RE.match
+
+    offset = 0
+    line_no = 0
+    for raw in lines:
+        line_no += 1
+        line_len = len(raw)
+        step = line_len if raw.endswith('\n') else line_len + 1
+        stripped = raw.strip()
+        if not stripped:
+            offset += step
+            continue
+
+        pos = offset + len(raw) - len(raw.lstrip())
+        offset += step
+        head = stripped[0]
+
+        if head in '√×':
+            if len(stripped) == 1:
+                yield Token(ANSWER, stripped, stripped, pos, line_no)
+                continue
+        elif head == '第':
+            m = section_match(stripped)
+            if m:
+                yield Token(SECTION, m.group(2).strip(), stripped, pos, line_no)
+                continue
+        elif head in '(（':
+            m = number_match(stripped)
+            if m:
+                end = m.end()
+                prefix, options = split_options(stripped[end:], pos + end)
+                yield Token(NUMBER, int(m.group(1)), prefix.strip(), pos, line_no)
+                for label, text, opt_pos in options:
+                    yield Token(OPTION, label, text, opt_pos, line_no)
+                continue
+        elif 'A' <= head <= 'H':
+            if choice_answer(stripped):
+                yield Token(ANSWER, normalize_answer(stripped), stripped, pos, line_no)
+                continue
+            if option_match(stripped):
+                _, options = split_options(stripped, pos, first=None)
+                for label, text, opt_pos in options:
+                    yield Token(OPTION, label, text, opt_pos, line_no)
+                continue
+
+        yield Token(TEXT, None, stripped, pos, line_no)
+
+
+def tokenize(text):
+    """对完整文本分词"""
+    return tokenize_lines(text.splitlines(keepends=True))
+
+
+def tokenize_file(path, encoding='utf-8'):
+    """直接从文件逐行分词，不把整个文件读进内存"""
+    with open(path, 'r', encoding=encoding) as f:
+        yield from tokenize_lines(f)
+
+
+def section_tokens(tokens, name):
+    """只取出某个大题（按名称前缀匹配，如 “判断”、“选择”）内的 token"""
+    inside = False
+    for tok in tokens:
+        if tok.kind == SECTION:
+            if inside:
+                return
+            inside = tok.value.startswith(name)
+            continue
+        if inside:
+            yield tok
+
+
+def iter_judge_items(tokens):
+    """把判断题 token 流组装成 (题号, 题干, 答案, 偏移)，题干续行用换行连接"""
+    num = None
+    parts = []
+    offset = 0
+    for tok in tokens:
+        if tok.kind == NUMBER:
+            num, parts, offset = tok.value, [tok.text] if tok.text else [], tok.offset
+        elif tok.kind == ANSWER and tok.value in ('√', '×'):
+            if num is not None:
+                yield num, '\n'.join(parts).strip(), tok.value, offset
+            num, parts = None, []
+        elif num is not None:
+            # 判断题里出现的选项样式文本仍然属于题干
+            if tok.kind == OPTION:
+                parts.append(f'{tok.value}. {tok.text}')
+            else:
+                parts.append(tok.text)
+
+
+if __name__ == '__main__':
+    import sys
+    from collections import Counter
+
+    path = sys.argv[1] if len(sys.argv) > 1 else 'temp.txt'
+    counts = Counter()
+    for tok in tokenize_file(path):
+        counts[tok.kind] += 1
+    print(f"分词完成：{dict(counts)}")
@@ -0,0 +1,109 @@
+import argparse
+import json
+import os
+import sys
+
+from exam_output import COMPRESSORS, write_exam_group
+from extract_word import iter_docx_lines
+from exam_validator import print_validation_report, validate_exam_group
+from explanation_store import ExplanationStore, key_cache_info
+from generate_explanations import attach_explanations
+from parse_engine import parse_tokens, sections_to_exams
+from pipeline_metrics import PipelineMetrics, add_metrics_arguments, finish_metrics, metrics_from_args
+from question_tokenizer import tokenize_lines
+from text_normalize import normalize_lines
+
+# 一步从 .docx/.txt 生成最终试卷组 JSON
+#   python -m quiz_pipeline 数据库原理作业选择.docx -o 数据库原理试卷组_final.json --title-prefix 数据库原理
+# 提取 -> 规范化 -> 解析 -> 组卷 -> 生成解析 -> 写出 全部在同一进程内完成，阶段之间直接传内存对象，
+# 不再写 temp.txt 再从固定的 Windows 路径读回来。
+
+
+def read_lines(path):
+    """读取源文件的全部文本行"""
+    if path.lower().endswith('.docx'):
+        return list(iter_docx_lines(path))
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read().splitlines()
+
+
+def load_answer_fixes(path):
+    """读取答案修正文件：{"题型": {"题号": "答案"}}，转成 parse_engine 使用的 {(题型, 题号): 答案}"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return {(kind, int(num)): answer for kind, fixes in data.items() for num, answer in fixes.items()}
+
+
+def run(source, output, title_prefix=None, explain=True, metrics=None, answer_fixes=None,
+        compact=False, compress=(), normalize=True, validate=False):
+    """执行完整流程，返回生成的试卷组；各阶段的耗时、吞吐和缓存命中记在 metrics 中"""
+    metrics = metrics or PipelineMetrics()
+    prefix = title_prefix if title_prefix is not None else os.path.splitext(os.path.basename(source))[0]
+
+    with metrics.stage('提取') as stage:
+        lines = read_lines(source)
+        stage.items = len(lines)
+    if normalize:
+        with metrics.stage('规范化', items=len(lines)):
+            lines = list(normalize_lines(lines))
+    with metrics.stage('解析') as stage:
+        sections = parse_tokens(tokenize_lines(lines), answer_fixes)
+        stage.items = sum(len(s['questions']) for s in sections)
+        metrics.count('parseErrors', sum(len(s['errors']) for s in sections))
+    with metrics.stage('组卷') as stage:
+        exam_group = sections_to_exams(prefix, sections)
+        stage.items = len(exam_group)
+    if explain:
+        store = ExplanationStore()
+        cache_before = key_cache_info()
+        with metrics.stage('解析说明') as stage:
+            stage.items = attach_explanations(exam_group, store, verbose=False)
+        stats = store.stats()
+        cache_after = key_cache_info()
+        metrics.cache('解析库', stats['hits'], stats['misses'])
+        metrics.cache('内容哈希', cache_after.hits - cache_before.hits, cache_after.misses - cache_before.misses)
+    if validate:
+        with metrics.stage('校验') as stage:
+            report = validate_exam_group(exam_group, workers=1)
+            stage.items = report['questionCount']
+            metrics.count('validationErrors', report['errorCount'])
+            metrics.count('validationWarnings', report['warningCount'])
+        print_validation_report(report, file=sys.stdout)
+    with metrics.stage('写出') as stage:
+        write_exam_group(exam_group, output, compact, compress)
+        stage.items = sum(len(exam['questions']) for exam in exam_group)
+
+    for section in sections:
+        print(f"{section['title']}：解析成功 {len(section['questions'])} 道题")
+        for num, line, _, reason in section['errors']:
+            print(f"  ✗ 第{num}题（第{line}行）：{reason}")
+    return exam_group
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m quiz_pipeline', description='从 .docx/.txt 直接生成试卷组 JSON')
+    parser.add_argument('source', help='.docx 或 .txt 题库')
+    parser.add_argument('-o', '--output', default=None, help='输出文件，默认与源文件同名的 .json')
+    parser.add_argument('--title-prefix', default=None, help='试卷标题前缀，默认使用源文件名')
+    parser.add_argument('--answer-fixes', default=None, help='答案修正 JSON，如 {"choice": {"1": "C"}}')
+    parser.add_argument('--no-explanations', action='store_true', help='跳过生成解析')
+    parser.add_argument('--no-normalize', action='store_true', help='跳过分词前的文本规范化（全角折叠、空白合并）')
+    parser.add_argument('--compact', action='store_true', help='输出紧凑 JSON，去掉缩进和排版空白')
+    parser.add_argument('--compress', choices=COMPRESSORS, nargs='*', default=[], help='额外生成的预压缩文件')
+    parser.add_argument('--validate', action='store_true', help='写出前校验试卷组')
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    output = args.output or os.path.splitext(args.source)[0] + '.json'
+    metrics = metrics_from_args(args)
+    fixes = load_answer_fixes(args.answer_fixes) if args.answer_fixes else None
+    exam_group = run(args.source, output, args.title_prefix, not args.no_explanations, metrics, fixes,
+                     args.compact, args.compress, not args.no_normalize, args.validate)
+
+    print(f"\n输出文件：{output}，包含试卷数量：{len(exam_group)}")
+    metrics.report()
+    finish_metrics(metrics, args)
+
+
+if __name__ == '__main__':
+    main()
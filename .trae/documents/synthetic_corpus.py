@@ -0,0 +1,274 @@
+import argparse
+import os
+import random
+import zipfile
+from xml.sax.saxutils import escape
+
+from bench_html_import import make_page
+from bench_index import make_exam_group
+from exam_output import write_exam_group
+
+# 合成题库生成器（固定随机种子，结果可复现），供 bench_suite.py 在 1千 ~ 100万 题规模上测量。
+# 文本题库（.txt / .docx）按 temp.txt 的版式生成 判断对错 / 选择题 / 简答题 三个大题，
+# 并按比例混入真实题库里见过的脏数据：
+#   题号 (1) （1） ( 1 ) (1)无空格 混用；OCR 断词（“不满 足”）和连续空格；全角选项字母 Ａ．；
+#   选项一行一个 / 一行两个 / 一行四个；题干折成两行；答案单独成行或写成 “答案：B”；
+#   漏掉题号（解析器按上一题加一补上）、缺答案（应报解析错误）、整道题缺失（题号跳号）。
+# .docx 把每行写成一个段落，段落随机切成多个 run，选项之间用 <w:tab/>，答案有时用 <w:br/> 挂在上一段。
+# 答题页面（.html）用 bench_html_import.make_page 生成，试卷组 JSON 用 bench_index.make_exam_group。
+#   python synthetic_corpus.py -n 10000 -o 合成题库
+#   python synthetic_corpus.py -n 1000000 --formats txt docx -o 合成题库
+
+FORMATS = ('txt', 'docx', 'html', 'json')
+
+WORDS = ['数据库', '关系模式', '候选码', '事务', '并发控制', '完整性约束', 'SQL语句', '外模式', '函数依赖',
+         '第三范式', '视图', '索引', '主码', '外码', '封锁协议', '数据字典', '存储过程', '触发器', '查询优化',
+         '恢复技术', '日志文件', 'E-R图', '概念模型', '逻辑结构', 'SELECT子句', 'GROUP BY', '元组', '属性']
+SECTIONS = (('第一题：判断对错', 'judge', 0.35), ('第二题：选择题', 'choice', 0.5), ('第三题：简答题', 'text', 1.0))
+NUMBER_FORMATS = ('({}) ', '（{}）', '( {} ) ', '({})')
+OPTION_SEPARATORS = ('. ', '、', ' 、 ', '．')
+LETTERS = 'ABCD'
+FULLWIDTH = str.maketrans('ABCD.', 'ＡＢＣＤ．')
+
+# 各种脏数据出现的比例（按题）
+RATES = {
+    'ocr_split': 0.1,     # 题干里两个汉字之间多一个空格
+    'wide_space': 0.1,    # 题干里一段连续空格
+    'fullwidth': 0.05,    # 选项字母和点是全角
+    'wrapped': 0.1,       # 题干折成两行
+    'answer_prefix': 0.1, # 选择题答案写成 “答案：B”
+    'multiple': 0.25,     # 选择题中多选题的比例
+    'unnumbered': 0.01,   # 漏掉题号
+    'no_answer': 0.005,   # 缺答案，应报解析错误
+    'skipped': 0.005,     # 整道题缺失，题号跳号
+}
+
+
+def _phrase(rng, lo, hi):
+    return '，'.join(rng.choice(WORDS) for _ in range(rng.randint(lo, hi)))
+
+
+def _messy_stem(rng, stem):
+    if rng.random() < RATES['ocr_split']:
+        cut = rng.randrange(1, len(stem))
+        if '一' <= stem[cut - 1] <= '鿿' and '一' <= stem[cut] <= '鿿':
+            stem = f'{stem[:cut]} {stem[cut:]}'
+    if rng.random() < RATES['wide_space']:
+        cut = rng.randrange(1, len(stem))
+        stem = f'{stem[:cut]}{" " * rng.randint(2, 6)}{stem[cut:]}'
+    return stem
+
+
+def _option_lines(rng, options):
+    sep = rng.choice(OPTION_SEPARATORS)
+    items = [f'{letter}{sep}{text}' for letter, text in zip(LETTERS, options)]
+    if rng.random() < RATES['fullwidth']:
+        items = [item.translate(FULLWIDTH) for item in items]
+    per_line = rng.choice((1, 2, 4))
+    gap = ' ' * rng.randint(1, 8)
+    return [gap.join(items[i:i + per_line]) for i in range(0, len(items), per_line)]
+
+
+def _question_lines(rng, kind, num):
+    """一道题的文本行和期望答案；期望答案为 None 表示这道题应当报解析错误"""
+    number = rng.choice(NUMBER_FORMATS).format(num)
+    if kind == 'judge':
+        stem = _messy_stem(rng, _phrase(rng, 3, 8) + '。')
+        answer = rng.choice('√×')
+        expected = '正确(True)' if answer == '√' else '错误(False)'
+    elif kind == 'choice':
+        stem = _messy_stem(rng, _phrase(rng, 2, 6) + '是(    )。')
+        if rng.random() < RATES['multiple']:
+            letters = sorted(rng.sample(LETTERS, rng.randint(2, 4)))
+            answer = rng.choice((','.join(letters), ''.join(letters)))
+            expected = ','.join(letters)
+        else:
+            answer = expected = rng.choice(LETTERS)
+    else:
+        stem = _messy_stem(rng, '简述' + _phrase(rng, 1, 3) + '。')
+        answer = _phrase(rng, 2, 5).replace('，', '') + '。'
+        expected = answer
+    if rng.random() < RATES['wrapped'] and len(stem) > 8:
+        cut = rng.randrange(4, len(stem) - 2)
+        lines = [number + stem[:cut].rstrip(), stem[cut:].lstrip()]
+    else:
+        lines = [number + stem]
+    if kind == 'choice':
+        lines.extend(_option_lines(rng, [rng.choice(WORDS) for _ in LETTERS]))
+    if rng.random() < RATES['no_answer']:
+        return lines, None
+    if kind == 'text' or (kind == 'choice' and rng.random() < RATES['answer_prefix']):
+        # “答案：” 后面的文本原样作为答案，多选只用逗号分隔的写法
+        lines.append(f'答案：{expected if kind == "choice" else answer}')
+    else:
+        lines.append(answer)
+    return lines, expected
+
+
+def iter_bank_lines(n, seed=0, expected=None):
+    """逐行产出 n 道题的文本题库（不含换行符）
+
+    expected 传入字典时按大题标题记录 {'answers': [...], 'errors': 应报的解析错误数, ...}，
+    用来核对解析结果；同一个 seed 每次产出的文本完全相同。
+    """
+    rng = random.Random(seed)
+    yield '学号：                         姓名：                         班级：'
+    done = 0
+    for header, kind, share in SECTIONS:
+        count = n - done if share >= 1.0 else int(n * share)
+        done += count
+        title = header.split('：', 1)[1]
+        record = {'answers': [], 'errors': 0, 'unnumbered': 0, 'skipped': 0}
+        if expected is not None:
+            expected[title] = record
+        yield header
+        num = 0
+        answered = False
+        for _ in range(count):
+            num += 1
+            if rng.random() < RATES['skipped']:
+                num += 1
+                record['skipped'] += 1
+            lines, answer = _question_lines(rng, kind, num)
+            # 只有上一题有答案时漏题号才能被解析器补上，否则题干会并进上一道坏题
+            if answered and rng.random() < RATES['unnumbered']:
+                lines[0] = lines[0][lines[0].index(str(num)) + len(str(num)):].lstrip(' )）')
+                record['unnumbered'] += 1
+            if answer is None:
+                record['errors'] += 1
+            else:
+                record['answers'].append(answer)
+            answered = answer is not None
+            yield from lines
+
+
+def write_txt_bank(path, n, seed=0):
+    expected = {}
+    with open(path, 'w', encoding='utf-8') as f:
+        for line in iter_bank_lines(n, seed, expected):
+            f.write(line)
+            f.write('\n')
+    return expected
+
+
+DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/></Types>')
+DOCX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/'
+    'officeDocument" Target="word/document.xml"/></Relationships>')
+DOCX_HEAD = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+             '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>')
+DOCX_TAIL = '<w:sectPr/></w:body></w:document>'
+
+
+def _docx_runs(rng, line):
+    """把一行切成 1~3 个 run（Word 里格式变化处会断开），选项之间的空白换成制表符"""
+    cuts = sorted(rng.sample(range(1, len(line)), min(len(line) - 1, rng.randint(0, 2))))
+    runs = []
+    for start, end in zip([0] + cuts, cuts + [len(line)]):
+        parts = [f'<w:t xml:space="preserve">{escape(part)}</w:t>' if part else ''
+                 for part in line[start:end].split('   ')]
+        runs.append(f'<w:r><w:rPr><w:rFonts w:hint="eastAsia"/></w:rPr>{"<w:tab/>".join(parts)}</w:r>')
+    return ''.join(runs)
+
+
+def write_docx_bank(path, n, seed=0):
+    """与 write_txt_bank 同样的题目写成 .docx；document.xml 流式写入，不在内存中拼整篇文档"""
+    expected = {}
+    rng = random.Random(seed + 1)
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('[Content_Types].xml', DOCX_CONTENT_TYPES)
+        zf.writestr('_rels/.rels', DOCX_RELS)
+        with zf.open('word/document.xml', 'w') as raw:
+            raw.write(DOCX_HEAD.encode('utf-8'))
+            paragraph = None
+            for line in iter_bank_lines(n, seed, expected):
+                # 答案有时用换行符挂在选项段落末尾，提取时段落内的换行会拆成两行
+                if paragraph is not None and len(line) <= 4 and rng.random() < 0.3:
+                    paragraph += f'<w:r><w:br/></w:r><w:r><w:t>{escape(line)}</w:t></w:r>'
+                    continue
+                if paragraph is not None:
+                    raw.write(f'<w:p>{paragraph}</w:p>'.encode('utf-8'))
+                paragraph = _docx_runs(rng, line) if line else ''
+            if paragraph is not None:
+                raw.write(f'<w:p>{paragraph}</w:p>'.encode('utf-8'))
+            raw.write(DOCX_TAIL.encode('utf-8'))
+    return expected
+
+
+def write_html_pages(directory, n, seed=0, per_page=100):
+    """把 n 道题写成一组答题页面（常规 / Angular 交替），返回 (页面路径, 每页的题目)"""
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    paths, expected = [], []
+    for i, start in enumerate(range(0, n, per_page)):
+        style = 'standard' if i % 2 == 0 else 'angular'
+        page, questions = make_page(rng, min(per_page, n - start), style, f'第{i + 1}次作业')
+        path = os.path.join(directory, f'page{i:06d}.html')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(page)
+        paths.append(path)
+        expected.append(questions)
+    return paths, expected
+
+
+def write_json_group(path, n, per_exam=100, compact=False):
+    """合成试卷组 JSON（bench_index.make_exam_group，含一成近似重复题）"""
+    exam_group = make_exam_group(n, per_exam)
+    write_exam_group(exam_group, path, compact)
+    return len(exam_group)
+
+
+def check_sections(sections, expected):
+    """对比解析结果和生成时记录的答案，返回不一致的题数（含该报未报、不该报却报了的解析错误）"""
+    wrong = 0
+    found = {s['title']: s for s in sections}
+    for title, record in expected.items():
+        section = found.get(title)
+        if section is None:
+            wrong += len(record['answers']) + record['errors']
+            continue
+        got = [q.correct_answer for q in section['questions']]
+        wrong += abs(len(got) - len(record['answers'])) + abs(len(section['errors']) - record['errors'])
+        wrong += sum(1 for a, b in zip(got, record['answers']) if a != b)
+    return wrong
+
+
+def main():
+    parser = argparse.ArgumentParser(description='生成合成题库（.txt/.docx/.html/试卷组 JSON）')
+    parser.add_argument('-n', type=int, default=10000, help='题目数量')
+    parser.add_argument('-o', '--output', default='合成题库', help='输出目录')
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=list(FORMATS), help='要生成的格式')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    parser.add_argument('--per-page', type=int, default=100, help='每个答题页面的题数')
+    args = parser.parse_args()
+
+    os.makedirs(args.output, exist_ok=True)
+    stem = os.path.join(args.output, f'合成题库_{args.n}')
+    if 'txt' in args.formats:
+        expected = write_txt_bank(f'{stem}.txt', args.n, args.seed)
+        for title, record in expected.items():
+            print(f"{title}：{len(record['answers'])} 道，缺答案 {record['errors']}，"
+                  f"漏题号 {record['unnumbered']}，跳号 {record['skipped']}")
+    if 'docx' in args.formats:
+        write_docx_bank(f'{stem}.docx', args.n, args.seed)
+    if 'html' in args.formats:
+        paths, _ = write_html_pages(f'{stem}_html', args.n, args.seed, args.per_page)
+        print(f"答题页面：{len(paths)} 个")
+    if 'json' in args.formats:
+        print(f"试卷组：{write_json_group(f'{stem}.json', args.n)} 份试卷")
+    for name in sorted(os.listdir(args.output)):
+        path = os.path.join(args.output, name)
+        if os.path.isfile(path):
+            print(f"  {path}：{os.path.getsize(path) / 1024 / 1024:.1f}MB")
+
+
+if __name__ == '__main__':
+    main()
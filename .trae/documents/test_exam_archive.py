@@ -0,0 +1,56 @@
+import json
+import os
+import tempfile
+import unittest
+
+from exam_archive import QuestionArchive, read_archive, write_archive
+from question_model import QuestionEncoder, load_exam_group
+
+# exam_archive 的往返测试：write_archive -> 读回的试卷组用 QuestionEncoder 输出的 JSON 必须与原来相同
+#   python -m unittest test_exam_archive
+
+
+def question(qid, **fields):
+    q = {"id": qid, "type": "single", "content": f"题目{qid}",
+         "options": [{"label": "A", "html": "甲"}, {"label": "B", "html": "乙"}],
+         "correctAnswer": "A", "userAnswer": "", "explanation": ""}
+    q.update(fields)
+    return q
+
+
+def dumps(exam_group):
+    return json.dumps(exam_group, ensure_ascii=False, cls=QuestionEncoder)
+
+
+class RoundTripTest(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.qarc')
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def assertRoundTrip(self, questions):
+        exam_group = load_exam_group([{"id": "1", "title": "t", "timestamp": 1, "isSubmitted": False,
+                                       "questions": questions}])
+        write_archive(exam_group, self.path)
+        expected = dumps(exam_group)
+        self.assertEqual(dumps(read_archive(self.path)), expected)
+        # 逐题解码走的是另一条路径
+        with QuestionArchive(self.path) as archive:
+            self.assertEqual(dumps([archive.exam(0)]), expected)
+
+    def test_plain_questions(self):
+        self.assertRoundTrip([question(0), question(1, type="multiple", correctAnswer="A,B", userAnswer="B")])
+
+    def test_none_answers(self):
+        self.assertRoundTrip([question(0, correctAnswer=None), question(1, userAnswer=None),
+                              question(2, type="text", options=[], correctAnswer=None, userAnswer=None)])
+
+    def test_none_option_fields(self):
+        self.assertRoundTrip([question(0, options=[{"label": None, "html": "甲"}, {"label": "B", "html": None}],
+                                       correctAnswer="B", userAnswer=None)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+
+from exam_validator import validate_exam_group
+
+# exam_validator 的回归测试：格式错误的输入只能出现在报告里，不能让校验器崩溃
+#   python -m unittest test_exam_validator
+
+
+def exam(exam_id, title='t'):
+    return {"id": exam_id, "title": title, "timestamp": 1, "questions": []}
+
+
+class ExamIdTest(unittest.TestCase):
+    def test_list_id_is_reported(self):
+        report = validate_exam_group([exam([1])], 1)
+        self.assertFalse(report['ok'])
+        self.assertEqual(report['codes'], {'exam_field_type': 1})
+
+    def test_dict_id_is_reported(self):
+        report = validate_exam_group([exam({"a": 1}), exam({"a": 1})], 1)
+        self.assertFalse(report['ok'])
+        # 不可哈希的 id 不参与重复检查，只报类型错误
+        self.assertEqual(report['codes'], {'exam_field_type': 2})
+
+    def test_duplicate_ids_next_to_bad_ids(self):
+        report = validate_exam_group([exam('x'), exam([1]), exam('x')], 1)
+        self.assertEqual(report['codes'], {'exam_field_type': 1, 'exam_id_duplicate': 2})
+
+
+if __name__ == '__main__':
+    unittest.main()